@@ -0,0 +1,109 @@
+"""
+This module benchmarks the compiled scorer against the native CatBoost model:
+the median latency of `predict_proba` for feature vectors as the API builds them
+and for prepared DataFrames as `ModelService` builds them, at several input
+sizes, plus the largest probability difference between the two. The compiled
+model is built in memory from the training data, so no compiled artifact is
+needed. One JSON line is printed per input size and input kind.
+
+Usage:
+    - PYTHONPATH=.:src python -m benchmarks.compiled_scorer --sizes 1 4 16 64 1024
+
+Functions:
+    - measure(compiled, X, size, kind, repeat): Measures one input size and kind.
+    - main(): Parses the command line and runs the benchmark.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from config.config import settings
+from src.model.compiled import compile_artifact
+
+SIZES = (1, 4, 16, 64, 1024)
+KINDS = ("vectors", "frame")
+
+
+def _median_us(predict, inputs, repeat):
+    """
+    Returns the median time of `predict(inputs)` in microseconds.
+    """
+    predict(inputs)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        predict(inputs)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6
+
+
+def measure(compiled, X, size, kind="vectors", repeat=200):
+    """
+    Measures the latency of the native and the compiled model on one input.
+
+    The compiled model scores the whole input with its tables, whatever its
+    `max_rows` is, so the crossover point can be read from the results.
+
+    Args:
+        compiled (CompiledModel): The compiled model.
+        X (pd.DataFrame): Prepared inputs in model column order.
+        size (int): Number of rows per call.
+        kind (str, optional): "vectors" for lists of feature vectors, "frame" for
+                              a DataFrame.
+        repeat (int, optional): Number of timed calls.
+
+    Returns:
+        dict: Median latency of both models, the speedup and the largest
+        probability difference.
+    """
+    inputs = X.iloc[:size]
+    if kind == "vectors":
+        inputs = inputs.astype(object).to_numpy().tolist()
+    threads = settings.model_thread_count
+    max_rows, compiled.max_rows = compiled.max_rows, size
+    try:
+        native_us = _median_us(
+            lambda rows: compiled.model.predict_proba(rows, thread_count=threads), inputs, repeat
+        )
+        compiled_us = _median_us(
+            lambda rows: compiled.predict_proba(rows, thread_count=threads), inputs, repeat
+        )
+        difference = abs(compiled.predict_proba(inputs) - compiled.model.predict_proba(inputs)).max()
+    finally:
+        compiled.max_rows = max_rows
+    return {
+        "benchmark": "compiled_scorer",
+        "kind": kind,
+        "rows": size,
+        "native_us": round(native_us, 2),
+        "compiled_us": round(compiled_us, 2),
+        "speedup": round(native_us / compiled_us, 3),
+        "max_difference": float(difference),
+    }
+
+
+def main():
+    """
+    Parses the command line and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--input", default=settings.data_path, help="Training CSV file")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    from src.model.pipeline.dataset_cache import load_prepared_dataset
+
+    compiled = compile_artifact(settings.model_path, args.input, save=False)
+    X, _ = load_prepared_dataset(args.input)
+    X = X[compiled.feature_names_]
+    for kind in args.kinds:
+        for size in args.sizes:
+            print(json.dumps(measure(compiled, X, size, kind, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+This module benchmarks loading a training CSV file: the time and the peak
+resident memory of reading it and preparing the model features, untyped as
+`pd.read_csv(path)` did and typed with `load_data` on each engine. Every
+measurement runs in a fresh interpreter, so the peak memory of one mode does not
+hide the next. One JSON line is printed per mode. The pyarrow mode is skipped
+when pyarrow is not installed, since `load_data` would fall back to the C engine.
+
+Usage:
+    - PYTHONPATH=.:src python -m benchmarks.csv_load --input data/dataset.csv --modes untyped pyarrow c chunked
+
+Functions:
+    - measure(path, mode, repeat): Measures loading a CSV file in one mode.
+    - main(): Parses the command line and runs the benchmark.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+from config.config import settings
+
+MODES = {
+    "untyped": "pd.read_csv(path)",
+    "pyarrow": "load_data(path, engine='pyarrow', chunk_size=0)",
+    "c": "load_data(path, engine='c', chunk_size=0)",
+    "chunked": "load_data(path, chunk_size=100000)",
+}
+
+# Modes that can only be measured with an optional package installed.
+REQUIRES = {"pyarrow": "pyarrow"}
+
+_PROBE = """
+import json, resource, sys, time
+import pandas as pd
+from src.model.pipeline.collection import load_data
+from src.model.pipeline.preparation import process_features
+
+path = sys.argv[2]
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+df = {expression}
+load_seconds = time.perf_counter() - started
+X = process_features(df)
+print(json.dumps({{
+    "load_seconds": load_seconds,
+    "prepare_seconds": time.perf_counter() - started,
+    "frame_bytes": int(df.memory_usage(deep=True).sum()),
+    "peak_rss_bytes": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024,
+}}))
+"""
+
+
+def measure(path, mode, repeat=3):
+    """
+    Measures loading a CSV file and preparing its features in fresh interpreters.
+
+    Args:
+        path (str): The CSV file.
+        mode (str): Name of the loading mode in `MODES`.
+        repeat (int, optional): Number of interpreters to start.
+
+    Returns:
+        dict: The best load and prepare times, the memory of the loaded frame and
+        the median growth of the peak RSS, or the reason the mode was skipped.
+    """
+    package = REQUIRES.get(mode)
+    if package and importlib.util.find_spec(package) is None:
+        return {"benchmark": "csv_load", "mode": mode, "skipped": f"{package} not installed"}
+
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(expression=MODES[mode]), mode, path],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    peaks = sorted(run["peak_rss_bytes"] for run in runs)
+    return {
+        "benchmark": "csv_load",
+        "mode": mode,
+        "load_seconds": round(min(run["load_seconds"] for run in runs), 4),
+        "prepare_seconds": round(min(run["prepare_seconds"] for run in runs), 4),
+        "frame_mb": round(runs[0]["frame_bytes"] / 2**20, 2),
+        "peak_rss_mb": round(peaks[len(peaks) // 2] / 2**20, 2),
+    }
+
+
+def main():
+    """
+    Parses the command line and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--input", default=settings.data_path, help="CSV file to load")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for mode in args.modes:
+        print(json.dumps(measure(args.input, mode, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
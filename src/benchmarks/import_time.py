@@ -0,0 +1,107 @@
+"""
+This module benchmarks the cold start of the API and the command line: the time
+and resident memory it takes to import `src.inference` and `runner`, and for the
+API also the time until the model is loaded and ready to score. Every measurement
+runs in a fresh interpreter, so the numbers match what a newly started worker
+pays. The heavy modules loaded by the import are listed as well, so a change that
+pulls one of them back into the import path is easy to spot. One JSON line is
+printed per target.
+
+Usage:
+    - PYTHONPATH=.:src python -m benchmarks.import_time --targets inference runner
+
+Functions:
+    - measure(target, repeat): Measures the cold start of one target.
+    - main(): Parses the command line and runs the benchmark.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ["catboost", "pandas", "scipy", "sklearn", "sqlalchemy", "joblib"]
+
+TARGETS = {
+    "inference": "src.inference",
+    "runner": "runner",
+}
+
+_PROBE = """
+import importlib, json, sys, time
+import psutil
+
+process = psutil.Process()
+rss_before = process.memory_info().rss
+started = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+import_seconds = time.perf_counter() - started
+result = {
+    "import_seconds": import_seconds,
+    "import_rss_bytes": process.memory_info().rss - rss_before,
+    "heavy_modules": [name for name in sys.argv[2:] if name in sys.modules],
+}
+if hasattr(module, "registry"):
+    module.registry.load()
+    result["ready_seconds"] = time.perf_counter() - started
+    result["ready_rss_bytes"] = process.memory_info().rss - rss_before
+print(json.dumps(result))
+"""
+
+
+def measure(target, repeat=5):
+    """
+    Measures the cold start of one target in fresh interpreters.
+
+    Args:
+        target (str): Name of the target in `TARGETS`.
+        repeat (int, optional): Number of interpreters to start.
+
+    Returns:
+        dict: The best import time, the median RSS growth and the heavy modules
+        imported, plus the best time and median RSS until the model is loaded
+        for targets that serve a model.
+    """
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, TARGETS[target], *HEAVY_MODULES],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    def median_mb(key):
+        values = sorted(run[key] for run in runs)
+        return round(values[len(values) // 2] / 2**20, 2)
+
+    result = {
+        "benchmark": "import_time",
+        "target": target,
+        "import_seconds": round(min(run["import_seconds"] for run in runs), 5),
+        "import_rss_mb": median_mb("import_rss_bytes"),
+        "heavy_modules": runs[0]["heavy_modules"],
+    }
+    if "ready_seconds" in runs[0]:
+        result["ready_seconds"] = round(min(run["ready_seconds"] for run in runs), 5)
+        result["ready_rss_mb"] = median_mb("ready_rss_bytes")
+    return result
+
+
+def main():
+    """
+    Parses the command line and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for target in args.targets:
+        print(json.dumps(measure(target, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
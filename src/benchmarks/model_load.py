@@ -0,0 +1,84 @@
+"""
+This module benchmarks loading a model artifact: load time and the resident
+memory it adds to a process. Every measurement runs in a fresh interpreter, so
+the numbers match what a newly started worker pays. One JSON line is printed
+per artifact.
+
+Usage:
+    - PYTHONPATH=.:src python -m benchmarks.model_load --artifacts src/model/models/catboost_model_v1.pkl src/model/models/catboost_model_v1.cbm
+
+Functions:
+    - measure(path, repeat): Measures load time and RSS growth of one artifact.
+    - main(): Parses the command line and runs the benchmark.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from config.config import settings
+from src.model.artifact import resolve_artifact_path
+
+_PROBE = """
+import json, sys, time
+import psutil
+import catboost, joblib
+from src.model.artifact import load_model_artifact
+
+process = psutil.Process()
+rss_before = process.memory_info().rss
+started = time.perf_counter()
+model = load_model_artifact(sys.argv[1])
+seconds = time.perf_counter() - started
+print(json.dumps({"seconds": seconds, "rss_bytes": process.memory_info().rss - rss_before}))
+"""
+
+
+def measure(path, repeat=5):
+    """
+    Measures the load time and RSS growth of one artifact in fresh interpreters.
+
+    Args:
+        path (str): Path of the model artifact.
+        repeat (int, optional): Number of interpreters to start.
+
+    Returns:
+        dict: The best load time and the median RSS growth over all runs.
+    """
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, path],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    rss = sorted(run["rss_bytes"] for run in runs)
+    return {
+        "benchmark": "model_load",
+        "artifact": path,
+        "size_bytes": os.path.getsize(resolve_artifact_path(path)),
+        "load_seconds": round(min(run["seconds"] for run in runs), 5),
+        "rss_mb": round(rss[len(rss) // 2] / 2**20, 2),
+    }
+
+
+def main():
+    """
+    Parses the command line and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artifacts", nargs="+", default=[settings.model_path])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for path in args.artifacts:
+        print(json.dumps(measure(path, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
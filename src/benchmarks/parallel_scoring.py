@@ -0,0 +1,79 @@
+"""
+This module benchmarks parallel batch scoring with `ModelService.predict_proba_parallel`
+for an increasing number of worker processes and prints one JSON line per run.
+
+Usage:
+    - PYTHONPATH=.:src python -m benchmarks.parallel_scoring --rows 1000000
+
+Functions:
+    - run(n_rows, workers, chunk_size): Measures rows/sec for every worker count.
+    - main(): Parses the command line and runs the benchmark.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from model.model_service import ModelService
+from config.config import settings
+from benchmarks.synthetic import generate_data
+
+
+def run(n_rows, workers, chunk_size):
+    """
+    Measures the throughput of parallel batch scoring for every worker count.
+
+    The first call with each worker count starts the pool and is not timed.
+
+    Args:
+        n_rows (int): Number of synthetic rows scored per run.
+        workers (list[int]): Worker counts to measure.
+        chunk_size (int): Number of rows sent to a worker at once.
+
+    Returns:
+        list[dict]: One result per worker count, with rows/sec and the speedup
+        over the first worker count.
+    """
+    X = generate_data(n_rows)
+    results = []
+    for n_workers in workers:
+        ml_svc = ModelService(thread_count=settings.scoring_worker_threads)
+        ml_svc.predict_proba_parallel(X.head(chunk_size * n_workers), n_workers, chunk_size)
+        started = time.perf_counter()
+        ml_svc.predict_proba_parallel(X, n_workers, chunk_size)
+        elapsed = time.perf_counter() - started
+        ml_svc.close()
+
+        result = {
+            "benchmark": "parallel_scoring",
+            "rows": n_rows,
+            "workers": n_workers,
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(n_rows / elapsed),
+        }
+        result["speedup"] = round(result["rows_per_sec"] / results[0]["rows_per_sec"], 2) if results else 1.0
+        results.append(result)
+        print(json.dumps(result))
+    return results
+
+
+def main():
+    """
+    Parses the command line and runs the benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=settings.scoring_worker_chunk_size)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[n for n in (1, 2, 4, 8, 16, 32, 64) if n <= os.cpu_count()],
+    )
+    args = parser.parse_args()
+    run(args.rows, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
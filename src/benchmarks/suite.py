@@ -0,0 +1,602 @@
+"""
+This module runs the performance benchmark suite for the inference and training
+pipelines on synthetic data and writes the results as JSON, so runs can be
+compared. Given a baseline file, it exits with status 1 if any metric regressed
+by more than the threshold.
+
+Cases:
+    - single_row: Latency of `ModelService.predict` for one row.
+    - api: Throughput and latency of `/predict` at several concurrency levels.
+    - batch: Rows/sec of `ModelService.predict_proba` at several batch sizes.
+    - training: Feature preparation and `train_model` time.
+    - model_load: Load time and RSS growth of the model artifact.
+    - logging: Cost of log calls with the configured sinks at INFO.
+    - database: Bulk load and chunked read throughput of the `TaxFix` table.
+    - dataset_cache: Time to get a prepared training set with and without the cache.
+    - import_time: Cold start time and memory of the API and the command line.
+    - compiled_scorer: Latency of the compiled scorer against the native model.
+    - csv_load: Time and peak memory of loading a training CSV file per engine.
+    - explain: Latency and throughput of `/explain`, uncached and cached, next to `/predict`.
+
+Usage:
+    - PYTHONPATH=.:src python -m benchmarks.suite --output results.json
+    - PYTHONPATH=.:src python -m benchmarks.suite --quick --baseline results.json --threshold 0.1
+
+Functions:
+    - bench_single_row(iterations): Measures single-row prediction latency.
+    - bench_api(concurrency, requests): Measures `/predict` throughput.
+    - bench_batch(sizes): Measures batch scoring throughput.
+    - bench_training(n_rows): Measures training time.
+    - bench_model_load(repeat): Measures model load time and memory.
+    - bench_logging(iterations): Measures the cost of log calls per request.
+    - bench_database(n_rows): Measures database load and read throughput.
+    - bench_dataset_cache(n_rows): Measures loading prepared training data.
+    - bench_import_time(repeat): Measures the cold start of the API and the command line.
+    - bench_compiled_scorer(sizes, repeat): Measures the compiled scorer against the native model.
+    - bench_csv_load(n_rows, repeat): Measures loading a training CSV file.
+    - bench_explain(concurrency, requests): Measures `/explain` next to `/predict`.
+    - compare(results, baseline, threshold): Lists metrics that regressed.
+    - main(): Parses the command line, runs the cases and writes the results.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from model.model_service import ModelService
+from model.pipeline.model import split_train_test, train_model
+from model.pipeline.preparation import process_features
+from config.config import settings
+from loguru import logger
+from src.config.config import create_db_engine
+from src.config.logging_config import configure_logging
+from src.db.ingest import ingest_csv
+from src.model.pipeline.collection import iter_data_from_db, load_data
+from src.model.pipeline.dataset_cache import load_prepared_dataset
+from benchmarks import compiled_scorer, csv_load, import_time, model_load
+from benchmarks.synthetic import generate_data
+
+HTTPX_MISSING = {"skipped": "httpx not installed"}
+
+CASES = ["single_row", "api", "batch", "training", "model_load", "logging", "database", "dataset_cache", "import_time", "compiled_scorer", "csv_load", "explain"]
+
+
+def _latency_stats(samples):
+    """
+    Summarizes latency samples in seconds as milliseconds.
+    """
+    samples = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 4),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 4),
+    }
+
+
+def bench_single_row(iterations=1000):
+    """
+    Measures the latency of `ModelService.predict` for one row.
+
+    Args:
+        iterations (int, optional): Number of timed predictions.
+
+    Returns:
+        dict: Mean, median and 99th percentile latency.
+    """
+    ml_svc = ModelService()
+    ml_svc.load_model()
+    ml_svc.predict(dict(settings.test_data))
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        ml_svc.predict(dict(settings.test_data))
+        samples.append(time.perf_counter() - started)
+    return _latency_stats(samples)
+
+
+async def _wait_ready(client, timeout=60.0):
+    """
+    Polls `/ready` until the API has loaded and warmed up its model.
+    """
+    deadline = time.perf_counter() + timeout
+    while (await client.get("/ready")).status_code != 200:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"API not ready after {timeout}s")
+        await asyncio.sleep(0.05)
+
+
+async def _run_api(concurrency, requests):
+    """
+    Sends `requests` calls to `/predict` with `concurrency` calls in flight.
+    """
+    import httpx
+
+    from src.inference import app, lifespan
+
+    results = {}
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _wait_ready(client)
+            await client.post("/predict", json=settings.test_data)
+            for level in concurrency:
+                samples = []
+                semaphore = asyncio.Semaphore(level)
+
+                async def call():
+                    async with semaphore:
+                        started = time.perf_counter()
+                        response = await client.post("/predict", json=settings.test_data)
+                        samples.append(time.perf_counter() - started)
+                        response.raise_for_status()
+
+                started = time.perf_counter()
+                await asyncio.gather(*(call() for _ in range(requests)))
+                elapsed = time.perf_counter() - started
+                results[f"concurrency_{level}"] = {
+                    "requests_per_sec": round(requests / elapsed, 2),
+                    **_latency_stats(samples),
+                }
+    return results
+
+
+def bench_api(concurrency=(1, 8, 32), requests=500):
+    """
+    Measures throughput and latency of `/predict` in-process through httpx.
+    httpx is not a dependency of the application; without it the case is skipped.
+
+    Args:
+        concurrency (tuple, optional): Numbers of requests kept in flight.
+        requests (int, optional): Number of requests per concurrency level.
+
+    Returns:
+        dict: Requests/sec and latency statistics per concurrency level, or the
+        reason the case was skipped.
+    """
+    if importlib.util.find_spec("httpx") is None:
+        return HTTPX_MISSING
+    return asyncio.run(_run_api(concurrency, requests))
+
+
+async def _run_explain(concurrency, requests):
+    """
+    Sends `requests` calls to `/predict` and `/explain` with `concurrency` calls
+    in flight; `/explain` is called once with distinct inputs, which are never
+    cached, and once more with the same inputs, which all are.
+    """
+    import httpx
+
+    from src.inference import app, lifespan
+
+    payloads = [
+        {**settings.test_data, "income": settings.test_data["income"] + i} for i in range(requests)
+    ]
+    results = {}
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _wait_ready(client)
+            await client.post("/predict", json=settings.test_data)
+            for level in concurrency:
+                # Every level explains inputs of its own, so only the second
+                # `/explain` run of a level hits the cache.
+                explained = [{**payload, "age": 18 + level} for payload in payloads]
+                for name, path, batch in (
+                    ("predict", "/predict", payloads),
+                    ("explain", "/explain", explained),
+                    ("explain_cached", "/explain", explained),
+                ):
+                    samples = []
+                    semaphore = asyncio.Semaphore(level)
+
+                    async def call(payload):
+                        async with semaphore:
+                            started = time.perf_counter()
+                            response = await client.post(path, json=payload)
+                            samples.append(time.perf_counter() - started)
+                            response.raise_for_status()
+
+                    started = time.perf_counter()
+                    await asyncio.gather(*(call(payload) for payload in batch))
+                    elapsed = time.perf_counter() - started
+                    results[f"{name}_concurrency_{level}"] = {
+                        "requests_per_sec": round(requests / elapsed, 2),
+                        **_latency_stats(samples),
+                    }
+    return results
+
+
+def bench_explain(concurrency=(1, 8), requests=200):
+    """
+    Measures the latency and throughput of `/explain` with and without cache
+    hits, next to `/predict` at the same concurrency. Like the `api` case, it is
+    skipped if httpx is not installed.
+
+    Args:
+        concurrency (tuple, optional): Numbers of calls in flight.
+        requests (int, optional): Number of calls per endpoint and level.
+
+    Returns:
+        dict: Requests/sec and latency per endpoint and concurrency level, or the
+        reason the case was skipped.
+    """
+    if importlib.util.find_spec("httpx") is None:
+        return HTTPX_MISSING
+    return asyncio.run(_run_explain(concurrency, requests))
+
+
+def bench_batch(sizes=(1000, 100000, 1000000)):
+    """
+    Measures the throughput of `ModelService.predict_proba` for several batch sizes.
+
+    Args:
+        sizes (tuple, optional): Batch sizes in rows.
+
+    Returns:
+        dict: Seconds and rows/sec per batch size.
+    """
+    ml_svc = ModelService()
+    ml_svc.load_model()
+    data = generate_data(max(sizes))
+    ml_svc.predict_proba(data.head(100))
+
+    results = {}
+    for size in sizes:
+        X = data.head(size)
+        started = time.perf_counter()
+        ml_svc.predict_proba(X)
+        elapsed = time.perf_counter() - started
+        results[f"rows_{size}"] = {
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(size / elapsed),
+        }
+    return results
+
+
+def bench_training(n_rows=100000):
+    """
+    Measures feature preparation and training time on synthetic data.
+
+    Args:
+        n_rows (int, optional): Number of synthetic rows.
+
+    Returns:
+        dict: Seconds spent preparing features and training the model.
+    """
+    data = generate_data(n_rows)
+
+    started = time.perf_counter()
+    X = process_features(data)
+    X_train, _, _, y_train, _, _ = split_train_test(X, data[settings.target])
+    prepare_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    train_model(X_train, y_train)
+    train_seconds = time.perf_counter() - started
+    return {
+        "rows": n_rows,
+        "prepare_seconds": round(prepare_seconds, 4),
+        "train_seconds": round(train_seconds, 4),
+    }
+
+
+def bench_model_load(repeat=5):
+    """
+    Measures load time and RSS growth of the configured model artifact.
+
+    Args:
+        repeat (int, optional): Number of fresh interpreters to measure in.
+
+    Returns:
+        dict: Load time and memory of the artifact.
+    """
+    result = model_load.measure(settings.model_path, repeat)
+    return {"load_seconds": result["load_seconds"], "rss_mb": result["rss_mb"]}
+
+
+def bench_import_time(repeat=5):
+    """
+    Measures the import time and RSS growth of the API and the command line, and
+    the time until the API has loaded the model.
+
+    Args:
+        repeat (int, optional): Number of fresh interpreters to measure in.
+
+    Returns:
+        dict: Cold start metrics per target.
+    """
+    results = {}
+    for target in import_time.TARGETS:
+        result = import_time.measure(target, repeat)
+        results[target] = {
+            key: value
+            for key, value in result.items()
+            if key.endswith(("_seconds", "_mb")) or key == "heavy_modules"
+        }
+    return results
+
+
+def bench_compiled_scorer(sizes=compiled_scorer.SIZES, repeat=200):
+    """
+    Measures the latency of the compiled scorer and the native model on feature
+    vectors and prepared DataFrames of several sizes.
+
+    Args:
+        sizes (tuple, optional): Numbers of rows per call.
+        repeat (int, optional): Number of timed calls per size.
+
+    Returns:
+        dict: Latency of both models and the largest probability difference per
+        input kind and size.
+    """
+    compiled = compiled_scorer.compile_artifact(settings.model_path, settings.data_path, save=False)
+    X, _ = load_prepared_dataset(settings.data_path)
+    X = X[compiled.feature_names_]
+    results = {}
+    for kind in compiled_scorer.KINDS:
+        for size in sizes:
+            result = compiled_scorer.measure(compiled, X, size, kind, repeat)
+            results[f"{kind}_{size}"] = {
+                key: result[key] for key in ("native_us", "compiled_us", "max_difference")
+            }
+    return results
+
+
+def bench_csv_load(n_rows=1000000, repeat=3):
+    """
+    Measures loading and preparing a synthetic training CSV file, untyped and
+    with every engine of `load_data`.
+
+    Args:
+        n_rows (int, optional): Number of rows of the CSV file.
+        repeat (int, optional): Number of fresh interpreters to measure in.
+
+    Returns:
+        dict: Load and prepare time and peak memory per mode, or the reason a
+        mode was skipped.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        generate_data(n_rows).to_csv(path, index=False)
+        results = {}
+        for mode in csv_load.MODES:
+            result = csv_load.measure(path, mode, repeat)
+            if "skipped" in result:
+                results[mode] = {"skipped": result["skipped"]}
+                continue
+            results[mode] = {
+                key: result[key]
+                for key in ("load_seconds", "prepare_seconds", "frame_mb", "peak_rss_mb")
+            }
+    return results
+
+
+def _time_calls(log, iterations):
+    """
+    Returns the mean time of `log()` in microseconds.
+    """
+    started = time.perf_counter()
+    for _ in range(iterations):
+        log()
+    return round((time.perf_counter() - started) / iterations * 1e6, 3)
+
+
+def bench_logging(iterations=10000):
+    """
+    Measures the cost of log calls on the request path with the configured
+    sinks at INFO, writing to a temporary log file instead of the console.
+
+    Args:
+        iterations (int, optional): Number of log calls per measurement.
+
+    Returns:
+        dict: Mean microseconds of an emitted INFO record, a filtered DEBUG record
+        and a rate-limited error with traceback.
+    """
+    def fail():
+        try:
+            raise ValueError("benchmark")
+        except ValueError:
+            logger.exception("Error during prediction")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = settings.model_copy(update={"log_level": "INFO"})
+        configure_logging(config, console=False, log_file=os.path.join(tmp, "bench.log"))
+        try:
+            results = {
+                "info_us": _time_calls(lambda: logger.info("Prediction served"), iterations),
+                "debug_filtered_us": _time_calls(
+                    lambda: logger.debug("Prediction served"), iterations
+                ),
+                "error_storm_us": _time_calls(fail, iterations),
+            }
+        finally:
+            logger.complete()
+            logger.remove()
+    return results
+
+
+def bench_database(n_rows=2000000):
+    """
+    Measures bulk loading a CSV file into a fresh SQLite database and reading it
+    back in chunks, with all columns and with the model columns only.
+
+    Args:
+        n_rows (int, optional): Number of synthetic rows.
+
+    Returns:
+        dict: Rows/sec of loading, of a full read and of a projected read.
+    """
+    model_columns = settings.categorical_features + [
+        name for name in settings.numeric_features if name in generate_data(1).columns
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        generate_data(n_rows).to_csv(path, index=False)
+        bench_engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}", settings)
+
+        results = {"rows": n_rows}
+        started = time.perf_counter()
+        ingest_csv(path, settings.ingest_batch_size, bind=bench_engine)
+        results["load_rows_per_sec"] = round(n_rows / (time.perf_counter() - started))
+
+        for name, columns in (("read", None), ("projected_read", model_columns)):
+            started = time.perf_counter()
+            for _ in iter_data_from_db(settings.scoring_chunk_size, columns=columns, bind=bench_engine):
+                pass
+            results[f"{name}_rows_per_sec"] = round(n_rows / (time.perf_counter() - started))
+        bench_engine.dispose()
+    return results
+
+
+def bench_dataset_cache(n_rows=1000000):
+    """
+    Measures getting a prepared training set from a CSV file by parsing and
+    preparing it, by filling the cache and by loading it from the cache.
+
+    Args:
+        n_rows (int, optional): Number of synthetic rows.
+
+    Returns:
+        dict: Seconds of each way of getting the prepared data.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        cache_dir = os.path.join(tmp, "cache")
+        generate_data(n_rows).to_csv(path, index=False)
+
+        started = time.perf_counter()
+        process_features(load_data(path))
+        uncached = time.perf_counter() - started
+
+        started = time.perf_counter()
+        load_prepared_dataset(path, cache_dir)
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        X, _ = load_prepared_dataset(path, cache_dir)
+        warm = time.perf_counter() - started
+        del X
+    return {
+        "rows": n_rows,
+        "uncached_seconds": round(uncached, 4),
+        "cold_cache_seconds": round(cold, 4),
+        "warm_cache_seconds": round(warm, 4),
+    }
+
+
+def _flatten(results, prefix=""):
+    """
+    Flattens nested results into {"case.sub.metric": value}.
+    """
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(results, baseline, threshold):
+    """
+    Lists the metrics that regressed compared to a baseline run.
+
+    Metrics ending in `_per_sec` are better when higher; metrics ending in `_ms`,
+    `_seconds` or `_mb` are better when lower. Other metrics are not compared.
+
+    Args:
+        results (dict): Results of this run.
+        baseline (dict): Results of the baseline run.
+        threshold (float): Allowed relative change, e.g. 0.1 for 10%.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    current, previous = _flatten(results), _flatten(baseline)
+    regressions = []
+    for name, value in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        change = (value - before) / before
+        if name.endswith("_per_sec"):
+            change = -change
+        elif not name.endswith(("_ms", "_seconds", "_mb")):
+            continue
+        if change > threshold:
+            regressions.append(f"{name}: {before} -> {value} ({change:+.1%} worse)")
+    return regressions
+
+
+def main():
+    """
+    Parses the command line, runs the requested cases and writes the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--quick", action="store_true", help="Use small sizes for a fast run")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    runners = {
+        "single_row": lambda: bench_single_row(200 if args.quick else 1000),
+        "api": lambda: bench_api((1, 8), 100) if args.quick else bench_api(),
+        "batch": lambda: bench_batch((1000, 10000) if args.quick else (1000, 100000, 1000000)),
+        "training": lambda: bench_training(10000 if args.quick else 100000),
+        "model_load": lambda: bench_model_load(2 if args.quick else 5),
+        "logging": lambda: bench_logging(2000 if args.quick else 10000),
+        "database": lambda: bench_database(100000 if args.quick else 2000000),
+        "dataset_cache": lambda: bench_dataset_cache(100000 if args.quick else 1000000),
+        "import_time": lambda: bench_import_time(2 if args.quick else 5),
+        "compiled_scorer": lambda: bench_compiled_scorer(repeat=50 if args.quick else 200),
+        "csv_load": lambda: bench_csv_load(100000, 1) if args.quick else bench_csv_load(),
+        "explain": lambda: bench_explain((1, 8), 50) if args.quick else bench_explain(),
+    }
+    results = {}
+    for case in args.cases:
+        started = time.perf_counter()
+        results[case] = runners[case]()
+        if "skipped" in results[case]:
+            print(f"{case}: skipped, {results[case]['skipped']}", file=sys.stderr)
+        else:
+            print(f"{case}: done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "model_path": settings.model_path,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
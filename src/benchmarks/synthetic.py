@@ -0,0 +1,52 @@
+"""
+This module generates synthetic data matching the `TaxFix` schema, so the
+benchmarks can run at any size without the real dataset.
+
+Functions:
+    - generate_data(n_rows, seed): Generates a DataFrame of synthetic users.
+"""
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = {
+    "employment_type": ["full_time", "part_time", "self_employed", "unemployed", "student"],
+    "marital_status": ["single", "married", "divorced", "widowed"],
+    "device_type": ["mobile", "desktop", "tablet"],
+    "referral_source": ["friend_referral", "social_media", "search_engine", "ad", "organic"],
+}
+
+
+def generate_data(n_rows, seed=42):
+    """
+    Generates synthetic users with realistic value ranges.
+
+    Args:
+        n_rows (int): Number of rows to generate.
+        seed (int, optional): Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: The synthetic data, including the `completed_filing` target.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(18, 80, n_rows),
+            "income": rng.lognormal(10.7, 0.5, n_rows).round(2),
+            "employment_type": rng.choice(CATEGORIES["employment_type"], n_rows),
+            "marital_status": rng.choice(CATEGORIES["marital_status"], n_rows),
+            "time_spent_on_platform": rng.gamma(2.0, 60.0, n_rows).round(1),
+            "number_of_sessions": rng.poisson(6, n_rows),
+            "fields_filled_percentage": rng.uniform(0, 100, n_rows).round(1),
+            "previous_year_filing": rng.integers(0, 2, n_rows),
+            "device_type": rng.choice(CATEGORIES["device_type"], n_rows),
+            "referral_source": rng.choice(CATEGORIES["referral_source"], n_rows),
+        }
+    )
+    score = (
+        df["fields_filled_percentage"] / 100
+        + 0.2 * df["previous_year_filing"]
+        + rng.normal(0, 0.25, n_rows)
+    )
+    df["completed_filing"] = (score > 0.6).astype(int)
+    return df
@@ -7,15 +7,22 @@ Classes:
     Settings: Defines configuration parameters for model paths, feature lists,
               database connection, and test data.
 
+Functions:
+    create_db_engine(conn_str, settings): Creates a pooled SQLAlchemy engine.
+    get_engine(): Returns the application engine, creating it on first use.
+
 Variables:
     settings (Settings): An instance of the Settings class, preloaded with default values.
-    engine (sqlalchemy.Engine): SQLAlchemy engine initialized with the database connection string.
+    engine (sqlalchemy.Engine): SQLAlchemy engine initialized with the database connection
+                                string. It is created on first access, so processes that
+                                never use the database do not import SQLAlchemy.
 """
 
 import os
+import threading
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 # from pydantic import DirectoryPath
-from sqlalchemy import create_engine
 
 
 class Settings(BaseSettings):
@@ -25,20 +32,138 @@ class Settings(BaseSettings):
     Attributes:
         model_config (SettingsConfigDict): Configuration for loading environment variables.
         model_dir (DirectoryPath): Directory path where models are stored.
-        model_filename (str): Name of the machine learning model file.
+        model_filename (str): Name of the machine learning model file. Native CatBoost
+                              `.cbm` files are preferred; a legacy `.pkl` file with the
+                              same name is loaded if the `.cbm` file does not exist.
         model_path (str): Full path to the saved machine learning model.
         data_path (str): Path to the dataset CSV file.
         categorical_features (list): List of categorical feature column names.
         numeric_features (list): List of numerical feature column names.
+        feature_dtypes (dict): Dtype each feature is converted to. Categorical features
+                               listed here are read as this dtype before being turned
+                               into categories (e.g. 1 -> "1" instead of "1.0").
+        categorical_dtype (str): Dtype of prepared categorical features, either "str"
+                                 or "category".
         target (str): Name of the target variable for prediction.
         test_data (dict): Sample test data for inference.
         db_conn_str (str): Database connection string.
         table_name (str): Name of the database table used for storage.
+        model_reload_interval (float): Seconds between checks for a new model artifact
+                                       in the API (0 disables hot-swapping).
+        max_batch_size (int): Maximum number of records accepted by `/predict/batch`.
+        microbatch_enabled (bool): Whether concurrent `/predict` calls are coalesced
+                                   into one model call.
+        microbatch_window_ms (float): How long to collect `/predict` calls for one batch.
+        microbatch_max_size (int): Maximum number of `/predict` calls scored together.
+        fast_path_max_rows (int): Largest batch prepared without pandas in the API.
+        prediction_cache_enabled (bool): Whether API predictions are cached in memory.
+        prediction_cache_size (int): Maximum number of cached predictions per worker.
+        prediction_cache_ttl (float): Seconds a cached prediction stays valid.
+        scoring_chunk_size (int): Number of rows scored at once by offline batch scoring.
+        scoring_workers (int): Number of processes used by parallel batch scoring
+                               (0 uses all cores).
+        scoring_worker_chunk_size (int): Number of rows sent to a scoring process at once.
+        scoring_worker_threads (int): Number of CatBoost threads per scoring process.
+        dataset_cache_enabled (bool): Whether training loads the prepared dataset from
+                                      the on-disk cache instead of re-parsing the CSV file.
+        dataset_cache_dir (str): Directory holding the prepared dataset cache.
+        csv_engine (str): pandas engine parsing training CSV files, "pyarrow" (multithreaded,
+                          used if installed) or "c".
+        csv_chunk_size (int): Rows per chunk when parsing training CSV files in chunks to
+                              bound memory (0 parses the file at once).
+        db_pool_size (int): Number of database connections kept open per process.
+        db_max_overflow (int): Extra connections opened under load beyond `db_pool_size`.
+        db_pool_timeout (float): Seconds to wait for a free connection before failing.
+        db_pool_recycle (int): Seconds after which a connection is replaced (-1 never).
+        db_pool_pre_ping (bool): Whether connections are checked before being handed out.
+        ingest_batch_size (int): Number of rows inserted per transaction when bulk
+                                 loading the database.
+        incremental_iterations (int): Number of boosting iterations added per incremental
+                                      training run.
+        tuning_search_space (dict): CatBoost parameter name to the values tried by
+                                    hyperparameter tuning.
+        tuning_folds (int): Number of cross-validation folds per tuning candidate.
+        tuning_workers (int): Number of tuning processes (0 uses all cores divided by
+                              `tuning_thread_count`).
+        tuning_thread_count (int): Number of CatBoost threads per tuning process.
+        tuning_early_stopping_rounds (int): Iterations without improvement on the test
+                                            split after which a tuning fit stops.
+        compaction_f1_tolerance (float): Largest F1 drop accepted for a compacted model.
+        compaction_shrink_fractions (list): Fractions of the trees kept by shrunk variants.
+        compaction_depths (list): Tree depths of the retrained shallow variants.
+        compaction_top_features (list): Numbers of most important features kept by the
+                                        retrained feature-selection variants.
+        compaction_border_counts (list): Quantization border counts of the retrained
+                                         variants with coarser float splits.
+        inference_threads (int): Number of API threads running model inference.
+        max_pending_requests (int): Number of API requests that may wait for inference
+                                    before new ones are rejected with 503 (0 disables
+                                    the limit).
+        model_thread_count (int): Number of CatBoost threads per API prediction (-1 uses
+                                  all cores); API workers x inference threads x this
+                                  should not exceed the number of cores, so the
+                                  default of 1 keeps the inference threads from
+                                  oversubscribing the CPU.
+        warmup_iterations (int): Number of times `test_data` is scored through every
+                                 prediction path before a newly loaded model serves
+                                 requests (0 disables the warm-up).
+        model_candidates (dict): Name to artifact path of the models served next to
+                                 the primary model at `model_path`.
+        model_weights (dict): Name to the share of `/predict` and `/predict/batch`
+                              requests routed to a candidate model; the primary
+                              model gets the rest.
+        shadow_model (str): Name of a candidate model scored off the response path
+                            for every request it does not serve, to record how
+                            often it disagrees (empty disables shadow scoring).
+        shadow_window_ms (float): How long rows are collected for one shadow model call.
+        shadow_max_pending (int): Number of rows that may wait for shadow scoring
+                                  before new ones are dropped.
+        compiled_scorer_enabled (bool): Whether the API and `ModelService` score with
+                                        the compiled lookup tables stored next to
+                                        the model artifact, if they exist.
+        compiled_scorer_tolerance (float): Largest accepted difference between compiled
+                                           and native probabilities.
+        compiled_scorer_max_rows (int): Largest input scored with the compiled tables;
+                                        larger inputs are scored by CatBoost, which the
+                                        benchmark shows faster from 4 rows on.
+        explain_shap_mode (str): CatBoost `shap_mode` of explanations; "NoPreCalc" is the
+                                 fastest for the small inputs of the API.
+        explain_shap_calc_type (str): CatBoost `shap_calc_type`, "Regular" for exact
+                                      contributions or "Approximate", several times
+                                      faster but approximate per feature.
+        explain_timeout (float): Seconds an API explanation may take before the request
+                                 fails with 504; the result is still cached when it
+                                 completes (0 disables the timeout).
+        explain_threads (int): Number of API threads computing explanations, separate
+                               from the inference threads.
+        explain_max_pending (int): Number of rows that may be explained at once before
+                                   new explanation requests are rejected with 503 (0
+                                   disables the limit).
+        explain_cache_size (int): Maximum number of cached explanations per worker
+                                  (0 disables the cache).
+        explain_cache_ttl (float): Seconds a cached explanation stays valid.
+        max_explain_batch_size (int): Maximum number of records accepted by `/explain/batch`.
+        drift_enabled (bool): Whether the API sketches its inputs to report drift
+                              against the training data.
+        drift_bins (int): Number of quantile bins per numeric feature in the baseline.
+        drift_sketch_width (int): Counters per row of the categorical count-min sketches.
+        drift_sketch_depth (int): Rows of the categorical count-min sketches.
+        drift_psi_threshold (float): PSI above which a feature is reported as drifted.
+        environment (str): Deployment environment ("development", "staging" or
+                           "production"); selects the default log level and whether
+                           tracebacks show variable values. Defaults to "production";
+                           set `ENVIRONMENT=development` locally for DEBUG logs.
+        log_level (str): Log level overriding the environment default, e.g. "WARNING".
+        log_json (bool): Whether log records are written as JSON lines.
+        log_file (str): File the logs are written to (empty disables the file sink).
+        log_rotation (str): Size or age at which the log file is rotated.
+        log_error_interval (float): Seconds during which repeated errors from the same
+                                    call site are suppressed (0 disables rate limiting).
     """
 
     model_config = SettingsConfigDict(env_file="config/.env", env_file_encoding="utf-8")
     model_dir: str = "src/model/models"
-    model_filename: str = "catboost_model_v1.pkl"
+    model_filename: str = "catboost_model_v1.cbm"
     model_path: str = os.path.join(model_dir, model_filename)
     data_path: str = "data/dataset.csv"
     categorical_features: list = [
@@ -57,6 +182,17 @@ class Settings(BaseSettings):
         "sessions_per_minute",
         "fields_filled_x_sessions",
     ]
+    feature_dtypes: dict = {
+        "age": "int64",
+        "income": "float64",
+        "time_spent_on_platform": "float64",
+        "number_of_sessions": "int64",
+        "fields_filled_percentage": "float64",
+        "previous_year_filing": "int64",
+        "sessions_per_minute": "int64",
+        "fields_filled_x_sessions": "int64",
+    }
+    categorical_dtype: str = "str"
     target: str = "completed_filing"
     test_data: dict = {
         "age": 30,
@@ -72,7 +208,137 @@ class Settings(BaseSettings):
     }
     db_conn_str: str = "sqlite:///db.sqlite"
     table_name: str = "dataset"
+    model_reload_interval: float = 5.0
+    max_batch_size: int = 1000
+    microbatch_enabled: bool = True
+    microbatch_window_ms: float = 2.0
+    microbatch_max_size: int = 64
+    fast_path_max_rows: int = 256
+    prediction_cache_enabled: bool = False
+    prediction_cache_size: int = 10000
+    prediction_cache_ttl: float = 300.0
+    scoring_chunk_size: int = 100000
+    scoring_workers: int = 1
+    scoring_worker_chunk_size: int = 50000
+    scoring_worker_threads: int = 1
+    dataset_cache_enabled: bool = True
+    dataset_cache_dir: str = "data/cache"
+    csv_engine: str = "pyarrow"
+    csv_chunk_size: int = 0
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 3600
+    db_pool_pre_ping: bool = True
+    ingest_batch_size: int = 50000
+    incremental_iterations: int = 100
+    tuning_search_space: dict = {
+        "iterations": [300, 600],
+        "depth": [4, 6, 8],
+        "learning_rate": [0.05, 0.1],
+        "l2_leaf_reg": [3, 10],
+    }
+    tuning_folds: int = 5
+    tuning_workers: int = 0
+    tuning_thread_count: int = 1
+    tuning_early_stopping_rounds: int = 50
+    compaction_f1_tolerance: float = 0.005
+    compaction_shrink_fractions: list = [0.5, 0.75]
+    compaction_depths: list = [4]
+    compaction_top_features: list = [8]
+    compaction_border_counts: list = [32]
+    inference_threads: int = 4
+    max_pending_requests: int = 256
+    model_thread_count: int = 1
+    warmup_iterations: int = 10
+    model_candidates: dict = {}
+    model_weights: dict = {}
+    shadow_model: str = ""
+    shadow_window_ms: float = 50.0
+    shadow_max_pending: int = 4096
+    compiled_scorer_enabled: bool = False
+    compiled_scorer_tolerance: float = 1e-6
+    compiled_scorer_max_rows: int = 1
+    explain_shap_mode: str = "NoPreCalc"
+    explain_shap_calc_type: str = "Regular"
+    explain_timeout: float = 2.0
+    explain_threads: int = 1
+    explain_max_pending: int = 256
+    explain_cache_size: int = 10000
+    explain_cache_ttl: float = 3600.0
+    max_explain_batch_size: int = 100
+    drift_enabled: bool = True
+    drift_bins: int = 10
+    drift_sketch_width: int = 512
+    drift_sketch_depth: int = 4
+    drift_psi_threshold: float = 0.2
+    environment: str = "production"
+    log_level: str = ""
+    log_json: bool = False
+    log_file: str = "app.log"
+    log_rotation: str = "1 MB"
+    log_error_interval: float = 10.0
+
+
+def create_db_engine(conn_str, settings):
+    """
+    Creates a SQLAlchemy engine with the connection pool configured in `settings`.
+
+    SQLite databases are switched to WAL mode, which lets a streaming read and
+    writes to another table run side by side, with `synchronous=NORMAL`, which is
+    safe in WAL mode and avoids an fsync per committed transaction.
+
+    Args:
+        conn_str (str): Database connection string.
+        settings (Settings): The application settings.
+
+    Returns:
+        sqlalchemy.Engine: The engine.
+    """
+    from sqlalchemy import create_engine, event, make_url
+
+    url = make_url(conn_str)
+    options = {"pool_pre_ping": settings.db_pool_pre_ping, "pool_recycle": settings.db_pool_recycle}
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    engine = create_engine(url, **options)
+
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "connect")
+        def _configure_sqlite(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA journal_mode=WAL")
+            dbapi_connection.execute("PRAGMA synchronous=NORMAL")
+
+    return engine
 
 
 settings = Settings()
-engine = create_engine(settings.db_conn_str)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Returns the application engine, creating it on first use.
+
+    Returns:
+        sqlalchemy.Engine: The engine for `settings.db_conn_str`.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_db_engine(settings.db_conn_str, settings)
+    return _engine
+
+
+def __getattr__(name):
+    # Keeps `from config.config import engine` working while creating it lazily.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
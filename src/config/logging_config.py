@@ -0,0 +1,137 @@
+"""
+This module configures loguru for the API and the command line tools from the
+application settings. Sinks write through a background thread, so slow disks or
+consoles do not block request handling, and repeated errors from the same call
+site are rate limited, so an error storm cannot dominate CPU and disk I/O.
+
+Classes:
+    - ErrorRateLimiter: Loguru filter that drops repeated errors from one call site.
+
+Functions:
+    - resolve_log_level(settings): Returns the log level for the configured environment.
+    - configure_logging(settings, console, log_file): Replaces all sinks with the configured ones.
+"""
+
+import sys
+import threading
+import time
+
+from loguru import logger
+
+from src.config.config import settings as default_settings
+
+ENVIRONMENT_LOG_LEVELS = {
+    "development": "DEBUG",
+    "staging": "INFO",
+    "production": "INFO",
+}
+
+
+class ErrorRateLimiter:
+    """
+    Loguru filter that lets at most one error per call site through per interval.
+
+    Records below ERROR always pass. A suppressed error is counted, and the number
+    of errors suppressed since the last one is added to the next error emitted from
+    the same call site as `extra["suppressed"]`.
+
+    Loguru calls the filter of every sink with the same record, so the decision
+    taken for the first sink is reused for the others.
+
+    Attributes:
+        interval (float): Seconds during which repeated errors are suppressed.
+        suppressed (int): Number of errors suppressed so far.
+    """
+
+    def __init__(self, interval):
+        """
+        Initializes the filter.
+
+        Args:
+            interval (float): Seconds between two errors from the same call site
+                              (0 disables rate limiting).
+        """
+        self.interval = interval
+        self.suppressed = 0
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self, record):
+        """
+        Returns whether the record is emitted.
+        """
+        if self.interval <= 0 or record["level"].no < 40:
+            return True
+        if getattr(self._local, "record", None) is record:
+            return self._local.decision
+
+        key = (record["name"], record["function"], record["line"])
+        now = time.monotonic()
+        with self._lock:
+            last, count = self._seen.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._seen[key] = (last, count + 1)
+                self.suppressed += 1
+                decision = False
+            else:
+                self._seen[key] = (now, 0)
+                decision = True
+        if decision and count:
+            record["extra"]["suppressed"] = count
+
+        self._local.record, self._local.decision = record, decision
+        return decision
+
+
+def resolve_log_level(settings=default_settings):
+    """
+    Returns the log level for the configured environment.
+
+    Args:
+        settings (Settings, optional): The application settings.
+
+    Returns:
+        str: `settings.log_level` if set, else the default level of `settings.environment`.
+    """
+    if settings.log_level:
+        return settings.log_level.upper()
+    return ENVIRONMENT_LOG_LEVELS.get(settings.environment, "INFO")
+
+
+def configure_logging(settings=default_settings, console=True, log_file=None):
+    """
+    Replaces all loguru sinks with the ones configured in the settings.
+
+    Both sinks are enqueued, so records are written by a background thread. Variable
+    values in tracebacks (`diagnose`) are only rendered in development, as they are
+    expensive to format and may leak user data.
+
+    Args:
+        settings (Settings, optional): The application settings.
+        console (bool, optional): Whether to log to stdout.
+        log_file (str, optional): File to log to. Defaults to `settings.log_file`;
+                                  an empty string disables the file sink.
+
+    Returns:
+        ErrorRateLimiter: The filter shared by the sinks.
+    """
+    level = resolve_log_level(settings)
+    development = settings.environment == "development"
+    rate_limiter = ErrorRateLimiter(settings.log_error_interval)
+    options = {
+        "level": level,
+        "filter": rate_limiter,
+        "serialize": settings.log_json,
+        "enqueue": True,
+        "backtrace": development,
+        "diagnose": development,
+    }
+
+    logger.remove()
+    if console:
+        logger.add(sys.stdout, **options)
+    log_file = settings.log_file if log_file is None else log_file
+    if log_file:
+        logger.add(log_file, rotation=settings.log_rotation, **options)
+    return rate_limiter
@@ -6,7 +6,9 @@ Classes:
     TaxFix: Represents the TaxFix table in the database, containing user-related tax filing data.
 """
 
-from sqlalchemy import REAL, INTEGER, VARCHAR
+from datetime import datetime
+
+from sqlalchemy import REAL, INTEGER, VARCHAR, DateTime, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from src.config.config import settings
 
@@ -28,8 +30,14 @@ class TaxFix(Base):
     This model represents user data related to tax filing, including demographic details,
     platform usage behavior, and tax-filing history.
 
+    Rows are identified by a surrogate `id`, which increases with every insert and
+    therefore doubles as the watermark for incremental reads. On SQLite it is an
+    alias of the rowid, so lookups and range scans by `id` need no extra index.
+
     Attributes:
-        age (int): The age of the user (Primary Key).
+        id (int): Surrogate key assigned on insert (Primary Key).
+        ingested_at (datetime): When the row was loaded into the database (indexed).
+        age (int): The age of the user.
         income (float): The annual income of the user.
         employment_type (str): The employment type of the user (e.g., full-time, part-time).
         marital_status (str): The marital status of the user.
@@ -44,7 +52,11 @@ class TaxFix(Base):
 
     __tablename__ = settings.table_name
 
-    age: Mapped[int] = mapped_column(INTEGER(), primary_key=True)
+    id: Mapped[int] = mapped_column(INTEGER(), primary_key=True, autoincrement=True)
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime(), server_default=func.current_timestamp(), index=True
+    )
+    age: Mapped[int] = mapped_column(INTEGER())
     income: Mapped[float] = mapped_column(REAL())
     employment_type: Mapped[str] = mapped_column(VARCHAR())
     marital_status: Mapped[str] = mapped_column(VARCHAR())
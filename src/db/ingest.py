@@ -0,0 +1,81 @@
+"""
+This module bulk loads the dataset CSV into the `TaxFix` table. The file is read
+in chunks and every chunk is inserted with a single `executemany` call inside its
+own transaction, so memory stays bounded and the database commits once per chunk
+rather than once per row.
+
+Functions:
+    create_tables(bind): Creates the tables and indexes of all ORM models.
+    ingest_csv(path, batch_size, replace, bind): Loads a CSV file into the `TaxFix` table.
+"""
+
+import time
+
+from loguru import logger
+from sqlalchemy import insert
+
+from src.config.config import settings, get_engine
+from src.db.db_model import Base, TaxFix
+from src.model.pipeline.collection import TAXFIX_DTYPES, iter_data
+
+INGEST_COLUMNS = [
+    column.name
+    for column in TaxFix.__table__.columns
+    if column.name not in ("id", "ingested_at")
+]
+
+
+def create_tables(bind=None):
+    """
+    Creates the tables and indexes of all ORM models if they do not exist yet.
+
+    Args:
+        bind (sqlalchemy.Engine, optional): Engine to use. Defaults to `get_engine()`.
+    """
+    Base.metadata.create_all(bind or get_engine())
+
+
+def ingest_csv(path=settings.data_path, batch_size=settings.ingest_batch_size, replace=False, bind=None):
+    """
+    Loads a CSV file into the `TaxFix` table.
+
+    The insert statement is compiled once for the database driver and executed
+    with plain tuples (or dicts for drivers with named parameters), which skips the
+    per-row overhead of the ORM. `id` and `ingested_at` are assigned by the database.
+
+    Args:
+        path (str, optional): The CSV file to load. Defaults to `settings.data_path`.
+        batch_size (int, optional): Number of rows inserted per transaction.
+                                    Defaults to `settings.ingest_batch_size`.
+        replace (bool, optional): Drop and recreate the table before loading.
+        bind (sqlalchemy.Engine, optional): Engine to use. Defaults to `get_engine()`.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    bind = bind or get_engine()
+    table = TaxFix.__table__
+    if replace:
+        table.drop(bind, checkfirst=True)
+    create_tables(bind)
+
+    statement = str(insert(table).compile(dialect=bind.dialect, column_keys=INGEST_COLUMNS))
+    dtypes = {name: TAXFIX_DTYPES[name] for name in INGEST_COLUMNS}
+
+    started, total = time.perf_counter(), 0
+    for chunk in iter_data(path, batch_size):
+        chunk = chunk[INGEST_COLUMNS].astype(dtypes, copy=False)
+        if bind.dialect.positional:
+            params = list(chunk.itertuples(index=False, name=None))
+        else:
+            params = chunk.to_dict("records")
+        with bind.begin() as conn:
+            conn.exec_driver_sql(statement, params)
+
+        total += len(chunk)
+        logger.info(
+            f"Loaded {total} rows into {table.name}, "
+            f"{total / (time.perf_counter() - started):.0f} rows/sec"
+        )
+    logger.info(f"Finished loading {path}: {total} rows")
+    return total
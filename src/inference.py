@@ -1,67 +1,348 @@
 """
 This module defines an API using FastAPI for performing tax filing predictions.
-It loads a pre-trained machine learning model and processes user input data
-before making predictions.
+It loads a pre-trained machine learning model in the background at startup, warms
+it up, keeps it in memory and processes user input data before making predictions.
+The model file is watched in the background and hot-swapped when a new version is
+deployed; every new version is warmed up before it serves requests.
+
+Candidate models can be served next to the primary one: every request is routed
+to one model by weight, and a shadow model can score the same inputs off the
+response path to measure how often it disagrees with the served predictions.
+
+Every validated input also updates constant-size sketches of the feature
+distributions, which are compared with the training data of the primary model
+to report data drift.
+
+Only the modules the serving path needs are imported with this module; CatBoost
+is loaded with the model and pandas with the first batch that needs it, so a new
+worker accepts connections as soon as possible.
 
 Endpoints:
     - GET "/": Returns a welcome message.
-    - GET "/health": Health check endpoint.
+    - GET "/health": Health check endpoint reporting the active model version
+      and batching, cache, routing and shadow statistics.
+    - GET "/ready": Readiness probe, 503 until a warmed-up model is active.
     - POST "/predict": Accepts user input, processes it, and returns a prediction.
+    - POST "/predict/batch": Scores many inputs with a single model call.
+    - POST "/explain": Returns the SHAP contribution of every feature to a prediction.
+    - POST "/explain/batch": Explains many inputs with a single model call.
+    - GET "/drift": PSI and KS drift scores of every feature against the training data.
+    - POST "/drift/merge": Drift scores of the merged sketches of several workers.
+    - GET "/metrics": Request, error, latency, batch, model, routing, shadow, drift
+      and cache metrics in the Prometheus text format.
 
 Functions:
-    - load_model(): Loads the pre-trained tax filing prediction model.
+    - lifespan(app): Starts loading the model and watches it for changes.
+    - load_model(): Returns the in-memory tax filing prediction model.
+    - check_started(endpoint): Rejects requests while the model is loading at startup.
     - process_input(data: TaxFilingInput): Prepares input data for the model.
+    - process_batch(rows, record): Prepares many validated inputs as one columnar DataFrame.
+    - score_frame(model, df, record): Scores a prepared DataFrame with one model call.
+    - score_rows(model, rows, record): Scores validated inputs, skipping pandas for small batches.
+    - warm_up(model, iterations): Scores the test data through every prediction path.
+    - reset_drift(version): Starts drift monitoring against the baseline of a new model.
+    - observe_drift(rows): Adds validated inputs to the drift sketches.
+    - cache_key(model, version, row): Builds the prediction cache key of an input.
     - read_root(): Returns a welcome message for the API.
     - health_check(): Checks if the API is running.
-    - predict(input_data: TaxFilingInput): Processes input data and returns a prediction.
+    - readiness_check(): Reports whether the worker should receive traffic.
+    - drift_report(sketches): Reports the drift of the inputs served by this worker.
+    - merge_drift(snapshots): Reports the drift of the inputs served by several workers.
+    - explain_rows(model, rows): Computes the SHAP contributions of validated inputs.
+    - explain(payload, top_k): Validates an input and explains its prediction.
+    - explain_batch(records, top_k): Validates and explains a list of inputs.
+    - predict(payload): Validates and processes input data and returns a prediction.
+    - predict_batch(records): Validates and scores a list of inputs, reporting per-row errors.
+    - metrics(): Renders the collected metrics for scraping.
 
 Classes:
     - TaxFilingInput: Defines the expected input schema with constraints using Pydantic.
+    - PredictionBatcher: Coalesces concurrent `/predict` calls into one model call.
+    - InferenceExecutor: Runs model inference on a bounded thread pool with backpressure.
+    - ShadowScorer: Scores requests with the shadow model and records disagreements.
+    - ExplanationExecutor: Computes explanations on their own bounded thread pool,
+      sharing the computation of rows requested again while it is running.
 """
 
-import joblib
-import traceback
-import sys
-import os
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager, nullcontext
 
-from pydantic import BaseModel, conint, confloat, constr
-import pandas as pd
+from pydantic import BaseModel, ValidationError, conint, confloat, constr
+import numpy as np
 from loguru import logger
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from src.config.config import settings
-from src.model.pipeline.preparation import process_features
+from src.config.logging_config import configure_logging
+from src.model.pipeline.features import build_feature_columns, build_feature_vector
+from src.model.cache import PredictionCache
+from src.model.compiled import compiled_path, load_scoring_model
+from src.model.explain import format_explanation, shap_values
+from src.model.registry import ModelRegistry
+from src.model.artifact import load_metadata
+from src.model.router import PRIMARY, ModelRouter
+from src.monitoring.drift import DriftMonitor
+from src.monitoring.metrics import MetricsRegistry
+
+configure_logging(settings)
+
+registry = ModelRegistry(
+    settings.model_path,
+    loader=load_scoring_model,
+    watch_files=[compiled_path(settings.model_path)],
+)
+router = ModelRouter(
+    {
+        PRIMARY: registry,
+        **{
+            name: ModelRegistry(path, loader=load_scoring_model, watch_files=[compiled_path(path)])
+            for name, path in settings.model_candidates.items()
+        },
+    },
+    settings.model_weights,
+    settings.shadow_model or None,
+)
+
+prediction_cache = None
+if settings.prediction_cache_enabled:
+    prediction_cache = PredictionCache(
+        settings.prediction_cache_size, settings.prediction_cache_ttl
+    )
+    registry.add_listener(lambda version: prediction_cache.clear())
+
+explanation_cache = None
+if settings.explain_cache_size > 0:
+    explanation_cache = PredictionCache(settings.explain_cache_size, settings.explain_cache_ttl)
+    registry.add_listener(lambda version: explanation_cache.clear())
+
+metrics_registry = MetricsRegistry()
+REQUESTS = metrics_registry.counter(
+    "taxfix_requests_total", "Prediction requests received.", ["endpoint"]
+)
+REQUEST_ERRORS = metrics_registry.counter(
+    "taxfix_request_errors_total", "Prediction requests that failed.", ["endpoint", "cause"]
+)
+REQUEST_LATENCY = metrics_registry.histogram(
+    "taxfix_request_duration_seconds", "Time spent handling a prediction request.", ["endpoint"]
+)
+STAGE_LATENCY = metrics_registry.histogram(
+    "taxfix_stage_duration_seconds",
+    "Time spent in each stage of the prediction path "
+    "(validation, preparation, reindex, predict, explanation).",
+    ["stage"],
+)
+BATCH_SIZE = metrics_registry.histogram(
+    "taxfix_batch_size_rows",
+    "Number of rows scored in one model call.",
+    ["source"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096),
+)
+ROUTED_REQUESTS = metrics_registry.counter(
+    "taxfix_routed_requests_total", "Prediction requests served by each model.", ["model"]
+)
+SHADOW_PREDICTIONS = metrics_registry.counter(
+    "taxfix_shadow_predictions_total",
+    "Predictions compared with the shadow model, by serving model.",
+    ["model"],
+)
+SHADOW_DISAGREEMENTS = metrics_registry.counter(
+    "taxfix_shadow_disagreements_total",
+    "Predictions whose label differs from the shadow model's, by serving model.",
+    ["model"],
+)
+SHADOW_DROPPED = metrics_registry.counter(
+    "taxfix_shadow_dropped_total", "Rows not shadow scored because too many were waiting."
+)
+MODEL_LOADS = metrics_registry.counter("taxfix_model_loads_total", "Models loaded.")
+MODEL_LOAD_LATENCY = metrics_registry.histogram(
+    "taxfix_model_load_duration_seconds", "Time spent loading a model artifact."
+)
+metrics_registry.gauge(
+    "taxfix_model_info",
+    "The active model version.",
+    ["version"],
+    callback=lambda: {(registry.version,): 1} if registry.version else {},
+)
+metrics_registry.gauge(
+    "taxfix_model_memory_bytes",
+    "Resident memory added by loading each served model.",
+    ["model", "version"],
+    callback=lambda: {
+        (name, model_registry.version): model_registry.memory_bytes
+        for name, model_registry in router.registries.items()
+        if model_registry.memory_bytes is not None
+    },
+)
+metrics_registry.gauge(
+    "taxfix_cache",
+    "Prediction cache statistics.",
+    ["stat"],
+    callback=lambda: {
+        (name,): value for name, value in prediction_cache.stats().items()
+    } if prediction_cache is not None else {},
+)
+
+
+def _record_model_load(model_registry, version):
+    """
+    Records the load of a new model version in the metrics.
+    """
+    MODEL_LOADS.inc()
+    MODEL_LOAD_LATENCY.observe(model_registry.last_load_seconds)
+
+
+for _model_registry in router.registries.values():
+    _model_registry.add_listener(functools.partial(_record_model_load, _model_registry))
+
+drift_monitor = None
+
+
+def reset_drift(version):
+    """
+    Starts monitoring drift against the training baseline of a newly loaded
+    primary model. Models without a baseline in their metadata are not monitored.
+
+    Args:
+        version (str): Version of the loaded model.
+    """
+    global drift_monitor
+    baseline = (load_metadata(settings.model_path) or {}).get("drift_baseline")
+    if baseline is None:
+        logger.warning(f"Model {version} has no drift baseline, drift is not monitored")
+        drift_monitor = None
+    else:
+        drift_monitor = DriftMonitor(baseline, version)
+
+
+def observe_drift(rows):
+    """
+    Adds validated inputs to the drift sketches, if drift is monitored.
+
+    A single input is added as one feature vector; batches are prepared and added
+    column by column, so their cost on the event loop is a few vectorized
+    operations per feature rather than a sketch update per row.
+
+    Args:
+        rows (list[TaxFilingInput]): The validated inputs.
+    """
+    monitor = drift_monitor
+    if monitor is None or not rows:
+        return
+    if len(rows) == 1:
+        monitor.update(build_feature_vector(rows[0], monitor.features))
+    else:
+        monitor.update_columns(build_feature_columns(rows))
+
+
+if settings.drift_enabled:
+    registry.add_listener(reset_drift)
+    metrics_registry.gauge(
+        "taxfix_feature_psi",
+        "Population stability index of every feature against the training data.",
+        labelnames=("feature",),
+        callback=lambda: (
+            {(name,): scores["psi"] for name, scores in drift_monitor.report()["features"].items()}
+            if drift_monitor is not None
+            else {}
+        ),
+    )
+
+
+async def watch_model(interval):
+    """
+    Periodically checks the model artifacts and swaps in new versions if they changed.
+
+    Args:
+        interval (float): Seconds between two checks.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(router.refresh)
+
+
+async def load_model_in_background():
+    """
+    Loads the primary and candidate models in a worker thread.
+
+    A missing or broken model is logged; it is picked up by the watcher as soon
+    as a valid artifact appears.
+    """
+    await asyncio.to_thread(router.load)
 
-logger.remove()
-logger.add(sys.stdout, level="DEBUG")  # Log to GitHub Actions console
-logger.add("app.log", rotation="1 MB", level="DEBUG", enqueue=True, backtrace=True, diagnose=True)
 
-app = FastAPI()
+startup_task = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts loading the model once per worker and watches it for changes.
+
+    The model is loaded and warmed up in the background, so the worker serves
+    `/health` right away; predictions are answered with 503 and `/ready` reports
+    not ready until the model is active.
+    """
+    global startup_task
+    startup_task = asyncio.create_task(load_model_in_background())
+
+    watcher = None
+    if settings.model_reload_interval > 0:
+        watcher = asyncio.create_task(watch_model(settings.model_reload_interval))
+    yield
+    startup_task.cancel()
+    if watcher is not None:
+        watcher.cancel()
+    await batcher.stop()
+    inference.shutdown()
+    shadow.shutdown()
+    explainer.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 # To test inference API
 # poetry run uvicorn src.inference:app --reload
 # curl -X POST "http://127.0.0.1:8000/predict" -H "Content-Type: application/json" -d @src/test_input.json
 
 def load_model():
     """
-    Load the pre-trained tax filing prediction model.
+    Return the in-memory tax filing prediction model.
 
     Returns:
         model: The trained machine learning model.
 
     Raises:
-        HTTPException: If the model fails to load.
+        HTTPException: If no model has been loaded.
     """
 
     try:
-        if not os.path.exists(settings.model_path):
-            logger.error(f"Model file not found at {settings.model_path}")
-            raise HTTPException(status_code=500, detail="Model file is missing")
-
-        model = joblib.load(settings.model_path)
+        model, _ = registry.get()
         return model
-    except Exception as e:
-        logger.error(f"Error loading model: {e}\n{traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail="Model loading failed")
+    except LookupError:
+        logger.error(f"Model is not loaded from {settings.model_path}")
+        raise HTTPException(status_code=500, detail="Model file is missing")
+
+
+def check_started(endpoint):
+    """
+    Rejects a request while the model is still being loaded at startup.
+
+    Args:
+        endpoint (str): Name of the endpoint, used in the error metrics.
+
+    Raises:
+        HTTPException: 503 if the startup model load and warm-up have not finished yet.
+    """
+    if registry.version is None and startup_task is not None and not startup_task.done():
+        REQUEST_ERRORS.inc(endpoint=endpoint, cause="warming_up")
+        raise HTTPException(
+            status_code=503, detail="Model is still loading", headers={"Retry-After": "1"}
+        )
 
 
 class TaxFilingInput(BaseModel):
@@ -119,12 +400,707 @@ def process_input(data: TaxFilingInput):
     Returns:
         pd.DataFrame: Processed input data as a DataFrame.
     """
+    import pandas as pd
+
+    from src.model.pipeline.preparation import process_features
+
     df = pd.DataFrame([data.model_dump()])
     df = process_features(df)
     # logger.info(f"Processed input data")
     return df
 
 
+def _stage(stage, record):
+    """
+    Times a stage of the prediction path, or does nothing if `record` is False.
+    """
+    return STAGE_LATENCY.time(stage=stage) if record else nullcontext()
+
+
+def process_batch(rows, record=True):
+    """
+    Process many validated inputs before feeding them into the model.
+
+    The DataFrame is built column by column, so a batch costs a single frame
+    construction and a single `process_features` pass.
+
+    Args:
+        rows (list[TaxFilingInput]): Validated input data.
+        record (bool, optional): Whether the stage latency is recorded in the metrics.
+
+    Returns:
+        pd.DataFrame: Processed input data, one row per input in the same order.
+    """
+    import pandas as pd
+
+    from src.model.pipeline.preparation import process_features
+
+    with _stage("preparation", record):
+        columns = {
+            name: [getattr(row, name) for row in rows]
+            for name in TaxFilingInput.model_fields
+        }
+        return process_features(pd.DataFrame(columns))
+
+
+def score_frame(model, df, record=True):
+    """
+    Score a processed DataFrame with a single `predict_proba` call.
+
+    Args:
+        model: The trained machine learning model.
+        df (pd.DataFrame): Processed input data.
+        record (bool, optional): Whether the stage latencies are recorded in the metrics.
+
+    Returns:
+        tuple: (predicted labels, probability of the positive class) as arrays.
+    """
+    from src.model.pipeline.preparation import select_features
+
+    with _stage("reindex", record):
+        X = select_features(df, model.feature_names_)
+    with _stage("predict", record):
+        proba = model.predict_proba(X, thread_count=settings.model_thread_count)
+    return _labels_and_probabilities(model, proba)
+
+
+def score_rows(model, rows, record=True):
+    """
+    Score validated inputs with a single `predict_proba` call.
+
+    Batches of up to `settings.fast_path_max_rows` rows are prepared with
+    `build_feature_vector`, which avoids the DataFrame construction and column
+    conversions that dominate the cost of small batches. Larger batches go
+    through the vectorized pandas path.
+
+    Args:
+        model: The trained machine learning model.
+        rows (list[TaxFilingInput]): Validated input data.
+        record (bool, optional): Whether the stage latencies are recorded in the metrics.
+
+    Returns:
+        tuple: (predicted labels, probability of the positive class) as arrays.
+    """
+    if len(rows) > settings.fast_path_max_rows:
+        return score_frame(model, process_batch(rows, record), record)
+
+    with _stage("preparation", record):
+        feature_names = model.feature_names_
+        vectors = [build_feature_vector(row, feature_names) for row in rows]
+    with _stage("predict", record):
+        proba = model.predict_proba(vectors, thread_count=settings.model_thread_count)
+    return _labels_and_probabilities(model, proba)
+
+
+def warm_up(model, iterations=settings.warmup_iterations):
+    """
+    Scores `settings.test_data` through every prediction path of the API.
+
+    Each iteration validates the test input and scores it once as a single row
+    and once as a batch larger than `settings.fast_path_max_rows`, so CatBoost,
+    pydantic and the pandas preparation path are all initialized before the
+    model serves its first request. Warm-up calls are not recorded in the
+    latency metrics, so model loads do not add synthetic samples to them.
+
+    Args:
+        model: The trained machine learning model.
+        iterations (int, optional): Number of rounds. Defaults to
+                                    `settings.warmup_iterations`.
+    """
+    for _ in range(iterations):
+        row = TaxFilingInput.model_validate(settings.test_data)
+        score_rows(model, [row], record=False)
+        score_rows(model, [row] * (settings.fast_path_max_rows + 1), record=False)
+
+
+if settings.warmup_iterations > 0:
+    for _model_registry in router.registries.values():
+        _model_registry.warm_up = warm_up
+
+
+def cache_key(model, version, row):
+    """
+    Build the prediction cache key of a validated input.
+
+    The key holds the model version and the prepared feature values, so inputs
+    that only differ in ways the model cannot see share one entry.
+
+    Args:
+        model: The trained machine learning model.
+        version (str): The version of the model.
+        row (TaxFilingInput): Validated input data.
+
+    Returns:
+        tuple: The cache key.
+    """
+    return (version, *build_feature_vector(row, model.feature_names_))
+
+
+def _labels_and_probabilities(model, proba):
+    """
+    Derive the predicted labels from a `predict_proba` result.
+    """
+    labels = np.asarray(model.classes_)[np.argmax(proba, axis=1)]
+    return labels, proba[:, 1]
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single-row predictions into one vectorized model call.
+
+    Requests are queued and collected for up to `window_ms` milliseconds or until
+    `max_size` rows are waiting. The batch is then prepared and scored in a worker
+    thread, so the event loop keeps serving other requests, and every caller's
+    future is resolved with its own row of the result. Requests routed to
+    different models are collected together and scored with one call per model.
+
+    Batches are scored as tasks of their own while the next batch is collected,
+    with at most `max_in_flight` batches scoring at once. Once that many are
+    scoring, requests keep queueing up into the next batch and stay admitted, so
+    the backpressure of the inference executor still applies.
+
+    Attributes:
+        window (float): Maximum time in seconds to wait for a batch to fill up.
+        max_size (int): Maximum number of rows scored in one model call.
+        max_in_flight (int): Maximum number of batches scored at once.
+        batches (int): Number of model calls made so far.
+        rows (int): Number of rows scored so far.
+        sizes (Counter): Number of batches per power-of-two batch size bucket.
+    """
+
+    def __init__(self, window_ms, max_size, max_in_flight=1):
+        """
+        Initializes the batcher; the worker task is started on first use.
+
+        Args:
+            window_ms (float): Collection window in milliseconds.
+            max_size (int): Maximum batch size.
+            max_in_flight (int, optional): Maximum number of batches scored at
+                                           once, e.g. the number of inference threads.
+        """
+        self.window = window_ms / 1000
+        self.max_size = max(1, max_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.batches = 0
+        self.rows = 0
+        self.sizes = Counter()
+        self._queue = None
+        self._full = None
+        self._worker = None
+        self._slots = None
+        self._dispatches = set()
+
+    def _start(self):
+        """
+        Creates the queue and worker task on the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the worker task and fails any request still waiting in the queue or
+        being scored.
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        for task in self._dispatches:
+            task.cancel()
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+        self._worker = None
+
+    async def submit(self, row, model_name=PRIMARY):
+        """
+        Queues a validated input and waits for its prediction.
+
+        Args:
+            row (TaxFilingInput): The validated user input.
+            model_name (str, optional): The model the request was routed to.
+
+        Returns:
+            tuple: (predicted label, probability of the positive class)
+        """
+        if self._worker is None:
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, model_name, future))
+        if self._queue.qsize() >= self.max_size:
+            self._full.set()
+        return await future
+
+    async def _run(self):
+        """
+        Collects batches from the queue and scores them one after another.
+        """
+        while True:
+            items = [await self._queue.get()]
+            if self.window > 0 and self._queue.qsize() < self.max_size - 1:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            while len(items) < self.max_size and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            items = [item for item in items if not item[2].done()]
+            if items:
+                self.record(len(items))
+                groups = {}
+                for row, model_name, future in items:
+                    groups.setdefault(model_name, []).append((row, future))
+                for model_name, group in groups.items():
+                    await self._slots.acquire()
+                    task = asyncio.create_task(self._dispatch(model_name, group))
+                    self._dispatches.add(task)
+                    task.add_done_callback(self._dispatched)
+
+    def _dispatched(self, task):
+        """
+        Frees the slot of a finished batch.
+        """
+        self._dispatches.discard(task)
+        self._slots.release()
+
+    async def _dispatch(self, model_name, items):
+        """
+        Scores the rows of one model in a worker thread and resolves the callers' futures.
+        """
+        try:
+            model, _ = router.get(model_name)
+            labels, probabilities = await inference.run(
+                score_rows, model, [row for row, _ in items]
+            )
+        except asyncio.CancelledError:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(RuntimeError("Prediction batcher stopped"))
+            raise
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), label, probability in zip(items, labels, probabilities):
+            if not future.done():
+                future.set_result((label, probability))
+
+    def record(self, size):
+        """
+        Records the size of a dispatched batch.
+        """
+        self.batches += 1
+        self.rows += size
+        self.sizes[1 << (size - 1).bit_length()] += 1
+        BATCH_SIZE.observe(size, source="microbatch")
+
+    def stats(self):
+        """
+        Returns the batch size statistics achieved so far.
+
+        Returns:
+            dict: Number of batches and rows, batches being scored, mean batch size
+            and a histogram of batch sizes keyed by their power-of-two upper bound.
+        """
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "in_flight": len(self._dispatches),
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "batch_size_histogram": {
+                f"<={size}": count for size, count in sorted(self.sizes.items())
+            },
+        }
+
+
+class InferenceExecutor:
+    """
+    Runs model inference on a bounded thread pool, so the event loop keeps serving
+    other requests while CatBoost, which releases the GIL, is scoring.
+
+    Requests are admitted with `admit`, which counts them until their response is
+    ready. Once `max_pending` requests are waiting, further requests are rejected
+    with 503 instead of queueing up without bound.
+
+    Attributes:
+        max_workers (int): Number of inference threads.
+        max_pending (int): Maximum number of requests waiting for inference.
+        pending (int): Number of requests currently admitted.
+        rejected (int): Number of requests rejected so far.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        """
+        Initializes the executor; the thread pool is started on first use.
+
+        Args:
+            max_workers (int): Number of inference threads.
+            max_pending (int): Maximum number of requests waiting for inference
+                               (0 disables the limit).
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+
+    @contextmanager
+    def admit(self, endpoint):
+        """
+        Counts a request as pending for the duration of the `with` block.
+
+        Only ever called from the event loop, so the counter needs no lock.
+
+        Args:
+            endpoint (str): Name of the endpoint, used in the error metrics.
+
+        Raises:
+            HTTPException: 503 if too many requests are already waiting.
+        """
+        if self.max_pending and self.pending >= self.max_pending:
+            self.rejected += 1
+            REQUEST_ERRORS.inc(endpoint=endpoint, cause="overloaded")
+            raise HTTPException(
+                status_code=503,
+                detail="Too many pending predictions, retry later",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def run(self, func, *args):
+        """
+        Runs `func(*args)` on the inference thread pool.
+
+        Returns:
+            The result of the call.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="inference")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def shutdown(self):
+        """
+        Stops the thread pool; a new one is started if the executor is used again.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        """
+        Returns the pool size, number of pending requests and rejections.
+
+        Returns:
+            dict: The executor statistics.
+        """
+        return {
+            "threads": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+
+class ShadowScorer:
+    """
+    Scores requests with the shadow model off the response path and records how
+    often its labels disagree with the predictions that were served.
+
+    Served predictions are buffered once the response is ready and scored on a
+    dedicated thread with a single CatBoost thread, so they never occupy the
+    inference pool. Rows are collected for `window_ms` milliseconds and scored
+    with one call, which keeps the shadow model's share of CPU low. Once
+    `max_pending` rows are waiting, new ones are dropped instead of buffered, so a
+    slow shadow model cannot build up a backlog.
+
+    Attributes:
+        model_name (str or None): Name of the shadow model; None disables scoring.
+        window (float): Time in seconds rows are collected for one shadow call.
+        max_pending (int): Maximum number of rows waiting.
+        pending (int): Number of rows waiting or being scored.
+        dropped (int): Number of rows dropped so far.
+        compared (Counter): Number of predictions compared, by serving model.
+        disagreements (Counter): Number of differing labels, by serving model.
+        probability_delta (Counter): Sum of the absolute differences of the
+                                     positive class probability, by serving model.
+    """
+
+    def __init__(self, model_name, window_ms, max_pending):
+        """
+        Initializes the scorer; the thread is started on first use.
+
+        Args:
+            model_name (str or None): Name of the shadow model in the router.
+            window_ms (float): Collection window in milliseconds.
+            max_pending (int): Maximum number of rows waiting.
+        """
+        self.model_name = model_name
+        self.window = window_ms / 1000
+        self.max_pending = max(1, max_pending)
+        self.pending = 0
+        self.dropped = 0
+        self.compared = Counter()
+        self.disagreements = Counter()
+        self.probability_delta = Counter()
+        self._buffer = []
+        self._executor = None
+        self._task = None
+
+    def submit(self, served, rows, labels, probabilities):
+        """
+        Buffers served predictions for comparison with the shadow model.
+
+        Only ever called from the event loop, so the buffer needs no lock.
+
+        Args:
+            served (str): Name of the model that served the predictions.
+            rows (list[TaxFilingInput]): The validated inputs.
+            labels (list): The served labels, aligned with `rows`.
+            probabilities (list): The served positive class probabilities.
+        """
+        if self.model_name is None or served == self.model_name or not rows:
+            return
+        if self.pending + len(rows) > self.max_pending:
+            self.dropped += len(rows)
+            SHADOW_DROPPED.inc(len(rows))
+            return
+        self.pending += len(rows)
+        self._buffer.append((served, rows, labels, probabilities))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    @staticmethod
+    def _score(model, rows):
+        """
+        Scores rows with the shadow model without recording stage metrics.
+        """
+        vectors = [build_feature_vector(row, model.feature_names_) for row in rows]
+        return _labels_and_probabilities(model, model.predict_proba(vectors, thread_count=1))
+
+    async def _drain(self):
+        """
+        Scores the buffered rows with the shadow model until the buffer is empty.
+        """
+        while self._buffer:
+            await asyncio.sleep(self.window)
+            items, self._buffer = self._buffer, []
+            rows = [row for _, item_rows, _, _ in items for row in item_rows]
+            try:
+                model, _ = router.get(self.model_name)
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(1, thread_name_prefix="shadow")
+                loop = asyncio.get_running_loop()
+                labels, probabilities = await loop.run_in_executor(
+                    self._executor, functools.partial(self._score, model, rows)
+                )
+            except LookupError:
+                continue
+            except Exception as e:
+                logger.exception(f"Error during shadow prediction: {e}")
+                continue
+            finally:
+                self.pending -= len(rows)
+
+            start = 0
+            for served, item_rows, served_labels, served_probabilities in items:
+                end = start + len(item_rows)
+                self._record(
+                    served,
+                    np.asarray(served_labels) != labels[start:end],
+                    np.abs(np.asarray(served_probabilities, dtype=float) - probabilities[start:end]),
+                )
+                start = end
+
+    def _record(self, served, differs, delta):
+        """
+        Records the comparison of predictions served by one model.
+        """
+        disagreements = int(np.sum(differs))
+        self.compared[served] += len(differs)
+        self.disagreements[served] += disagreements
+        self.probability_delta[served] += float(np.sum(delta))
+        SHADOW_PREDICTIONS.inc(len(differs), model=served)
+        if disagreements:
+            SHADOW_DISAGREEMENTS.inc(disagreements, model=served)
+
+    def shutdown(self):
+        """
+        Drops the buffered rows and stops the thread.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._buffer = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        """
+        Returns the disagreement rates with the shadow model.
+
+        Returns:
+            dict: The shadow model, pending and dropped rows, and per serving model
+            the number of compared predictions, the share of differing labels and
+            the mean absolute probability difference.
+        """
+        return {
+            "model": self.model_name,
+            "pending": self.pending,
+            "dropped": self.dropped,
+            "served_by": {
+                served: {
+                    "compared": count,
+                    "disagreement_rate": round(self.disagreements[served] / count, 5),
+                    "mean_probability_delta": round(self.probability_delta[served] / count, 5),
+                }
+                for served, count in self.compared.items()
+            },
+        }
+
+
+class ExplanationExecutor:
+    """
+    Computes explanations on a bounded thread pool of their own, so slow SHAP
+    calls never occupy the inference threads serving `/predict`.
+
+    Every row is tracked by its cache key until its contributions are computed,
+    also after the request waiting for it has timed out. A request for a row that
+    is already being explained, like the retry of a timed out request, waits for
+    that computation instead of starting a new one. Once `max_pending` rows are
+    being explained, requests for further rows are rejected with 503.
+
+    Attributes:
+        max_workers (int): Number of explanation threads.
+        max_pending (int): Maximum number of rows being explained.
+        rejected (int): Number of requests rejected so far.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        """
+        Initializes the executor; the thread pool is started on first use.
+
+        Args:
+            max_workers (int): Number of explanation threads.
+            max_pending (int): Maximum number of rows being explained
+                               (0 disables the limit).
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.rejected = 0
+        self._running = {}
+        self._executor = None
+
+    @property
+    def pending(self):
+        """
+        int: Number of rows being explained.
+        """
+        return len(self._running)
+
+    def submit(self, endpoint, model, keys, rows):
+        """
+        Starts explaining the rows that are not being explained yet.
+
+        Only ever called from the event loop, so the running rows need no lock.
+
+        Args:
+            endpoint (str): Name of the endpoint, used in the error metrics.
+            model: The trained machine learning model.
+            keys (list[tuple]): The explanation cache keys of the rows.
+            rows (list[TaxFilingInput]): Validated input data.
+
+        Returns:
+            list[tuple]: Per row, the future computing its contributions and the
+            position of the row in that future's result.
+
+        Raises:
+            HTTPException: 503 if too many rows are already being explained.
+        """
+        new = {}
+        for key, row in zip(keys, rows):
+            if key not in self._running:
+                new.setdefault(key, row)
+
+        if new:
+            if self.max_pending and len(self._running) + len(new) > self.max_pending:
+                self.rejected += 1
+                REQUEST_ERRORS.inc(endpoint=endpoint, cause="overloaded")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many pending explanations, retry later",
+                    headers={"Retry-After": "1"},
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="explain")
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, functools.partial(explain_rows, model, list(new.values()))
+            )
+            for position, key in enumerate(new):
+                self._running[key] = (future, position)
+            future.add_done_callback(functools.partial(self._finish, list(new)))
+
+        return [self._running[key] for key in keys]
+
+    def _finish(self, keys, future):
+        """
+        Stops tracking the rows of a finished computation and caches their contributions.
+        """
+        for key in keys:
+            self._running.pop(key, None)
+        if not future.cancelled() and future.exception() is None and explanation_cache is not None:
+            for key, values in zip(keys, future.result()):
+                explanation_cache.put(key, values)
+
+    def shutdown(self):
+        """
+        Stops the thread pool; a new one is started if the executor is used again.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        """
+        Returns the pool size, number of rows being explained and rejections.
+
+        Returns:
+            dict: The executor statistics.
+        """
+        return {
+            "threads": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+
+inference = InferenceExecutor(settings.inference_threads, settings.max_pending_requests)
+batcher = PredictionBatcher(
+    settings.microbatch_window_ms, settings.microbatch_max_size, inference.max_workers
+)
+shadow = ShadowScorer(router.shadow, settings.shadow_window_ms, settings.shadow_max_pending)
+explainer = ExplanationExecutor(settings.explain_threads, settings.explain_max_pending)
+metrics_registry.gauge(
+    "taxfix_inference_pending",
+    "Requests admitted and waiting for inference.",
+    callback=lambda: {(): inference.pending},
+)
+
+
 @app.get("/")
 async def read_root():
     """
@@ -142,33 +1118,477 @@ async def health_check():
     Health check endpoint.
 
     Returns:
-        dict: API status message.
+        dict: API status message and the version of the active model.
+    """
+    return {
+        "status": "API is running",
+        "model_loaded": registry.version is not None,
+        "model_version": registry.version,
+        "ready": registry.version is not None,
+        "batching": batcher.stats(),
+        "inference": inference.stats(),
+        "cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "explanation_cache": (
+            explanation_cache.stats() if explanation_cache is not None else None
+        ),
+        "explanations": explainer.stats(),
+        "models": router.stats(),
+        "shadow": shadow.stats(),
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe for the load balancer.
+
+    A model only becomes active once it has been loaded and warmed up, so the
+    worker reports ready as soon as a model is active.
+
+    Returns:
+        JSONResponse: 200 with the model version and load and warm-up times when
+        ready, 503 otherwise.
+    """
+    if registry.version is None:
+        return JSONResponse({"ready": False}, status_code=503)
+    return {
+        "ready": True,
+        "model_version": registry.version,
+        "load_seconds": registry.last_load_seconds,
+        "warmup_seconds": registry.last_warmup_seconds,
+    }
+
+
+@app.get("/drift")
+async def drift_report(sketches: bool = False):
+    """
+    Reports the drift of the inputs served by this worker against the training
+    data of the primary model.
+
+    Every worker keeps its own sketches; with `sketches=true` their state is
+    returned too, so the reports of several workers can be combined with
+    `POST /drift/merge`.
+
+    Args:
+        sketches (bool, optional): Whether to include the state of the sketches.
+
+    Returns:
+        dict: The PSI and KS scores of every feature and the drifted features.
+
+    Raises:
+        HTTPException: 404 if drift is not monitored for the active model.
+    """
+    monitor = drift_monitor
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Drift is not monitored for the active model")
+    report = monitor.report()
+    if sketches:
+        report["sketches"] = monitor.snapshot()
+    return report
+
+
+@app.post("/drift/merge")
+async def merge_drift(snapshots: list[dict] = Body(...)):
+    """
+    Reports the drift of the inputs served by several workers.
+
+    Each worker only sketches its own traffic. Collect the `sketches` of every
+    worker from `GET /drift?sketches=true` and post them here to compare their
+    combined inputs with the training data. The sketches of this worker are not
+    included unless they are posted as well, and they are left unchanged.
+
+    Args:
+        snapshots (list[dict]): The `sketches` reported by every worker.
+
+    Returns:
+        dict: The PSI and KS scores of the merged sketches and the drifted features.
+
+    Raises:
+        HTTPException: 404 if drift is not monitored for the active model, 409 if a
+                       snapshot belongs to another model version or sketch size.
     """
-    return {"status": "API is running"}
+    monitor = drift_monitor
+    if monitor is None:
+        raise HTTPException(status_code=404, detail="Drift is not monitored for the active model")
+    merged = DriftMonitor(monitor.baseline, monitor.version)
+    try:
+        for snapshot in snapshots:
+            merged.merge(snapshot)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=409, detail=f"Snapshots cannot be merged: {e}")
+    report = merged.report()
+    report["workers"] = len(snapshots)
+    return report
 
 
 # Prediction endpoint
-@app.post("/predict")
-async def predict(input_data: TaxFilingInput):
+@app.post(
+    "/predict",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": TaxFilingInput.model_json_schema()}},
+        }
+    },
+)
+async def predict(payload: dict = Body(...)):
     """
     Endpoint to make a tax filing prediction.
 
+    The payload is validated here rather than by FastAPI, so the time spent in
+    validation is measured as a stage of its own.
+
     Args:
-        input_data (TaxFilingInput): The structured user input.
+        payload (dict): The user input following the `TaxFilingInput` schema.
 
     Returns:
         dict: The predicted tax filing completion status.
 
     Raises:
-        HTTPException: If prediction fails due to processing errors.
+        RequestValidationError: If the input does not match the schema.
+        HTTPException: If the model is still loading or the service is overloaded
+                       (503), or prediction fails.
     """
+    REQUESTS.inc(endpoint="predict")
+    started = time.perf_counter()
     try:
-        processed_input = process_input(input_data)
-        model = load_model()
-        expected_features = model.feature_names_
-        processed_input = processed_input[expected_features]
-        prediction = model.predict(processed_input)[0]
+        try:
+            with STAGE_LATENCY.time(stage="validation"):
+                input_data = TaxFilingInput.model_validate(payload)
+        except ValidationError as e:
+            REQUEST_ERRORS.inc(endpoint="predict", cause="validation")
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+
+        check_started("predict")
+        with inference.admit("predict"):
+            return await _predict(input_data)
+    finally:
+        REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint="predict")
+
+
+async def _predict(input_data):
+    """
+    Routes and scores an admitted `/predict` request, using the cache when enabled.
+    """
+    try:
+        observe_drift([input_data])
+        model_name = router.choose()
+        ROUTED_REQUESTS.inc(model=model_name)
+        model, version = router.get(model_name)
+        key, cached = None, None
+        if prediction_cache is not None:
+            key = cache_key(model, version, input_data)
+            cached = prediction_cache.get(key)
+
+        if cached is not None:
+            prediction, probability = cached
+        elif settings.microbatch_enabled:
+            prediction, probability = await batcher.submit(input_data, model_name)
+        else:
+            labels, probabilities = await inference.run(score_rows, model, [input_data])
+            BATCH_SIZE.observe(1, source="predict")
+            prediction, probability = labels[0], probabilities[0]
+
+        if key is not None and cached is None:
+            prediction_cache.put(key, (int(prediction), float(probability)))
+        shadow.submit(model_name, [input_data], [prediction], [probability])
         return {"completed_filing": int(prediction)}
     except Exception as e:
-        logger.error(f"Error during prediction: {e}\n{traceback.format_exc()}")
+        cause = "model_unavailable" if isinstance(e, (LookupError, HTTPException)) else "prediction"
+        REQUEST_ERRORS.inc(endpoint="predict", cause=cause)
+        logger.exception(f"Error during prediction: {e}")
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+
+@app.post("/predict/batch")
+async def predict_batch(records: list[dict] = Body(...)):
+    """
+    Endpoint to make tax filing predictions for many users in one call.
+
+    Every record is validated on its own; invalid records are reported with
+    their validation errors while the valid ones are still scored.
+
+    Args:
+        records (list[dict]): Raw user inputs following the `TaxFilingInput` schema.
+
+    Returns:
+        dict: The model version and one result per record, in input order.
+
+    Raises:
+        HTTPException: If the batch is too large (413), the model is still loading
+                       or the service is overloaded (503), or prediction fails.
+    """
+    REQUESTS.inc(endpoint="predict_batch")
+    with REQUEST_LATENCY.time(endpoint="predict_batch"):
+        return await _predict_batch(records)
+
+
+async def _predict_batch(records):
+    """
+    Validates and scores the records of a `/predict/batch` request.
+    """
+    if len(records) > settings.max_batch_size:
+        REQUEST_ERRORS.inc(endpoint="predict_batch", cause="batch_too_large")
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size {len(records)} exceeds the limit of {settings.max_batch_size}",
+        )
+
+    results = [None] * len(records)
+    indices, rows = [], []
+    with STAGE_LATENCY.time(stage="validation"):
+        for i, record in enumerate(records):
+            try:
+                rows.append(TaxFilingInput.model_validate(record))
+                indices.append(i)
+            except ValidationError as e:
+                results[i] = {
+                    "index": i,
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+    if len(rows) < len(records):
+        REQUEST_ERRORS.inc(len(records) - len(rows), endpoint="predict_batch", cause="validation")
+
+    check_started("predict_batch")
+    with inference.admit("predict_batch"):
+        return await _score_batch(results, indices, rows)
+
+
+async def _score_batch(results, indices, rows):
+    """
+    Routes and scores the valid records of an admitted `/predict/batch` request
+    into `results`.
+    """
+    try:
+        observe_drift(rows)
+        model_name = router.choose()
+        ROUTED_REQUESTS.inc(model=model_name)
+        model, version = router.get(model_name)
+        pending = []
+        for i, row in zip(indices, rows):
+            key, cached = None, None
+            if prediction_cache is not None:
+                key = cache_key(model, version, row)
+                cached = prediction_cache.get(key)
+            if cached is not None:
+                results[i] = {"index": i, "completed_filing": cached[0], "probability": cached[1]}
+            else:
+                pending.append((i, row, key))
+
+        if pending:
+            labels, probabilities = await inference.run(
+                score_rows, model, [row for _, row, _ in pending]
+            )
+            BATCH_SIZE.observe(len(pending), source="predict_batch")
+            for (i, _, key), label, probability in zip(pending, labels, probabilities):
+                results[i] = {
+                    "index": i,
+                    "completed_filing": int(label),
+                    "probability": float(probability),
+                }
+                if key is not None:
+                    prediction_cache.put(key, (int(label), float(probability)))
+        shadow.submit(
+            model_name,
+            rows,
+            [results[i]["completed_filing"] for i in indices],
+            [results[i]["probability"] for i in indices],
+        )
+        return {"model_version": version, "results": results}
+    except Exception as e:
+        cause = "model_unavailable" if isinstance(e, LookupError) else "prediction"
+        REQUEST_ERRORS.inc(endpoint="predict_batch", cause=cause)
+        logger.exception(f"Error during batch prediction: {e}")
         raise HTTPException(status_code=500, detail="Prediction failed")
+
+
+def explain_rows(model, rows):
+    """
+    Computes the SHAP contributions of validated inputs with one model call.
+
+    Args:
+        model: The trained machine learning model.
+        rows (list[TaxFilingInput]): Validated input data.
+
+    Returns:
+        np.ndarray: One row of contributions and the expected value per input.
+    """
+    with STAGE_LATENCY.time(stage="preparation"):
+        vectors = [build_feature_vector(row, model.feature_names_) for row in rows]
+    with STAGE_LATENCY.time(stage="explanation"):
+        return shap_values(model, vectors)
+
+
+async def _explain(endpoint, rows, top_k):
+    """
+    Explains validated inputs with the primary model, computing only those not
+    found in the explanation cache.
+
+    Returns:
+        tuple: (model version, list of explanations in input order)
+    """
+    model, version = registry.get()
+    keys = [cache_key(model, version, row) for row in rows]
+    values = [None] * len(rows)
+    if explanation_cache is not None:
+        values = [explanation_cache.get(key) for key in keys]
+
+    missing = [i for i, value in enumerate(values) if value is None]
+    if missing:
+        waiting = explainer.submit(
+            endpoint, model, [keys[i] for i in missing], [rows[i] for i in missing]
+        )
+        _, running = await asyncio.wait(
+            {task for task, _ in waiting}, timeout=settings.explain_timeout or None
+        )
+        if running:
+            REQUEST_ERRORS.inc(endpoint=endpoint, cause="timeout")
+            raise HTTPException(
+                status_code=504,
+                detail=f"Explanation took longer than {settings.explain_timeout}s, retry later",
+                headers={"Retry-After": "1"},
+            )
+        BATCH_SIZE.observe(len(missing), source=endpoint)
+        for i, (task, position) in zip(missing, waiting):
+            values[i] = task.result()[position]
+
+    return version, [
+        format_explanation(model.feature_names_, key[1:], value, top_k)
+        for key, value in zip(keys, values)
+    ]
+
+
+@app.post(
+    "/explain",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": TaxFilingInput.model_json_schema()}},
+        }
+    },
+)
+async def explain(payload: dict = Body(...), top_k: int | None = Query(None, ge=1)):
+    """
+    Endpoint to explain a tax filing prediction.
+
+    Returns the contribution of every feature to the prediction of the primary
+    model in log-odds, computed with CatBoost's tree SHAP and cached per input
+    and model version.
+
+    Args:
+        payload (dict): The user input following the `TaxFilingInput` schema.
+        top_k (int, optional): Only return the `top_k` features with the largest
+                               absolute contribution.
+
+    Returns:
+        dict: The model version, the probability of completing the filing and the
+        feature contributions ordered by decreasing absolute value.
+
+    Raises:
+        RequestValidationError: If the input does not match the schema.
+        HTTPException: If the model is still loading or the service is overloaded
+                       (503), the explanation exceeds `settings.explain_timeout`
+                       (504), or it fails.
+    """
+    REQUESTS.inc(endpoint="explain")
+    with REQUEST_LATENCY.time(endpoint="explain"):
+        try:
+            with STAGE_LATENCY.time(stage="validation"):
+                input_data = TaxFilingInput.model_validate(payload)
+        except ValidationError as e:
+            REQUEST_ERRORS.inc(endpoint="explain", cause="validation")
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+
+        check_started("explain")
+        try:
+            version, explanations = await _explain("explain", [input_data], top_k)
+        except HTTPException:
+            raise
+        except Exception as e:
+            cause = "model_unavailable" if isinstance(e, LookupError) else "explanation"
+            REQUEST_ERRORS.inc(endpoint="explain", cause=cause)
+            logger.exception(f"Error during explanation: {e}")
+            raise HTTPException(status_code=500, detail="Explanation failed")
+        return {"model_version": version, **explanations[0]}
+
+
+@app.post("/explain/batch")
+async def explain_batch(records: list[dict] = Body(...), top_k: int | None = Query(None, ge=1)):
+    """
+    Endpoint to explain the predictions of many users in one call.
+
+    Every record is validated on its own; invalid records are reported with
+    their validation errors while the valid ones are still explained.
+
+    Args:
+        records (list[dict]): Raw user inputs following the `TaxFilingInput` schema.
+        top_k (int, optional): Only return the `top_k` features with the largest
+                               absolute contribution per record.
+
+    Returns:
+        dict: The model version and one result per record, in input order.
+
+    Raises:
+        HTTPException: If the batch is too large (413), the model is still loading
+                       or the service is overloaded (503), the explanation exceeds
+                       `settings.explain_timeout` (504), or it fails.
+    """
+    REQUESTS.inc(endpoint="explain_batch")
+    with REQUEST_LATENCY.time(endpoint="explain_batch"):
+        if len(records) > settings.max_explain_batch_size:
+            REQUEST_ERRORS.inc(endpoint="explain_batch", cause="batch_too_large")
+            raise HTTPException(
+                status_code=413,
+                detail=(
+                    f"Batch size {len(records)} exceeds the limit of "
+                    f"{settings.max_explain_batch_size}"
+                ),
+            )
+
+        results = [None] * len(records)
+        indices, rows = [], []
+        with STAGE_LATENCY.time(stage="validation"):
+            for i, record in enumerate(records):
+                try:
+                    rows.append(TaxFilingInput.model_validate(record))
+                    indices.append(i)
+                except ValidationError as e:
+                    results[i] = {
+                        "index": i,
+                        "errors": e.errors(include_url=False, include_context=False),
+                    }
+        if len(rows) < len(records):
+            REQUEST_ERRORS.inc(
+                len(records) - len(rows), endpoint="explain_batch", cause="validation"
+            )
+
+        check_started("explain_batch")
+        try:
+            version, explanations = await _explain("explain_batch", rows, top_k)
+        except HTTPException:
+            raise
+        except Exception as e:
+            cause = "model_unavailable" if isinstance(e, LookupError) else "explanation"
+            REQUEST_ERRORS.inc(endpoint="explain_batch", cause=cause)
+            logger.exception(f"Error during batch explanation: {e}")
+            raise HTTPException(status_code=500, detail="Explanation failed")
+        for i, explanation in zip(indices, explanations):
+            results[i] = {"index": i, **explanation}
+        return {"model_version": version, "results": results}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Metrics endpoint for Prometheus scraping.
+
+    Returns:
+        PlainTextResponse: All metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4"
+    )
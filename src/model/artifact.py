@@ -0,0 +1,161 @@
+"""
+This module reads and writes model artifacts. Models are stored in CatBoost's
+native `.cbm` format, which loads without unpickling Python objects and does not
+depend on the Python version, together with a JSON metadata sidecar describing
+the features and version of the model. Legacy joblib `.pkl` artifacts can still
+be loaded. CatBoost and joblib are imported on first use, so importing this
+module stays cheap.
+
+Functions:
+    - metadata_path(path): Returns the path of the metadata sidecar of an artifact.
+    - resolve_artifact_path(path): Returns the artifact file that will actually be loaded.
+    - save_model_artifact(model, path, metadata): Saves a model and its metadata.
+    - load_model_artifact(path): Loads a model from a native or legacy artifact.
+    - load_metadata(path): Loads the metadata sidecar of an artifact.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+from loguru import logger
+
+LEGACY_SUFFIX = ".pkl"
+NATIVE_SUFFIX = ".cbm"
+
+
+def metadata_path(path):
+    """
+    Returns the path of the metadata sidecar of an artifact.
+
+    Args:
+        path (str): Path of the model artifact.
+
+    Returns:
+        str: The artifact path with a `.json` suffix.
+    """
+    return os.path.splitext(path)[0] + ".json"
+
+
+def resolve_artifact_path(path):
+    """
+    Returns the artifact file that will actually be loaded for `path`.
+
+    If a native `.cbm` artifact is requested but only a legacy `.pkl` file with
+    the same name exists, the legacy file is used.
+
+    Args:
+        path (str): Path of the requested model artifact.
+
+    Returns:
+        str: The path of the existing artifact, or `path` if neither exists.
+    """
+    if os.path.exists(path) or not path.endswith(NATIVE_SUFFIX):
+        return path
+    legacy_path = os.path.splitext(path)[0] + LEGACY_SUFFIX
+    return legacy_path if os.path.exists(legacy_path) else path
+
+
+def save_model_artifact(model, path, metadata=None):
+    """
+    Saves a model and its metadata sidecar.
+
+    Both files are written under a temporary name and then renamed, the sidecar
+    first, so a process watching the model file never sees a partial artifact
+    or a model without its metadata.
+
+    Args:
+        model (CatBoostClassifier): The trained model.
+        path (str): Destination path; `.cbm` saves the native format, `.pkl` a pickle.
+        metadata (dict, optional): Extra metadata stored in the sidecar, e.g. the
+                                   training watermark.
+
+    Returns:
+        dict: The metadata written to the sidecar.
+    """
+    import catboost
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    created_at = datetime.now(timezone.utc)
+    cat_indices = set(model.get_cat_feature_indices())
+    full_metadata = {
+        "version": f"{os.path.splitext(os.path.basename(path))[0]}-{created_at:%Y%m%dT%H%M%S}",
+        "created_at": created_at.isoformat(),
+        "format": "cbm" if path.endswith(NATIVE_SUFFIX) else "pkl",
+        "catboost_version": catboost.__version__,
+        "feature_names": list(model.feature_names_),
+        "cat_features": [
+            name for i, name in enumerate(model.feature_names_) if i in cat_indices
+        ],
+        "tree_count": model.tree_count_,
+    }
+    full_metadata.update(metadata or {})
+
+    sidecar = metadata_path(path)
+    with open(f"{sidecar}.tmp", "w") as f:
+        json.dump(full_metadata, f, indent=2)
+    os.replace(f"{sidecar}.tmp", sidecar)
+
+    if full_metadata["format"] == "cbm":
+        model.save_model(f"{path}.tmp", format="cbm")
+    else:
+        import joblib
+
+        joblib.dump(model, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+    logger.info(f"Saved model {full_metadata['version']} to {path}")
+    return full_metadata
+
+
+def load_model_artifact(path):
+    """
+    Loads a model from a native `.cbm` or legacy `.pkl` artifact.
+
+    Args:
+        path (str): Path of the model artifact; see `resolve_artifact_path`.
+
+    Returns:
+        CatBoostClassifier: The loaded model.
+
+    Raises:
+        FileNotFoundError: If the artifact does not exist.
+    """
+    resolved = resolve_artifact_path(path)
+    if not os.path.exists(resolved):
+        raise FileNotFoundError(f"Model file not found at {path}")
+
+    if resolved.endswith(NATIVE_SUFFIX):
+        from catboost import CatBoostClassifier
+
+        model = CatBoostClassifier()
+        model.load_model(resolved, format="cbm")
+        return model
+
+    import joblib
+
+    if resolved != path:
+        logger.warning(f"Loading legacy model {resolved} instead of {path}")
+    return joblib.load(resolved)
+
+
+def load_metadata(path):
+    """
+    Loads the metadata sidecar of an artifact.
+
+    Args:
+        path (str): Path of the model artifact.
+
+    Returns:
+        dict or None: The metadata, or None if the artifact has no sidecar or the
+        sidecar belongs to an artifact of another format with the same name.
+    """
+    resolved = resolve_artifact_path(path)
+    sidecar = metadata_path(resolved)
+    if not os.path.exists(sidecar):
+        return None
+    with open(sidecar, "r") as f:
+        metadata = json.load(f)
+    if metadata.get("format") != os.path.splitext(resolved)[1].lstrip("."):
+        return None
+    return metadata
@@ -0,0 +1,345 @@
+"""
+This module provides streaming offline scoring for large inputs. Rows are read,
+scored through the ModelService and written chunk by chunk, so memory stays
+bounded regardless of the input size. After every chunk a checkpoint is written,
+so an interrupted job can resume from the last completed chunk.
+
+Classes:
+    - CsvPredictionWriter: Appends predictions to a CSV file.
+    - ParquetPredictionWriter: Writes one Parquet file per chunk into a directory.
+    - SqlPredictionWriter: Appends predictions to a database table.
+
+Functions:
+    - open_writer(output, output_table, state, next_chunk): Creates the writer for an output.
+    - score_stream(...): Scores a CSV file or the database table chunk by chunk.
+"""
+
+import glob
+import importlib.util
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from sqlalchemy import inspect, text
+
+from model.model_service import ModelService
+from config.config import settings, get_engine
+from model.pipeline.collection import iter_data, iter_data_from_db
+
+
+class CsvPredictionWriter:
+    """
+    Appends predictions to a CSV file.
+
+    The file size after every chunk is part of the checkpoint; on resume the file
+    is truncated back to it, so a chunk written just before a crash is not duplicated.
+    """
+
+    def __init__(self, path, state=None):
+        """
+        Opens the CSV file for appending.
+
+        Args:
+            path (str): Path of the CSV file.
+            state (dict, optional): Writer state from the checkpoint when resuming.
+
+        Raises:
+            ValueError: If the file is missing or shorter than the checkpoint when resuming.
+        """
+        if state is not None:
+            size = os.path.getsize(path) if os.path.exists(path) else None
+            if size is None or size < state["output_bytes"]:
+                found = "is missing" if size is None else f"has only {size} bytes"
+                raise ValueError(
+                    f"Cannot resume into {path}: the checkpoint expects "
+                    f"{state['output_bytes']} bytes but the file {found}; "
+                    "start a fresh run instead"
+                )
+            with open(path, "r+b") as f:
+                f.truncate(state["output_bytes"])
+            self.file = open(path, "a", newline="")
+            self.header = state["output_bytes"] == 0
+        else:
+            self.file = open(path, "w", newline="")
+            self.header = True
+
+    def write(self, chunk_index, df):
+        """
+        Appends the predictions of one chunk.
+        """
+        df.to_csv(self.file, header=self.header, index=False)
+        self.file.flush()
+        self.header = False
+
+    def state(self):
+        """
+        Returns the writer state stored in the checkpoint.
+        """
+        return {"output_bytes": self.file.tell()}
+
+    def close(self):
+        """
+        Closes the CSV file.
+        """
+        self.file.close()
+
+
+class ParquetPredictionWriter:
+    """
+    Writes the predictions of every chunk to its own Parquet file in a directory.
+
+    Each file is written under a temporary name and renamed once complete, so a
+    directory only ever contains whole chunks. A fresh run removes the parts of
+    previous runs. Requires pyarrow or fastparquet.
+    """
+
+    def __init__(self, path, state=None):
+        """
+        Creates the output directory, or empties it on a fresh run.
+
+        Args:
+            path (str): Path of the output directory.
+            state (dict, optional): Writer state from the checkpoint when resuming.
+
+        Raises:
+            ImportError: If neither pyarrow nor fastparquet is installed.
+        """
+        if not any(importlib.util.find_spec(name) for name in ("pyarrow", "fastparquet")):
+            raise ImportError(
+                "Parquet output requires pyarrow or fastparquet, install one of them "
+                "(e.g. pip install pyarrow) or write to a .csv file"
+            )
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if state is None:
+            for part in glob.glob(os.path.join(path, "part-*.parquet*")):
+                os.remove(part)
+
+    def write(self, chunk_index, df):
+        """
+        Writes the predictions of one chunk to its own file.
+        """
+        part = os.path.join(self.path, f"part-{chunk_index:06d}.parquet")
+        df.to_parquet(f"{part}.tmp", index=False)
+        os.replace(f"{part}.tmp", part)
+
+    def state(self):
+        """
+        Returns the writer state stored in the checkpoint.
+        """
+        return {}
+
+    def close(self):
+        """
+        Nothing to release; every chunk is written on its own.
+        """
+
+
+class SqlPredictionWriter:
+    """
+    Appends predictions to a database table, tagging each row with its chunk.
+
+    A fresh run replaces the table. On resume, rows of chunks that are not part
+    of the checkpoint are deleted before scoring continues.
+    """
+
+    def __init__(self, table, state=None, next_chunk=0):
+        """
+        Prepares the output table.
+
+        Args:
+            table (str): Name of the output table.
+            state (dict, optional): Writer state from the checkpoint when resuming.
+            next_chunk (int, optional): Index of the first chunk still to be written.
+        """
+        self.table = table
+        if not inspect(get_engine()).has_table(table):
+            return
+        with get_engine().begin() as conn:
+            if state is None:
+                conn.execute(text(f'DROP TABLE "{table}"'))
+            else:
+                conn.execute(
+                    text(f'DELETE FROM "{table}" WHERE chunk >= :chunk'),
+                    {"chunk": next_chunk},
+                )
+
+    def write(self, chunk_index, df):
+        """
+        Appends the predictions of one chunk to the table.
+        """
+        df = df.assign(chunk=chunk_index)
+        df.to_sql(self.table, get_engine(), if_exists="append", index=False)
+
+    def state(self):
+        """
+        Returns the writer state stored in the checkpoint.
+        """
+        return {}
+
+    def close(self):
+        """
+        Nothing to release; every chunk is written on its own.
+        """
+
+
+def open_writer(output=None, output_table=None, state=None, next_chunk=0):
+    """
+    Creates the writer matching the requested output.
+
+    Args:
+        output (str, optional): Path of a `.csv` file or a `.parquet` directory.
+        output_table (str, optional): Name of a database table.
+        state (dict, optional): Writer state from the checkpoint when resuming.
+        next_chunk (int, optional): Index of the first chunk still to be written.
+
+    Returns:
+        The prediction writer.
+
+    Raises:
+        ValueError: If the output type is not supported, or a CSV output does not
+                    match the checkpoint.
+        ImportError: If Parquet output is requested without a Parquet engine.
+    """
+    if output_table:
+        return SqlPredictionWriter(output_table, state, next_chunk)
+    if output.endswith(".csv"):
+        return CsvPredictionWriter(output, state)
+    if output.endswith(".parquet"):
+        return ParquetPredictionWriter(output, state)
+    raise ValueError(f"Unsupported output {output}, expected a .csv or .parquet path")
+
+
+def _read_checkpoint(path):
+    """
+    Returns the checkpoint stored at `path`, or None if there is none.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_checkpoint(path, checkpoint):
+    """
+    Atomically replaces the checkpoint stored at `path`.
+    """
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def score_stream(
+    input_path=None,
+    output=None,
+    output_table=None,
+    chunk_size=settings.scoring_chunk_size,
+    resume=False,
+    model_service=None,
+    n_workers=None,
+):
+    """
+    Scores a CSV file or the `TaxFix` table chunk by chunk.
+
+    Every output row holds the predicted label and the probability of the positive
+    class, together with the `id` of the input row when scoring the database
+    table, or its position ("row") when scoring a CSV file. Database jobs resume
+    after the `id` of the last completed row, so rows inserted or deleted in the
+    meantime do not shift the results.
+
+    Args:
+        input_path (str, optional): CSV file to score. If omitted, the database
+                                    table is scored instead.
+        output (str, optional): Path of a `.csv` file or a `.parquet` directory.
+        output_table (str, optional): Name of a database table to write to.
+        chunk_size (int, optional): Number of rows scored at once.
+                                    Defaults to `settings.scoring_chunk_size`.
+        resume (bool, optional): Continue after the last completed chunk of a
+                                 previous run with the same input and output.
+        model_service (ModelService, optional): The service used for scoring.
+        n_workers (int, optional): Number of processes each chunk is sharded across.
+                                   Defaults to `settings.scoring_workers`.
+
+    Returns:
+        int: Total number of rows scored, including those of previous runs.
+
+    Raises:
+        ValueError: If the checkpoint belongs to a different input, or the output
+                    does not match it.
+    """
+    source = input_path or f"db:{settings.table_name}"
+    checkpoint_path = f"{output or output_table}.checkpoint.json"
+    checkpoint = _read_checkpoint(checkpoint_path) if resume else None
+    if checkpoint is not None and checkpoint["source"] != source:
+        raise ValueError(
+            f"Checkpoint {checkpoint_path} belongs to {checkpoint['source']}, not {source}"
+        )
+
+    next_chunk = checkpoint["chunks"] if checkpoint else 0
+    total_rows = checkpoint["rows"] if checkpoint else 0
+    if checkpoint:
+        logger.info(f"Resuming {source} after chunk {next_chunk - 1} ({total_rows} rows)")
+
+    ml_svc = model_service or ModelService()
+    if ml_svc.model is None:
+        ml_svc.load_model()
+    classes = np.asarray(ml_svc.model.classes_)
+
+    last_id = checkpoint.get("last_id") if checkpoint else None
+    if input_path:
+        chunks = iter_data(input_path, chunk_size, total_rows)
+    elif last_id is not None:
+        chunks = iter_data_from_db(chunk_size, after=last_id)
+    else:
+        chunks = iter_data_from_db(chunk_size, total_rows)
+
+    writer = open_writer(
+        output, output_table, checkpoint["writer"] if checkpoint else None, next_chunk
+    )
+    started, scored = time.perf_counter(), 0
+    try:
+        for chunk_index, chunk in enumerate(chunks, start=next_chunk):
+            # Reading a CSV file past its end yields one empty chunk.
+            if chunk.empty:
+                break
+            proba = ml_svc.predict_proba_parallel(chunk, n_workers)
+            if input_path:
+                key = {"row": np.arange(total_rows, total_rows + len(chunk))}
+            else:
+                key = {"id": chunk["id"].to_numpy()}
+                last_id = int(key["id"][-1])
+            predictions = pd.DataFrame(
+                {
+                    **key,
+                    "prediction": classes[np.argmax(proba, axis=1)],
+                    "probability": proba[:, 1],
+                }
+            )
+            writer.write(chunk_index, predictions)
+
+            total_rows += len(chunk)
+            scored += len(chunk)
+            _write_checkpoint(
+                checkpoint_path,
+                {
+                    "source": source,
+                    "chunks": chunk_index + 1,
+                    "rows": total_rows,
+                    "last_id": last_id,
+                    "writer": writer.state(),
+                },
+            )
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Scored chunk {chunk_index}: {total_rows} rows in total, "
+                f"{scored / elapsed:.0f} rows/sec"
+            )
+    finally:
+        writer.close()
+        ml_svc.close()
+
+    logger.info(f"Finished scoring {source}: {total_rows} rows")
+    return total_rows
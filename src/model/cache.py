@@ -0,0 +1,110 @@
+"""
+This module provides an in-process cache for prediction results, so repeated
+scoring of the same user profile does not run the model pipeline again.
+
+Classes:
+    - PredictionCache: Thread-safe LRU cache with a time-to-live per entry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    A thread-safe LRU cache whose entries expire after a fixed time-to-live.
+
+    Keys are expected to contain the model version, so results from an old model
+    are never served; `clear` can additionally be called when the model changes
+    to release their memory right away.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept in the cache.
+        ttl (float): Seconds an entry stays valid (0 disables expiry).
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not found or expired.
+        evictions (int): Number of entries dropped to respect `max_size`.
+        expirations (int): Number of entries dropped because they expired.
+    """
+
+    def __init__(self, max_size, ttl):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int): Maximum number of entries.
+            ttl (float): Time-to-live of an entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Looks up a cached value and marks it as recently used.
+
+        Args:
+            key (hashable): The cache key.
+
+        Returns:
+            The cached value, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if self.ttl and expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (hashable): The cache key.
+            value: The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops all entries, e.g. after the model was replaced.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Current size and hit, miss, eviction and expiration counts.
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
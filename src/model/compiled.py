@@ -0,0 +1,584 @@
+"""
+This module compiles a trained CatBoost model into flat NumPy lookup tables and
+scores inputs with them, without building a CatBoost `Pool` or calling into
+CatBoost.
+
+CatBoost evaluates oblivious trees: every tree applies the same splits to all
+rows and the bits of its splits index its leaf. Float splits are plain threshold
+comparisons. Splits on categorical features (one-hot values and CTRs, including
+CTRs combined with binarized float features) depend on hashed category values and
+learned counters; instead of reimplementing those, the compiler asks CatBoost for
+the outcome of every such split for every combination of known category values
+and every setting of the float bits combined into it, and stores the outcomes in
+a table. Scoring is then a handful of vectorized comparisons and gathers.
+
+Inputs with a category value that was not known at compile time are scored by
+the native model, so the compiled scorer never returns a wrong prediction for
+them. The compiled scorer saves CatBoost's per-call overhead, which dominates
+single-row latency, while CatBoost's own evaluator is faster on large batches;
+inputs with more than `settings.compiled_scorer_max_rows` rows are therefore
+scored by the native model as well. Only binary classifiers with symmetric trees
+are supported.
+
+Classes:
+    - CompiledModel: Scores inputs with the compiled lookup tables.
+
+Functions:
+    - compile_model(model, categories, max_combinations): Compiles a CatBoost model.
+    - compiled_path(model_path): Returns the path of the compiled model next to an artifact.
+    - save_compiled_model(compiled, path): Stores a compiled model.
+    - load_compiled_model(path, model): Loads a compiled model for a native model.
+    - load_scoring_model(model_path): Loads the compiled model if available, else the native one.
+    - compile_artifact(model_path, data_path, save): Compiles, checks and stores the model of an artifact.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+
+import numpy as np
+from loguru import logger
+
+from src.config.config import settings
+from src.model.artifact import load_model_artifact, resolve_artifact_path
+
+COMPILED_SUFFIX = ".compiled.npz"
+CHUNK_ROWS = 1024
+
+
+class CompiledModel:
+    """
+    Scores inputs with the lookup tables compiled from a CatBoost model.
+
+    The object can be used in place of the native model wherever only
+    `predict_proba`, `predict`, `feature_names_` and `classes_` are needed.
+
+    Attributes:
+        model (CatBoostClassifier): The native model, used for unknown categories.
+        feature_names_ (list): The ordered feature names expected by the model.
+        classes_ (np.ndarray): The class labels.
+        tree_count_ (int): Number of trees.
+        categories (dict): Categorical feature name to the known category values.
+        max_rows (int): Largest input scored with the compiled tables.
+        fallback_rows (int): Number of rows with unknown categories scored by the
+                             native model so far.
+    """
+
+    def __init__(self, model, tables, max_rows=None):
+        """
+        Initializes the scorer from compiled tables.
+
+        Args:
+            model (CatBoostClassifier): The native model.
+            tables (dict): The arrays and metadata produced by `compile_model`.
+            max_rows (int, optional): Largest input scored with the compiled tables.
+                                      Defaults to `settings.compiled_scorer_max_rows`.
+        """
+        self.model = model
+        self.feature_names_ = list(model.feature_names_)
+        self.classes_ = np.asarray(model.classes_)
+        self.tree_count_ = model.tree_count_
+        self.categories = tables["categories"]
+        self.max_rows = settings.compiled_scorer_max_rows if max_rows is None else max_rows
+        self.fallback_rows = 0
+        self.tables = tables
+
+        self._cat_columns = [self.feature_names_.index(name) for name in self.categories]
+        self._codes = [
+            {value: code for code, value in enumerate(values)}
+            for values in self.categories.values()
+        ]
+        self._lookups = {}
+        self._strides = tables["strides"]
+        self._float_columns = tables["float_columns"]
+        self._float_names = [self.feature_names_[c] for c in self._float_columns]
+        self._conditions = tables["condition_features"]
+        self._borders = tables["condition_borders"][:, None]
+        self._ctr_elements = tables["cat_split_elements"].T.copy()
+        self._ctr_shifts = np.arange(len(self._ctr_elements), dtype=np.uint8)[:, None, None]
+        self._tree_bits = tables["tree_bits"].T.copy()
+        self._depth_shifts = np.arange(len(self._tree_bits), dtype=np.uint8)[:, None, None]
+        self._scale, self._bias = tables["scale"], tables["bias"]
+
+        # Flat tables and offsets, so every lookup is a single `np.take`.
+        ctr_tables = tables["cat_split_tables"]
+        leaf_values = tables["leaf_values"]
+        self._index_dtype = np.int32 if max(ctr_tables.size, leaf_values.size) < 2**31 else np.int64
+        self._ctr_table = ctr_tables.ravel()
+        self._ctr_offsets = (np.arange(len(ctr_tables), dtype=self._index_dtype) * ctr_tables[0].size)[:, None]
+        self._ctr_stride = ctr_tables.shape[2]
+        self._leaf_table = leaf_values.ravel()
+        self._leaf_offsets = (np.arange(len(leaf_values), dtype=self._index_dtype) * leaf_values.shape[1])[:, None]
+
+    def _category_lookup(self, j, categories):
+        """
+        Returns the array mapping the codes of a pandas categorical column to the
+        codes of the j-th categorical feature, with -1 for unknown and missing
+        values (code -1 indexes the last element).
+        """
+        key = (j, tuple(categories))
+        lookup = self._lookups.get(key)
+        if lookup is None:
+            lookup = np.array([self._codes[j].get(str(value), -1) for value in categories] + [-1])
+            self._lookups[key] = lookup
+        return lookup
+
+    def _encode(self, X):
+        """
+        Returns the category combination index (-1 if a value is unknown) and the
+        float feature matrix of the inputs.
+        """
+        if hasattr(X, "columns"):
+            combination = np.zeros(len(X), dtype=np.int64)
+            unknown = np.zeros(len(X), dtype=bool)
+            for j, (name, stride) in enumerate(zip(self.categories, self._strides)):
+                column = X[name].array
+                if hasattr(column, "categories"):
+                    codes = self._category_lookup(j, column.categories)[column.codes]
+                else:
+                    codes = np.fromiter(
+                        (self._codes[j].get(str(value), -1) for value in column),
+                        dtype=np.int64,
+                        count=len(column),
+                    )
+                combination += codes * stride
+                unknown |= codes < 0
+            combination[unknown] = -1
+            floats = np.empty((len(X), len(self._float_columns)), dtype=np.float32)
+            for j, name in enumerate(self._float_names):
+                floats[:, j] = X[name].to_numpy()
+            return combination, floats
+
+        combination = np.empty(len(X), dtype=np.int64)
+        for i, row in enumerate(X):
+            index = 0
+            for column, codes, stride in zip(self._cat_columns, self._codes, self._strides):
+                code = codes.get(str(row[column]))
+                if code is None:
+                    index = -1
+                    break
+                index += code * stride
+            combination[i] = index
+        floats = np.asarray([[row[c] for c in self._float_columns] for row in X], dtype=np.float32)
+        return combination, floats.reshape(len(X), len(self._float_columns))
+
+    def _raw_predictions(self, combination, floats):
+        """
+        Evaluates the trees for encoded inputs with known categories.
+
+        Bits are laid out one row per condition or split and one column per input,
+        so selecting the bits of many splits copies contiguous rows. Large inputs
+        are evaluated in chunks that fit in the CPU caches.
+        """
+        if len(floats) > CHUNK_ROWS:
+            return np.concatenate(
+                [
+                    self._raw_predictions(combination[i : i + CHUNK_ROWS], floats[i : i + CHUNK_ROWS])
+                    for i in range(0, len(floats), CHUNK_ROWS)
+                ]
+            )
+
+        conditions = len(self._borders)
+        bits = np.zeros((conditions + 1 + len(self._ctr_offsets), len(floats)), dtype=np.uint8)
+        np.greater(floats.T[self._conditions], self._borders, out=bits[:conditions])
+
+        index = combination.astype(self._index_dtype) * self._ctr_stride + self._ctr_offsets
+        index += np.bitwise_or.reduce(bits[self._ctr_elements] << self._ctr_shifts, axis=0)
+        bits[conditions + 1 :] = np.take(self._ctr_table, index)
+
+        leaves = np.bitwise_or.reduce(bits[self._tree_bits] << self._depth_shifts, axis=0)
+        leaves = leaves + self._leaf_offsets
+        return np.take(self._leaf_table, leaves).sum(axis=0) * self._scale + self._bias
+
+    def predict_proba(self, X, thread_count=None):
+        """
+        Returns the class probabilities of prepared inputs.
+
+        Args:
+            X (list or pd.DataFrame): Feature vectors in `feature_names_` order, as
+                                      built by `build_feature_vector`, or a prepared
+                                      DataFrame with these columns.
+            thread_count (int, optional): Threads of the native model, used for
+                                          large inputs and unknown categories.
+
+        Returns:
+            np.ndarray: Probability of each class, one row per input.
+        """
+        if len(X) > self.max_rows:
+            return self.model.predict_proba(X, thread_count=thread_count or -1)
+
+        combination, floats = self._encode(X)
+        known = combination >= 0
+        positive = np.empty(len(combination), dtype=np.float64)
+        if known.all():
+            positive[:] = self._raw_predictions(combination, floats)
+        else:
+            positive[known] = self._raw_predictions(combination[known], floats[known])
+            unknown = np.flatnonzero(~known)
+            self.fallback_rows += len(unknown)
+            rows = X.iloc[unknown] if hasattr(X, "columns") else [X[i] for i in unknown]
+            raw = self.model.predict(
+                rows, prediction_type="RawFormulaVal", thread_count=thread_count or -1
+            )
+            positive[~known] = raw
+        positive = 1 / (1 + np.exp(-positive))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X, thread_count=None):
+        """
+        Returns the predicted class labels of prepared inputs.
+
+        Args:
+            X (list or pd.DataFrame): Prepared inputs, see `predict_proba`.
+            thread_count (int, optional): Threads of the native model.
+
+        Returns:
+            np.ndarray: The predicted label of every input.
+        """
+        return self.classes_[np.argmax(self.predict_proba(X, thread_count), axis=1)]
+
+    def check_parity(self, X, tolerance=None):
+        """
+        Compares the compiled predictions of all inputs with the native model's.
+
+        Args:
+            X (list or pd.DataFrame): Prepared inputs.
+            tolerance (float, optional): Largest accepted absolute difference of a
+                                         probability. Defaults to
+                                         `settings.compiled_scorer_tolerance`.
+
+        Returns:
+            float: The largest absolute difference.
+
+        Raises:
+            ValueError: If the difference exceeds the tolerance.
+        """
+        tolerance = settings.compiled_scorer_tolerance if tolerance is None else tolerance
+        max_rows, self.max_rows = self.max_rows, len(X)
+        try:
+            compiled = self.predict_proba(X)
+        finally:
+            self.max_rows = max_rows
+        difference = float(np.max(np.abs(compiled - self.model.predict_proba(X))))
+        if difference > tolerance:
+            raise ValueError(
+                f"Compiled model differs from the native model by {difference:.3g} "
+                f"(tolerance {tolerance:.3g})"
+            )
+        return difference
+
+
+def _model_json(model):
+    """
+    Returns the model exported in CatBoost's JSON format.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.json")
+        model.save_model(path, format="json")
+        with open(path, "r") as f:
+            return json.load(f)
+
+
+def _binary_features(info):
+    """
+    Lists the binary features of a model in `split_index` order: the borders of
+    every float feature, then the one-hot values, then the borders of every CTR.
+    """
+    features = []
+    for feature in info["float_features"]:
+        features += [("float", feature["feature_index"], border) for border in feature["borders"]]
+    for feature in info["categorical_features"]:
+        features += [("one_hot", feature["feature_index"], value) for value in feature.get("values", [])]
+    for index, ctr in enumerate(info.get("ctrs", [])):
+        features += [("ctr", index, border) for border in ctr["borders"]]
+    return features
+
+
+def _float_values(elements, assignment, float_columns):
+    """
+    Returns feature values that give the float elements of a split the bits of
+    `assignment`, or None if no values can.
+    """
+    bounds = {}
+    for j, (feature, border) in enumerate(elements):
+        low, high = bounds.get(feature, (-np.inf, np.inf))
+        if assignment >> j & 1:
+            low = max(low, border)
+        else:
+            high = min(high, border)
+        bounds[feature] = (low, high)
+
+    values = {}
+    for feature, (low, high) in bounds.items():
+        if low >= high:
+            return None
+        values[float_columns[feature]] = high if np.isfinite(high) else low + 1.0
+    return values
+
+
+def compile_model(model, categories, max_combinations=100000):
+    """
+    Compiles a CatBoost model into lookup tables.
+
+    Args:
+        model (CatBoostClassifier): A trained binary classifier with symmetric trees.
+        categories (dict): Categorical feature name to the category values to
+                           support, as strings like `build_feature_vector` produces.
+        max_combinations (int, optional): Largest supported number of category
+                                          combinations.
+
+    Returns:
+        CompiledModel: The compiled scorer.
+
+    Raises:
+        ValueError: If the model is not supported or has too many category combinations.
+    """
+    from catboost import Pool
+
+    description = _model_json(model)
+    if len(model.classes_) != 2 or "oblivious_trees" not in description:
+        raise ValueError("Only binary classifiers with symmetric trees can be compiled")
+
+    info = description["features_info"]
+    feature_names = list(model.feature_names_)
+    cat_features = sorted(info.get("categorical_features", []), key=lambda f: f["feature_index"])
+    cat_names = [feature["feature_id"] for feature in cat_features]
+    missing = set(cat_names) - set(categories)
+    if missing:
+        raise ValueError(f"No category values given for {sorted(missing)}")
+    categories = {name: sorted({str(value) for value in categories[name]}) for name in cat_names}
+    sizes = [len(values) for values in categories.values()]
+    n_combinations = int(np.prod(sizes)) if sizes else 1
+    if n_combinations > max_combinations:
+        raise ValueError(f"{n_combinations} category combinations exceed {max_combinations}")
+    strides = np.cumprod([1] + sizes[:-1]).astype(np.int64)
+    grid = list(itertools.product(*categories.values()))
+    grid_order = np.array(
+        [sum(values.index(v) * s for values, v, s in zip(categories.values(), combo, strides))
+         for combo in grid],
+        dtype=np.int64,
+    )
+
+    float_features = sorted(info["float_features"], key=lambda f: f["feature_index"])
+    float_columns = [feature["flat_feature_index"] for feature in float_features]
+    ctr_elements = [
+        [
+            (element["float_feature_index"], element["border"])
+            for element in ctr["elements"]
+            if element["combination_element"] == "float_feature"
+        ]
+        for ctr in info.get("ctrs", [])
+    ]
+    binary = _binary_features(info)
+
+    conditions = {}
+    cat_splits = []
+    tree_sources = []
+    for tree in description["oblivious_trees"]:
+        sources = []
+        for split in tree["splits"] or []:
+            kind, feature, border = binary[split["split_index"]]
+            if kind == "float":
+                sources.append(("condition", conditions.setdefault((feature, border), len(conditions))))
+            else:
+                elements = ctr_elements[feature] if kind == "ctr" else []
+                for element in elements:
+                    conditions.setdefault(element, len(conditions))
+                sources.append(("cat", len(cat_splits)))
+                cat_splits.append((len(tree_sources), len(sources) - 1, elements))
+        tree_sources.append(sources)
+
+    max_elements = max([len(elements) for _, _, elements in cat_splits] + [0])
+    padding = len(conditions)
+    cat_split_elements = np.full((len(cat_splits), max_elements), padding, dtype=np.int64)
+    cat_split_tables = np.zeros((len(cat_splits), n_combinations, 1 << max_elements), dtype=np.int64)
+
+    by_tree = {}
+    for index, (tree, depth, elements) in enumerate(cat_splits):
+        cat_split_elements[index, : len(elements)] = [conditions[e] for e in elements]
+        by_tree.setdefault(tree, []).append((index, depth, elements))
+
+    cat_columns = [feature["flat_feature_index"] for feature in cat_features]
+    for tree, splits in by_tree.items():
+        rows, targets = [], []
+        for index, depth, elements in splits:
+            for assignment in range(1 << len(elements)):
+                values = _float_values(elements, assignment, float_columns)
+                if values is None:
+                    continue
+                for combo, order in zip(grid, grid_order):
+                    row = [0.0] * len(feature_names)
+                    for column, value in zip(cat_columns, combo):
+                        row[column] = value
+                    for column, value in values.items():
+                        row[column] = value
+                    rows.append(row)
+                    targets.append((index, order, assignment, depth))
+
+        leaves = model.calc_leaf_indexes(
+            Pool(rows, cat_features=cat_columns, feature_names=feature_names),
+            ntree_start=tree,
+            ntree_end=tree + 1,
+        )[:, 0]
+        for (index, order, assignment, depth), leaf in zip(targets, leaves):
+            cat_split_tables[index, order, assignment] = (leaf >> depth) & 1
+
+    max_depth = max([len(sources) for sources in tree_sources] + [1])
+    tree_bits = np.full((len(tree_sources), max_depth), padding, dtype=np.int64)
+    leaf_values = np.zeros((len(tree_sources), 1 << max_depth), dtype=np.float64)
+    for t, (tree, sources) in enumerate(zip(description["oblivious_trees"], tree_sources)):
+        for depth, (kind, index) in enumerate(sources):
+            tree_bits[t, depth] = index if kind == "condition" else padding + 1 + index
+        leaf_values[t, : len(tree["leaf_values"])] = tree["leaf_values"]
+
+    scale, bias = description.get("scale_and_bias", [1.0, [0.0]])
+    ordered_conditions = sorted(conditions, key=conditions.get)
+    tables = {
+        "categories": categories,
+        "strides": strides,
+        "float_columns": np.asarray(float_columns, dtype=np.int64),
+        "condition_features": np.asarray([f for f, _ in ordered_conditions], dtype=np.int64),
+        "condition_borders": np.asarray([b for _, b in ordered_conditions], dtype=np.float32),
+        "cat_split_elements": cat_split_elements,
+        "cat_split_tables": cat_split_tables.astype(np.uint8),
+        "tree_bits": tree_bits,
+        "leaf_values": leaf_values,
+        "scale": float(scale),
+        "bias": float(bias[0] if isinstance(bias, list) else bias),
+    }
+    logger.info(
+        f"Compiled {len(tree_sources)} trees with {len(conditions)} float conditions and "
+        f"{len(cat_splits)} categorical splits over {n_combinations} category combinations"
+    )
+    return CompiledModel(model, tables)
+
+
+def compiled_path(model_path):
+    """
+    Returns the path of the compiled model stored next to a model artifact.
+
+    Args:
+        model_path (str): Path of the model artifact.
+
+    Returns:
+        str: `<model_path without suffix>.compiled.npz`.
+    """
+    return os.path.splitext(model_path)[0] + COMPILED_SUFFIX
+
+
+def _artifact_fingerprint(model_path):
+    """
+    Hashes the model artifact a compiled model was built from.
+    """
+    with open(resolve_artifact_path(model_path), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def save_compiled_model(compiled, path, model_path=None):
+    """
+    Stores a compiled model.
+
+    Args:
+        compiled (CompiledModel): The compiled model.
+        path (str): Output `.npz` file.
+        model_path (str, optional): The artifact the model was loaded from; its
+                                    fingerprint is stored so a stale compiled
+                                    model is never used for a new artifact.
+    """
+    tables = dict(compiled.tables)
+    metadata = {
+        "categories": tables.pop("categories"),
+        "scale": tables.pop("scale"),
+        "bias": tables.pop("bias"),
+        "artifact": _artifact_fingerprint(model_path) if model_path else None,
+    }
+    tmp = f"{path}.tmp.npz"
+    np.savez(tmp, metadata=np.asarray(json.dumps(metadata)), **tables)
+    os.replace(tmp, path)
+    logger.info(f"Saved compiled model to {path}")
+
+
+def load_compiled_model(path, model, model_path=None):
+    """
+    Loads a compiled model for a native model.
+
+    Args:
+        path (str): The `.npz` file written by `save_compiled_model`.
+        model (CatBoostClassifier): The native model it was compiled from.
+        model_path (str, optional): The artifact `model` was loaded from.
+
+    Returns:
+        CompiledModel or None: The compiled model, or None if it was compiled
+        from a different artifact.
+    """
+    with np.load(path) as data:
+        tables = {name: data[name] for name in data.files if name != "metadata"}
+        metadata = json.loads(str(data["metadata"]))
+    if model_path and metadata["artifact"] != _artifact_fingerprint(model_path):
+        logger.warning(f"Compiled model {path} was built from another artifact, ignoring it")
+        return None
+    tables.update(
+        categories=metadata["categories"], scale=metadata["scale"], bias=metadata["bias"]
+    )
+    return CompiledModel(model, tables)
+
+
+def load_scoring_model(model_path=settings.model_path):
+    """
+    Loads a model artifact and, if `settings.compiled_scorer_enabled` is set and a
+    compiled model for it exists, returns the compiled model instead.
+
+    Args:
+        model_path (str, optional): Path of the model artifact.
+                                    Defaults to `settings.model_path`.
+
+    Returns:
+        CompiledModel or CatBoostClassifier: The model to score with.
+    """
+    model = load_model_artifact(model_path)
+    path = compiled_path(model_path)
+    if not settings.compiled_scorer_enabled:
+        return model
+    if not os.path.exists(path):
+        logger.warning(f"No compiled model at {path}, scoring with the native model")
+        return model
+    return load_compiled_model(path, model, model_path) or model
+
+
+def compile_artifact(model_path=settings.model_path, data_path=settings.data_path, save=True):
+    """
+    Compiles the model of an artifact for the category values seen in the
+    training data, checks it against the native model on that data and stores it
+    next to the artifact.
+
+    Args:
+        model_path (str, optional): Path of the model artifact.
+                                    Defaults to `settings.model_path`.
+        data_path (str, optional): The training CSV file. Defaults to `settings.data_path`.
+        save (bool, optional): Whether to store the compiled model.
+
+    Returns:
+        CompiledModel: The compiled model.
+
+    Raises:
+        ValueError: If the compiled predictions differ from the native ones by more
+                    than `settings.compiled_scorer_tolerance`.
+    """
+    from src.model.pipeline.dataset_cache import load_prepared_dataset
+
+    model = load_model_artifact(model_path)
+    X, _ = load_prepared_dataset(data_path)
+    X = X[model.feature_names_]
+    categories = {
+        name: X[name].astype(str).unique().tolist()
+        for name in settings.categorical_features
+        if name in X.columns
+    }
+    compiled = compile_model(model, categories)
+    difference = compiled.check_parity(X)
+    logger.info(f"Compiled model matches the native model within {difference:.3g} on {len(X)} rows")
+    if save:
+        save_compiled_model(compiled, compiled_path(model_path), model_path)
+    return compiled
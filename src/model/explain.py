@@ -0,0 +1,102 @@
+"""
+This module explains predictions with per-feature contributions computed by
+CatBoost's tree SHAP (`ShapValues`). Contributions are in log-odds: the expected
+value of the model plus the contributions of all features of an input add up to
+its raw prediction, whose sigmoid is the predicted probability of completing the
+filing.
+
+Explanations always use the native CatBoost model, also when predictions are
+served by the compiled scorer.
+
+Functions:
+    - native_model(model): Returns the CatBoost model behind a scoring model.
+    - shap_values(model, X, thread_count): Computes the SHAP contributions of prepared inputs.
+    - format_explanation(feature_names, features, values, top_k): Builds the explanation of one input.
+"""
+
+import math
+
+import numpy as np
+
+from src.config.config import settings
+from src.model.compiled import CompiledModel
+
+
+def native_model(model):
+    """
+    Returns the CatBoost model behind a scoring model.
+
+    Args:
+        model (CatBoostClassifier or CompiledModel): The scoring model.
+
+    Returns:
+        CatBoostClassifier: The native model.
+    """
+    return model.model if isinstance(model, CompiledModel) else model
+
+
+def shap_values(model, X, thread_count=None):
+    """
+    Computes the SHAP contributions of prepared inputs.
+
+    Args:
+        model (CatBoostClassifier or CompiledModel): The scoring model.
+        X (list or pd.DataFrame): Feature vectors in `feature_names_` order, as
+                                  built by `build_feature_vector`, or a prepared
+                                  DataFrame with these columns.
+        thread_count (int, optional): CatBoost threads.
+                                      Defaults to `settings.model_thread_count`.
+
+    Returns:
+        np.ndarray: One row per input with the contribution of every feature,
+        followed by the expected value of the model.
+    """
+    from catboost import Pool
+
+    model = native_model(model)
+    pool = Pool(
+        X,
+        cat_features=model.get_cat_feature_indices(),
+        feature_names=list(model.feature_names_),
+    )
+    return model.get_feature_importance(
+        pool,
+        type="ShapValues",
+        shap_mode=settings.explain_shap_mode,
+        shap_calc_type=settings.explain_shap_calc_type,
+        thread_count=thread_count or settings.model_thread_count,
+    )
+
+
+def format_explanation(feature_names, features, values, top_k=None):
+    """
+    Builds the explanation of one input.
+
+    Args:
+        feature_names (list): The ordered feature names of the model.
+        features (list): The prepared feature values of the input.
+        values (np.ndarray): Its row of `shap_values`.
+        top_k (int, optional): Only return the `top_k` features with the largest
+                               absolute contribution. Defaults to all features.
+
+    Returns:
+        dict: The expected value, raw prediction and probability, and the
+        contributions ordered by decreasing absolute value, each with the feature
+        name and its prepared value.
+    """
+    contributions, expected = values[:-1], float(values[-1])
+    raw = expected + float(contributions.sum())
+    order = np.argsort(-np.abs(contributions), kind="stable")[:top_k]
+    return {
+        "expected_value": expected,
+        "raw_prediction": raw,
+        "probability": 1 / (1 + math.exp(-raw)),
+        "contributions": [
+            {
+                "feature": feature_names[i],
+                "value": features[i].item() if hasattr(features[i], "item") else features[i],
+                "contribution": float(contributions[i]),
+            }
+            for i in order
+        ],
+    }
@@ -9,17 +9,27 @@ Classes:
 Functions:
     - load_model(): Loads the trained CatBoost model from a file.
     - predict(X): Processes input data and returns model predictions.
+    - predict_proba(X): Processes input data and returns class probabilities.
+    - explain(X, top_k): Processes input data and returns per-feature SHAP contributions.
+    - predict_proba_parallel(X, n_workers, chunk_size): Shards input data across
+      a process pool and returns class probabilities in input order.
+    - close(): Shuts down the process pool used for parallel prediction.
 """
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-import joblib
 from loguru import logger
-from pathlib import Path
 from catboost import Pool
 
-from model.pipeline.model import build_model
 from config.config import settings
-from model.pipeline.preparation import process_features
+from model.pipeline.preparation import process_features, select_features
+from src.model.artifact import load_model_artifact, resolve_artifact_path
+from src.model.compiled import CompiledModel, load_scoring_model
+from src.model.explain import format_explanation, shap_values
 
 
 class ModelService:
@@ -28,14 +38,23 @@ class ModelService:
     loading, training (if needed), and making predictions.
 
     Attributes:
-        model (CatBoostClassifier or None): The trained CatBoost model.
+        model (CatBoostClassifier, CompiledModel or None): The trained CatBoost model,
+            or its compiled scorer if `settings.compiled_scorer_enabled` is set.
+        thread_count (int): Number of threads CatBoost uses per prediction (-1 for all cores).
     """
 
-    def __init__(self):
+    def __init__(self, thread_count=-1):
         """
         Initializes the ModelService instance without loading the model initially.
+
+        Args:
+            thread_count (int, optional): Number of threads CatBoost uses per
+                                          prediction. Defaults to all cores.
         """
         self.model = None
+        self.thread_count = thread_count
+        self._pool = None
+        self._pool_workers = None
 
     def load_model(self, model_name=settings.model_filename):
         """
@@ -50,14 +69,54 @@ class ModelService:
             FileNotFoundError: If the model file is missing and cannot be built.
         """
 
-        model_path = Path(settings.model_path)
-        if not model_path.exists():
+        model_path = resolve_artifact_path(settings.model_path)
+        if not os.path.exists(model_path):
             logger.info(f"Model {model_name} not found")
+            # Training pulls in scikit-learn and the database layer, which a
+            # service loading an existing model never needs.
+            from model.pipeline.model import build_model
+
             build_model()
             logger.info(f"Model {model_name} trained and saved")
             print(f"Model {model_name} trained and saved at {model_path}")
 
-        self.model = joblib.load(settings.model_path)
+        self.model = load_scoring_model(settings.model_path)
+
+    def _prepare_frame(self, X):
+        """
+        Loads the model if needed and prepares input data in model column order.
+
+        Args:
+            X (dict or pd.DataFrame): Input features for prediction.
+
+        Returns:
+            pd.DataFrame: The prepared features.
+        """
+
+        if self.model is None:
+            self.load_model()
+
+        if isinstance(X, dict):
+            X = pd.DataFrame([X])
+
+        return select_features(process_features(X), self.model.feature_names_)
+
+    def _prepare_pool(self, X):
+        """
+        Loads the model if needed and prepares input data as a CatBoost Pool.
+
+        Args:
+            X (dict or pd.DataFrame): Input features for prediction.
+
+        Returns:
+            Pool or pd.DataFrame: The prepared features in model column order, as a
+            DataFrame for the compiled scorer, which does not need a Pool.
+        """
+
+        X = self._prepare_frame(X)
+        if isinstance(self.model, CompiledModel):
+            return X
+        return Pool(X, cat_features=settings.categorical_features)
 
     def predict(self, X):
         """
@@ -74,20 +133,122 @@ class ModelService:
             ValueError: If input data does not match expected features.
         """
 
+        X_pool = self._prepare_pool(X)
+        return self.model.predict(X_pool, thread_count=self.thread_count)
+
+    def predict_proba(self, X):
+        """
+        Processes input data and returns the predicted class probabilities.
+
+        Args:
+            X (dict or pd.DataFrame): Input features for prediction.
+                                      If a dictionary is provided, it is converted to a DataFrame.
+
+        Returns:
+            np.ndarray: Probability of each class, one row per input.
+
+        Raises:
+            ValueError: If input data does not match expected features.
+        """
+
+        X_pool = self._prepare_pool(X)
+        return self.model.predict_proba(X_pool, thread_count=self.thread_count)
+
+    def explain(self, X, top_k=None):
+        """
+        Processes input data and returns the contribution of every feature to the
+        prediction, computed with CatBoost's tree SHAP.
+
+        Args:
+            X (dict or pd.DataFrame): Input features to explain.
+                                      If a dictionary is provided, it is converted to a DataFrame.
+            top_k (int, optional): Only return the `top_k` features with the largest
+                                   absolute contribution. Defaults to all features.
+
+        Returns:
+            list[dict]: One explanation per input, see `format_explanation`.
+        """
+
+        X = self._prepare_frame(X)
+        values = shap_values(self.model, X, self.thread_count)
+        return [
+            format_explanation(self.model.feature_names_, features, row, top_k)
+            for features, row in zip(X.itertuples(index=False, name=None), values)
+        ]
+
+    def predict_proba_parallel(self, X, n_workers=None, chunk_size=None):
+        """
+        Returns the predicted class probabilities, sharding the input across processes.
+
+        Both the feature preparation and the CatBoost prediction run in the worker
+        processes, so neither is limited by the GIL. Workers are reused for later
+        calls until `close()`. With the "fork" start method they share the model
+        already loaded in this process copy-on-write; otherwise every worker loads
+        the native artifact once when it starts.
+
+        Args:
+            X (pd.DataFrame): Input features for prediction.
+            n_workers (int, optional): Number of worker processes.
+                                       Defaults to `settings.scoring_workers`.
+            chunk_size (int, optional): Number of rows sent to a worker at once.
+                                        Defaults to `settings.scoring_worker_chunk_size`.
+
+        Returns:
+            np.ndarray: Probability of each class, one row per input in input order.
+        """
+
+        n_workers = n_workers or settings.scoring_workers or os.cpu_count()
+        chunk_size = chunk_size or settings.scoring_worker_chunk_size
+        if n_workers <= 1 or len(X) <= chunk_size:
+            return self.predict_proba(X)
+
         if self.model is None:
             self.load_model()
+        if self._pool is None or self._pool_workers != n_workers:
+            self.close()
+            global _shared_model
+            _shared_model = self.model
+            self._pool = ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(settings.model_path, settings.scoring_worker_threads),
+            )
+            self._pool_workers = n_workers
+
+        chunks = (X.iloc[start : start + chunk_size] for start in range(0, len(X), chunk_size))
+        return np.vstack(list(self._pool.map(_predict_proba_chunk, chunks)))
+
+    def close(self):
+        """
+        Shuts down the process pool used by `predict_proba_parallel`, if any.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_workers = None
+
+
+_shared_model = None
+_worker_service = None
 
-        if isinstance(X, dict):
-            X = pd.DataFrame([X])
 
-        X = process_features(X)
-        expected_features = self.model.feature_names_
-        X = X[expected_features]
+def _init_worker(model_path, thread_count):
+    """
+    Sets up the model once in a worker process of `predict_proba_parallel`.
 
-        for col in settings.categorical_features:
-            if col in X.columns:
-                X[col] = X[col].astype(str)
+    Forked workers inherit `_shared_model` from the parent process; spawned
+    workers load the artifact instead.
+    """
+    global _worker_service
+    _worker_service = ModelService(thread_count=thread_count)
+    if _shared_model is not None and multiprocessing.get_start_method() == "fork":
+        _worker_service.model = _shared_model
+    else:
+        _worker_service.model = load_model_artifact(model_path)
 
-        X_pool = Pool(X, cat_features=settings.categorical_features)
 
-        return self.model.predict(X_pool)
+def _predict_proba_chunk(X):
+    """
+    Scores one chunk of `predict_proba_parallel` in a worker process.
+    """
+    return _worker_service.predict_proba(X)
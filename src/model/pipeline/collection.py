@@ -2,44 +2,286 @@
 This module provides functions to load data from a CSV file or a database
 for the TaxFix application.
 
+CSV files are read with compact dtypes derived from the `TaxFix` schema and only
+the columns the model is trained on, so pandas neither infers types nor holds
+columns that are dropped later.
+
 Functions:
-    load_data(path): Loads data from a specified CSV file path.
-    load_data_from_db(): Loads data from the database using SQLAlchemy.
+    load_data(path, columns, engine, chunk_size): Loads typed, column-projected data
+                                                  from a CSV file.
+    load_data_from_db(after, columns, chunk_size): Loads typed data from the database,
+                                                   optionally only rows added after a watermark.
+    iter_data(path, chunk_size, skip_rows): Streams a CSV file in chunks.
+    iter_data_from_db(chunk_size, skip_rows, after, columns, bind): Streams typed,
+                                                                    column-projected chunks
+                                                                    of the database table.
+
+Variables:
+    TAXFIX_DTYPES (dict): The pandas dtype of every `TaxFix` column.
+    TAXFIX_CSV_DTYPES (dict): The compact pandas dtype every `TaxFix` column is read
+                              from CSV files as.
+    TRAINING_COLUMNS (list): The columns read from CSV files by default.
 """
 
+import importlib.util
+
 import pandas as pd
 from loguru import logger
-from sqlalchemy import select
+from pandas.api.types import union_categoricals
+from sqlalchemy import INTEGER, REAL, VARCHAR, DateTime, select, type_coerce
 
 from src.db.db_model import TaxFix
-from src.config.config import settings, engine
+from src.config.config import settings, get_engine
 
 
-def load_data(path=settings.data_path):
+def load_data(path=settings.data_path, columns=None, engine=None, chunk_size=None):
     """
-    Load data from a CSV file.
+    Load typed, column-projected data from a CSV file.
+
+    Only `columns` are parsed, with the dtypes of `TAXFIX_CSV_DTYPES`. The pyarrow
+    engine parses the file with several threads; it holds the whole file in Arrow
+    memory while converting, so for files that do not fit twice in memory
+    `chunk_size` parses the file in chunks with the C engine instead and keeps
+    only the typed chunks.
 
     Args:
         path (str, optional): The file path of the CSV to load.
                               Defaults to `settings.data_path`.
+        columns (list, optional): Columns to read. Defaults to `TRAINING_COLUMNS`.
+        engine (str, optional): "pyarrow" or "c". Defaults to `settings.csv_engine`;
+                                "c" is used if pyarrow is not installed.
+        chunk_size (int, optional): Parse the file in chunks of this many rows.
+                                    Defaults to `settings.csv_chunk_size` (0 reads
+                                    the file at once).
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the loaded data.
     """
-    logger.info(f"Loading data from {path}")
-    return pd.read_csv(path)
+    columns = columns or TRAINING_COLUMNS
+    dtypes = {name: TAXFIX_CSV_DTYPES[name] for name in columns if name in TAXFIX_CSV_DTYPES}
+    chunk_size = settings.csv_chunk_size if chunk_size is None else chunk_size
+    if chunk_size:
+        logger.info(f"Loading {len(columns)} columns from {path} in chunks of {chunk_size} rows")
+        chunks = pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_size)
+        return _concat_chunks(chunks, columns)
+
+    engine = _csv_engine(engine or settings.csv_engine)
+    logger.info(f"Loading {len(columns)} columns from {path} with the {engine} engine")
+    if engine == "pyarrow":
+        return _read_csv_pyarrow(path, columns, dtypes)
+    return pd.read_csv(path, usecols=columns, dtype=dtypes, engine=engine)
+
+
+def _read_csv_pyarrow(path, columns, dtypes):
+    """
+    Reads a CSV file with pyarrow, parsing categorical columns straight into
+    dictionary-encoded arrays, so no string object is created per row.
+    """
+    import pyarrow as pa
+    from pyarrow import csv
+
+    types = {
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+    }
+    table = csv.read_csv(
+        path,
+        convert_options=csv.ConvertOptions(
+            include_columns=columns,
+            column_types={name: types[dtype] for name, dtype in dtypes.items() if dtype in types},
+        ),
+    )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _csv_engine(engine):
+    """
+    Returns the CSV engine to use, falling back to "c" if pyarrow is not installed.
+    """
+    if engine == "pyarrow" and importlib.util.find_spec("pyarrow") is None:
+        logger.warning("pyarrow is not installed, reading CSV files with the c engine")
+        return "c"
+    return engine
 
 
-def load_data_from_db():
+def _concat_chunks(chunks, columns):
+    """
+    Concatenates typed CSV chunks, keeping categorical columns categorical even
+    if the chunks saw different categories.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    merged = {}
+    for name in chunks[0].columns:
+        if isinstance(chunks[0][name].dtype, pd.CategoricalDtype):
+            merged[name] = union_categoricals([chunk[name] for chunk in chunks])
+        else:
+            merged[name] = pd.concat([chunk[name] for chunk in chunks], ignore_index=True)
+    return pd.DataFrame(merged, copy=False)
+
+
+def load_data_from_db(after=None, columns=None, chunk_size=100000):
     """
     Load data from the database using SQLAlchemy.
 
-    This function constructs a SQL query to fetch all records from the `TaxFix` table
-    and executes it using the database engine defined in `settings`.
+    The `TaxFix` table is read in chunks with `iter_data_from_db` and returned as one
+    typed DataFrame in insertion order. The `id` of every row is always included; its
+    maximum serves as the watermark for the next incremental load.
+
+    Args:
+        after (int, optional): Only load rows whose `id` is greater than this watermark.
+        columns (list, optional): Columns to load. Defaults to all columns.
+        chunk_size (int, optional): Number of rows fetched per query.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the retrieved data.
     """
-    logger.info("Loading data from database")
-    query = select(TaxFix)
-    return pd.read_sql(query, engine)
+    if after is not None:
+        logger.info(f"Loading rows after {after} from database")
+    else:
+        logger.info("Loading data from database")
+    chunks = list(iter_data_from_db(chunk_size, after=after, columns=columns))
+    if not chunks:
+        return _typed_frame([], _projection(columns))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def iter_data(path=settings.data_path, chunk_size=100000, skip_rows=0):
+    """
+    Stream a CSV file in chunks so memory stays bounded regardless of its size.
+
+    Args:
+        path (str, optional): The file path of the CSV to load.
+                              Defaults to `settings.data_path`.
+        chunk_size (int, optional): Number of rows per chunk.
+        skip_rows (int, optional): Number of data rows to skip at the start,
+                                   e.g. when resuming an interrupted job.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+    """
+    logger.info(f"Streaming data from {path} in chunks of {chunk_size} rows")
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
+    yield from pd.read_csv(path, chunksize=chunk_size, skiprows=skiprows)
+
+
+def _column_dtype(column):
+    """
+    Returns the pandas dtype a `TaxFix` column is read as.
+    """
+    if isinstance(column.type, INTEGER):
+        return "int64"
+    if isinstance(column.type, REAL):
+        return "float64"
+    if isinstance(column.type, DateTime):
+        return "datetime64[ns]"
+    return "object"
+
+
+TAXFIX_DTYPES = {column.name: _column_dtype(column) for column in TaxFix.__table__.columns}
+
+
+def _csv_dtype(column):
+    """
+    Returns the compact pandas dtype a `TaxFix` column is read from CSV files as.
+
+    Text and categorical feature columns become categoricals and integers are
+    read as 32-bit like SQL `INTEGER`. Floats stay 64-bit: the API scores the
+    float64 values of JSON requests, so narrowing them would train the model on
+    different values than it serves.
+    """
+    if column.name in settings.categorical_features or isinstance(column.type, VARCHAR):
+        return "category"
+    if isinstance(column.type, INTEGER):
+        return "int32"
+    return _column_dtype(column)
+
+
+TAXFIX_CSV_DTYPES = {
+    column.name: _csv_dtype(column)
+    for column in TaxFix.__table__.columns
+    if column.name not in ("id", "ingested_at")
+}
+TRAINING_COLUMNS = [
+    name
+    for name in settings.categorical_features + settings.numeric_features + [settings.target]
+    if name in TAXFIX_CSV_DTYPES
+]
+
+
+def _projection(columns):
+    """
+    Returns the names of the columns to read: `id` followed by the requested columns.
+    """
+    names = columns or [column.name for column in TaxFix.__table__.columns]
+    return ["id"] + [name for name in names if name != "id"]
+
+
+def _typed_frame(rows, names):
+    """
+    Builds a DataFrame from fetched rows with the dtypes of `TAXFIX_DTYPES`.
+
+    Integer columns containing NULLs are read as float64 instead of failing.
+    """
+    df = pd.DataFrame.from_records(rows, columns=names)
+    dtypes = {}
+    for name in names:
+        dtype = TAXFIX_DTYPES[name]
+        if dtype == "int64" and df[name].isna().any():
+            dtype = "float64"
+        dtypes[name] = dtype
+    return df.astype(dtypes, copy=False)
+
+
+def iter_data_from_db(chunk_size=100000, skip_rows=0, after=None, columns=None, bind=None):
+    """
+    Stream the `TaxFix` table in typed chunks.
+
+    Rows are returned in `id` order. Every chunk is fetched with its own indexed
+    range query (`id > last id of the previous chunk`), so the cost per chunk does not
+    grow with the position in the table and no cursor is held open between chunks.
+
+    Args:
+        chunk_size (int, optional): Number of rows per chunk.
+        skip_rows (int, optional): Number of rows to skip at the start, e.g. when
+                                   resuming an interrupted job.
+        after (int, optional): Only read rows whose `id` is greater than this watermark.
+        columns (list, optional): Columns to read. `id` is always included.
+        bind (sqlalchemy.Engine, optional): Engine to read from. Defaults to `get_engine()`.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows, typed following `TAXFIX_DTYPES`.
+    """
+    logger.info(f"Streaming data from database in chunks of {chunk_size} rows")
+    table = TaxFix.__table__
+    names = _projection(columns)
+    # Timestamps are fetched as text and parsed once per chunk by pandas, which is
+    # much cheaper than SQLAlchemy converting them row by row.
+    selected = [
+        type_coerce(table.c[name], VARCHAR()).label(name)
+        if TAXFIX_DTYPES[name].startswith("datetime")
+        else table.c[name]
+        for name in names
+    ]
+    query = select(*selected).order_by(table.c.id).limit(chunk_size)
+
+    with (bind or get_engine()).connect() as conn:
+        last = after
+        if skip_rows:
+            first = select(table.c.id).order_by(table.c.id).offset(skip_rows - 1).limit(1)
+            if after is not None:
+                first = first.where(table.c.id > after)
+            last = conn.execute(first).scalar()
+            if last is None:
+                return
+
+        while True:
+            page = query if last is None else query.where(table.c.id > last)
+            rows = conn.execute(page).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield _typed_frame(rows, names)
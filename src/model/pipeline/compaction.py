@@ -0,0 +1,194 @@
+"""
+This module produces smaller and faster variants of a trained model and promotes
+the fastest one whose accuracy stays within a tolerance of the original.
+
+Variants:
+    - shrink: The first trees of the model only (CatBoost `shrink`).
+    - depth: Retrained with shallower trees.
+    - features: Retrained on the most important features only.
+    - borders: Retrained with fewer quantization borders per float feature.
+
+Every variant is evaluated with `evaluate_model` on the test split and benchmarked
+for single-row latency and batch throughput on the inference split.
+
+Functions:
+    - build_variants(model, X_train, y_train): Builds the compacted variants of a model.
+    - measure_variant(model, X_test, y_test, X_inference): Evaluates and benchmarks a model.
+    - compact_model(tolerance, promote, data_path): Runs the compaction step.
+"""
+
+import statistics
+import time
+
+from loguru import logger
+
+from config.config import settings
+from model.pipeline.model import (
+    evaluate_model,
+    save_versioned_model,
+    split_train_test,
+    train_model,
+)
+from src.model.artifact import load_metadata, load_model_artifact
+from src.model.pipeline.dataset_cache import load_prepared_dataset
+
+LATENCY_REPEAT = 500
+TRAINING_PARAMS = ("iterations", "depth", "learning_rate", "l2_leaf_reg", "border_count")
+# Metadata written by `save_model_artifact` for every model, never copied from the original.
+ARTIFACT_KEYS = (
+    "version", "created_at", "format", "catboost_version", "feature_names", "cat_features", "tree_count"
+)
+
+
+def _training_params(model):
+    """
+    Returns the parameters a variant is retrained with, taken from the original model.
+
+    The number of iterations is the tree count of the model: after incremental
+    training, the `iterations` parameter only holds the trees added by the last fit.
+    """
+    params = model.get_params()
+    params = {name: params[name] for name in TRAINING_PARAMS if name in params}
+    return {**params, "iterations": model.tree_count_}
+
+
+def build_variants(model, X_train, y_train):
+    """
+    Builds the compacted variants of a model as configured in `settings`.
+
+    Args:
+        model (CatBoostClassifier): The original model.
+        X_train (pd.DataFrame): Training features, used by the retrained variants.
+        y_train (pd.Series): Training targets.
+
+    Returns:
+        dict: Variant name to model.
+    """
+    params = {**_training_params(model), "verbose": False}
+    variants = {}
+
+    for fraction in settings.compaction_shrink_fractions:
+        trees = max(1, int(model.tree_count_ * fraction))
+        variant = model.copy()
+        variant.shrink(ntree_end=trees)
+        variants[f"shrink_{trees}_trees"] = variant
+
+    for depth in settings.compaction_depths:
+        if depth < params.get("depth", 6):
+            logger.info(f"Retraining with depth {depth}")
+            variants[f"depth_{depth}"] = train_model(X_train, y_train, **{**params, "depth": depth})
+
+    importance = model.get_feature_importance(prettified=True)
+    for k in settings.compaction_top_features:
+        if k < len(model.feature_names_):
+            features = [f for f in model.feature_names_ if f in set(importance["Feature Id"][:k])]
+            logger.info(f"Retraining on the top {k} features: {features}")
+            variants[f"top_{k}_features"] = train_model(X_train[features], y_train, **params)
+
+    for borders in settings.compaction_border_counts:
+        logger.info(f"Retraining with {borders} borders per feature")
+        variants[f"borders_{borders}"] = train_model(
+            X_train, y_train, **{**params, "border_count": borders}
+        )
+    return variants
+
+
+def measure_variant(model, X_test, y_test, X_inference):
+    """
+    Evaluates a model and benchmarks its latency with `settings.model_thread_count`
+    CatBoost threads, like the API.
+
+    Args:
+        model (CatBoostClassifier): The model to measure.
+        X_test (pd.DataFrame): Test features.
+        y_test (pd.Series): Test targets.
+        X_inference (pd.DataFrame): Features used for the latency benchmark.
+
+    Returns:
+        dict: F1 score, tree count, median single-row latency and batch rows/sec.
+    """
+    features = model.feature_names_
+    threads = settings.model_thread_count
+    row = X_inference[features].iloc[:1]
+    model.predict_proba(row, thread_count=threads)
+    samples = []
+    for _ in range(LATENCY_REPEAT):
+        started = time.perf_counter()
+        model.predict_proba(row, thread_count=threads)
+        samples.append(time.perf_counter() - started)
+
+    batch = X_inference[features]
+    started = time.perf_counter()
+    model.predict_proba(batch, thread_count=threads)
+    batch_seconds = time.perf_counter() - started
+    return {
+        "f1": round(evaluate_model(model, X_test[features], y_test), 5),
+        "tree_count": model.tree_count_,
+        "features": len(features),
+        "latency_ms": round(statistics.median(samples) * 1000, 4),
+        "batch_rows_per_sec": round(len(batch) / batch_seconds),
+    }
+
+
+def compact_model(tolerance=None, promote=True, data_path=settings.data_path):
+    """
+    Builds, evaluates and benchmarks the compacted variants of the current model.
+
+    The fastest variant by single-row latency that is faster than the original and
+    whose F1 score is at most `tolerance` below the original's is promoted: it is
+    saved as the new model artifact. Its metadata is copied from the original, so
+    it keeps the drift baseline and the training watermark used by incremental
+    training, with the variant and the original version added.
+
+    Args:
+        tolerance (float, optional): Largest accepted F1 drop.
+                                     Defaults to `settings.compaction_f1_tolerance`.
+        promote (bool, optional): Whether to save the selected variant.
+        data_path (str, optional): The training CSV file. Defaults to `settings.data_path`.
+
+    Returns:
+        dict: The measurements of the original ("original") and every variant, and
+        the name of the promoted variant under "promoted" (None if none qualified).
+    """
+    tolerance = settings.compaction_f1_tolerance if tolerance is None else tolerance
+    model = load_model_artifact(settings.model_path)
+    metadata = load_metadata(settings.model_path) or {}
+
+    X, y = load_prepared_dataset(data_path)
+    X_train, X_test, X_inference, y_train, y_test, _ = split_train_test(X, y)
+
+    report = {"original": measure_variant(model, X_test, y_test, X_inference)}
+    variants = build_variants(model, X_train, y_train)
+    for name, variant in variants.items():
+        report[name] = measure_variant(variant, X_test, y_test, X_inference)
+
+    original = report["original"]
+    for name, result in report.items():
+        result["accepted"] = name != "original" and (
+            result["f1"] >= original["f1"] - tolerance
+            and result["latency_ms"] < original["latency_ms"]
+        )
+        logger.info(
+            f"{name}: F1 {result['f1']:.4f} ({result['f1'] - original['f1']:+.4f}), "
+            f"{result['latency_ms']:.3f} ms/row, {result['batch_rows_per_sec']} rows/sec, "
+            f"{result['tree_count']} trees, {result['features']} features"
+            + (" [accepted]" if result["accepted"] else "")
+        )
+
+    accepted = [name for name, result in report.items() if result["accepted"]]
+    selected = min(accepted, key=lambda name: report[name]["latency_ms"]) if accepted else None
+    if selected is None:
+        logger.info(f"No variant stays within F1 tolerance {tolerance}, keeping the original model")
+    elif promote:
+        logger.info(f"Promoting {selected}")
+        save_versioned_model(
+            variants[selected],
+            {
+                **{key: value for key, value in metadata.items() if key not in ARTIFACT_KEYS},
+                "compacted_from": metadata.get("version"),
+                "compaction_variant": selected,
+                "f1_score": report[selected]["f1"],
+            },
+        )
+    report["promoted"] = selected if promote else None
+    return report
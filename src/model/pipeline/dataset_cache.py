@@ -0,0 +1,167 @@
+"""
+This module caches prepared training datasets on disk, so repeated training and
+evaluation runs skip CSV parsing and feature engineering. A prepared dataset is
+stored as one NumPy `.npy` file per column plus a JSON manifest; categorical
+features are stored as integer codes with their categories in the manifest.
+Loading memory-maps the files, so the data is paged in by the OS instead of
+being parsed or copied.
+
+Entries are keyed by a hash of the source file and the feature specification
+version, so a changed dataset or feature definition never reuses stale data.
+
+Functions:
+    - file_fingerprint(path): Hashes the content of a file.
+    - cache_path(path, cache_dir): Returns the cache entry of a source file.
+    - write_prepared_dataset(X, y, directory): Stores a prepared dataset.
+    - read_prepared_dataset(directory): Memory-maps a prepared dataset.
+    - load_prepared_dataset(path, cache_dir): Returns the prepared dataset of a
+      CSV file, preparing and caching it on the first call.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.config.config import settings
+from src.model.pipeline.collection import load_data
+from src.model.pipeline.preparation import feature_spec_version, process_features
+
+MANIFEST = "manifest.json"
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    """
+    Hashes the content of a file.
+
+    Args:
+        path (str): Path of the file.
+        block_size (int, optional): Number of bytes read at once.
+
+    Returns:
+        str: The hex SHA-256 digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(path, cache_dir=settings.dataset_cache_dir):
+    """
+    Returns the cache entry of a source file for the current feature specification.
+
+    Args:
+        path (str): Path of the source CSV file.
+        cache_dir (str, optional): Directory holding the cache entries.
+                                   Defaults to `settings.dataset_cache_dir`.
+
+    Returns:
+        str: The directory of the cache entry, which may not exist yet.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    key = f"{stem}-{file_fingerprint(path)[:16]}-{feature_spec_version()}"
+    return os.path.join(cache_dir, key)
+
+
+def write_prepared_dataset(X, y, directory):
+    """
+    Stores a prepared dataset as one `.npy` file per column and a manifest.
+
+    The entry is written to a temporary directory and renamed once complete, so
+    a reader never sees a partial entry.
+
+    Args:
+        X (pd.DataFrame): Prepared features, e.g. from `process_features`.
+        y (pd.Series): The target, aligned with `X`.
+        directory (str): Directory of the cache entry.
+    """
+    tmp = f"{directory}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    columns = []
+    frame = X.assign(**{settings.target: np.asarray(y)})
+    for i, name in enumerate(frame.columns):
+        values = frame[name]
+        entry = {"name": name, "file": f"{i:03d}.npy"}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            entry["categories"] = values.cat.categories.tolist()
+            array = values.cat.codes.to_numpy()
+        elif values.dtype == object:
+            categorical = pd.Categorical(values)
+            entry["categories"] = categorical.categories.tolist()
+            array = categorical.codes
+        else:
+            array = values.to_numpy()
+        np.save(os.path.join(tmp, entry["file"]), np.ascontiguousarray(array))
+        columns.append(entry)
+
+    with open(os.path.join(tmp, MANIFEST), "w") as f:
+        json.dump({"rows": len(frame), "target": settings.target, "columns": columns}, f)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp, directory)
+
+
+def read_prepared_dataset(directory):
+    """
+    Memory-maps a prepared dataset.
+
+    Numeric columns are backed directly by the memory-mapped files. Categorical
+    columns are returned as pandas Categoricals over the memory-mapped codes,
+    which CatBoost reads like the string columns they were built from.
+
+    Args:
+        directory (str): Directory of the cache entry.
+
+    Returns:
+        tuple: (X, y) as a DataFrame of features and a Series of targets.
+    """
+    with open(os.path.join(directory, MANIFEST), "r") as f:
+        manifest = json.load(f)
+
+    columns = {}
+    for entry in manifest["columns"]:
+        array = np.load(os.path.join(directory, entry["file"]), mmap_mode="r")
+        if "categories" in entry:
+            array = pd.Categorical.from_codes(
+                array, pd.Index(entry["categories"], dtype=object), validate=False
+            )
+        columns[entry["name"]] = array
+
+    y = pd.Series(columns.pop(manifest["target"]), name=manifest["target"], copy=False)
+    return pd.DataFrame(columns, copy=False), y
+
+
+def load_prepared_dataset(path=settings.data_path, cache_dir=settings.dataset_cache_dir):
+    """
+    Returns the prepared dataset of a CSV file from the cache.
+
+    On a cache miss the CSV file is loaded and prepared with `process_features`,
+    then written to the cache and memory-mapped like on a hit.
+
+    Args:
+        path (str, optional): Path of the source CSV file. Defaults to `settings.data_path`.
+        cache_dir (str, optional): Directory holding the cache entries.
+                                   Defaults to `settings.dataset_cache_dir`.
+
+    Returns:
+        tuple: (X, y) as a DataFrame of model features and a Series of targets.
+    """
+    directory = cache_path(path, cache_dir)
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        logger.info(f"Loading prepared dataset from {directory}")
+        return read_prepared_dataset(directory)
+
+    logger.info(f"Preparing {path} into {directory}")
+    df = load_data(path)
+    write_prepared_dataset(
+        process_features(df, categorical_dtype="category"), df[settings.target], directory
+    )
+    return read_prepared_dataset(directory)
@@ -0,0 +1,186 @@
+"""
+This module describes the model features and prepares single inputs for the
+model in plain Python. It only depends on NumPy, so the serving path can score
+requests without importing pandas.
+
+Functions:
+    - build_feature_spec(): Builds the column specification from the settings.
+    - feature_spec_version(spec): Returns a fingerprint of the column specification.
+    - build_feature_vector(data, feature_names): Prepares a single input without pandas.
+    - build_feature_columns(rows): Prepares many inputs column by column without pandas.
+
+Variables:
+    - DERIVED_FEATURES (dict): Engineered features and how they are computed.
+    - FEATURE_SPEC (list): Column specification used by all preparation functions.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from src.config.config import settings
+
+
+DERIVED_FEATURES = {
+    "sessions_per_minute": lambda f: f["number_of_sessions"]
+    / (f["time_spent_on_platform"] + 1),
+    "fields_filled_x_sessions": lambda f: f["fields_filled_percentage"]
+    * f["number_of_sessions"],
+}
+
+
+def build_feature_spec():
+    """
+    Builds the column specification from `settings`.
+
+    Each entry describes one model feature, in model column order: its target
+    dtype, whether it is categorical, and how it is derived if it is engineered.
+    Categorical features with an entry in `settings.feature_dtypes` are first read
+    as that dtype, so e.g. `previous_year_filing` becomes "1" rather than "1.0".
+
+    Returns:
+        list[dict]: One entry per feature with the keys `name`, `dtype`,
+        `categorical`, `via` and `derive`.
+    """
+    spec = []
+    for name in settings.categorical_features:
+        spec.append(
+            {
+                "name": name,
+                "dtype": settings.categorical_dtype,
+                "categorical": True,
+                "via": settings.feature_dtypes.get(name),
+                "derive": None,
+            }
+        )
+    for name in settings.numeric_features:
+        spec.append(
+            {
+                "name": name,
+                "dtype": settings.feature_dtypes.get(name, "float64"),
+                "categorical": False,
+                "via": None,
+                "derive": DERIVED_FEATURES.get(name),
+            }
+        )
+    return spec
+
+
+FEATURE_SPEC = build_feature_spec()
+
+
+def feature_spec_version(spec=FEATURE_SPEC):
+    """
+    Returns a fingerprint of the column specification.
+
+    Models and prepared data are only compatible if they were built with the same
+    fingerprint; it changes whenever a feature is added, removed, reordered or
+    converted differently.
+
+    Args:
+        spec (list[dict], optional): The column specification. Defaults to `FEATURE_SPEC`.
+
+    Returns:
+        str: A short hex digest of the names, dtypes and categorical flags.
+    """
+    description = [
+        [column["name"], column["dtype"], column["categorical"], column["via"]]
+        for column in spec
+    ]
+    return hashlib.sha256(json.dumps(description).encode()).hexdigest()[:16]
+
+
+def _python_converter(column):
+    """
+    Returns a function converting a single value like `feature_arrays` does.
+    """
+    if column["categorical"]:
+        if column["via"] is None:
+            return str
+        via = _python_converter({"categorical": False, "dtype": column["via"]})
+        return lambda value: str(via(value))
+    kind = np.dtype(column["dtype"]).kind
+    if kind in "iu":
+        return int
+    if kind == "b":
+        return bool
+    return float
+
+
+FEATURE_CONVERTERS = {
+    column["name"]: _python_converter(column)
+    for column in FEATURE_SPEC
+    if column["derive"] is None
+}
+DERIVED_CONVERTERS = {
+    column["name"]: (column["derive"], _python_converter(column))
+    for column in FEATURE_SPEC
+    if column["derive"] is not None
+}
+
+
+def build_feature_vector(data, feature_names):
+    """
+    Prepares a single input for the model using plain Python instead of pandas.
+
+    Applies the same type conversions and engineered features as
+    `process_features`, producing identical values for one row at a fraction
+    of the cost of building and converting a DataFrame.
+
+    Args:
+        data (dict or BaseModel): The raw input, as a dictionary or an object
+        exposing the input fields as attributes (e.g. `TaxFilingInput`).
+        feature_names (list): The ordered feature names expected by the model
+        (`model.feature_names_`).
+
+    Returns:
+        list: The feature values in the order of `feature_names`.
+    """
+
+    if isinstance(data, dict):
+        values = {name: convert(data[name]) for name, convert in FEATURE_CONVERTERS.items()}
+    else:
+        values = {
+            name: convert(getattr(data, name))
+            for name, convert in FEATURE_CONVERTERS.items()
+        }
+    for name, (derive, convert) in DERIVED_CONVERTERS.items():
+        values[name] = convert(derive(values))
+
+    return [values[name] for name in feature_names]
+
+
+def build_feature_columns(rows):
+    """
+    Prepares many inputs column by column using NumPy instead of pandas.
+
+    Produces the same values as `feature_arrays`: numeric features are converted
+    to their dtype as whole arrays and engineered features are computed from the
+    converted columns. Categorical values are converted once per distinct value.
+
+    Args:
+        rows (list): The raw inputs, as objects exposing the input fields as
+        attributes (e.g. `TaxFilingInput`).
+
+    Returns:
+        dict: Feature name to a NumPy array for numeric features or a list of
+        strings for categorical features, in model column order.
+    """
+    columns = {}
+    for column in FEATURE_SPEC:
+        name = column["name"]
+        if column["derive"] is not None:
+            continue
+        values = [getattr(row, name) for row in rows]
+        if column["categorical"]:
+            convert = FEATURE_CONVERTERS[name]
+            converted = {value: convert(value) for value in set(values)}
+            columns[name] = [converted[value] for value in values]
+        else:
+            columns[name] = np.asarray(values, dtype=column["dtype"])
+    for column in FEATURE_SPEC:
+        if column["derive"] is not None:
+            columns[column["name"]] = np.asarray(column["derive"](columns)).astype(column["dtype"])
+
+    return {column["name"]: columns[column["name"]] for column in FEATURE_SPEC}
@@ -1,23 +1,92 @@
 import os
+import time
 
 from catboost import CatBoostClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
-import joblib
 from loguru import logger
 
 from config.config import settings
-from model.pipeline.preparation import process_input, process_features
+from model.pipeline.preparation import process_input, process_features, feature_spec_version
+from src.model.artifact import load_metadata, load_model_artifact, save_model_artifact
+from src.model.pipeline.collection import load_data_from_db
+from src.model.pipeline.dataset_cache import load_prepared_dataset
+from src.monitoring.drift import build_baseline
 
 
 def build_model():
-    df = process_input()
-    X, y = get_X_y(df)
-    X = process_features(X)
+    started = time.perf_counter()
+    if settings.dataset_cache_enabled:
+        X, y = load_prepared_dataset()
+    else:
+        df = process_input()
+        X, y = get_X_y(df)
+        X = process_features(X)
     logger.info(f"Model training columns: {X.columns.tolist()}")
     X_train, X_test, X_inference, y_train, y_test, y_inference = split_train_test(X, y)
     model = train_model(X_train, y_train)
-    save_model(model)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Full training on {len(X_train)} rows took {elapsed:.1f}s")
+    metadata = training_metadata("full", len(X_train), elapsed)
+    metadata["f1_score"] = evaluate_model(model, X_test, y_test)
+    metadata["drift_baseline"] = build_baseline(X_train)
+    save_model(model, metadata)
+
+
+def build_model_from_db():
+    started = time.perf_counter()
+    df = load_data_from_db()
+    if df.empty:
+        raise ValueError(f"Table {settings.table_name} is empty, nothing to train on")
+    X = process_features(df)
+    model = train_model(X, df[settings.target])
+    elapsed = time.perf_counter() - started
+    logger.info(f"Full training on {len(df)} database rows took {elapsed:.1f}s")
+    metadata = training_metadata("full", len(df), elapsed, int(df["id"].max()))
+    metadata["drift_baseline"] = build_baseline(X)
+    return save_versioned_model(model, metadata)
+
+
+def update_model(iterations=None):
+    started = time.perf_counter()
+    metadata = load_metadata(settings.model_path)
+    if metadata is None or metadata.get("watermark") is None:
+        logger.warning("Model has no training watermark, falling back to a full retrain")
+        return build_model_from_db()
+    if metadata.get("feature_spec") != feature_spec_version():
+        logger.warning("Feature schema changed since the last training, falling back to a full retrain")
+        return build_model_from_db()
+
+    df = load_data_from_db(after=metadata["watermark"])
+    if df.empty:
+        logger.info(f"No rows added after watermark {metadata['watermark']}, keeping {metadata['version']}")
+        return metadata
+
+    X, y = process_features(df), df[settings.target]
+    if X.columns.tolist() != metadata["feature_names"]:
+        logger.warning("Model features do not match the prepared data, falling back to a full retrain")
+        return build_model_from_db()
+
+    model = train_model(
+        X, y,
+        iterations=iterations or settings.incremental_iterations,
+        init_model=load_model_artifact(settings.model_path),
+    )
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Incremental training on {len(df)} new rows took {elapsed:.1f}s "
+        f"({metadata['tree_count']} -> {model.tree_count_} trees)"
+    )
+    # The model still reflects the data it was first trained on, so it keeps that baseline.
+    return save_versioned_model(
+        model,
+        {
+            **training_metadata(
+                "incremental", len(df), elapsed, int(df["id"].max()), metadata["version"]
+            ),
+            "drift_baseline": metadata.get("drift_baseline"),
+        },
+    )
 
 
 def get_X_y(df):
@@ -37,19 +106,25 @@ def split_train_test(X, y, test_size=0.3, random_state=42):
     return X_train, X_test, X_inference, y_train, y_test, y_inference
 
 
-def train_model(X_train, y_train):
+def train_model(
+    X_train, y_train, iterations=300, init_model=None, eval_set=None, early_stopping_rounds=None, **params
+):
     logger.info("Training model")
+    params = {"depth": 6, "learning_rate": 0.05, "verbose": 100, **params}
     model = CatBoostClassifier(
-        iterations=300,
-        depth=6,
-        learning_rate=0.05,
+        iterations=iterations,
         loss_function="Logloss",
-        cat_features=settings.categorical_features,
+        cat_features=[name for name in settings.categorical_features if name in X_train.columns],
         auto_class_weights="Balanced",
-        verbose=100,
+        **params,
     )
 
-    model.fit(X_train, y_train)
+    model.fit(
+        X_train, y_train,
+        init_model=init_model,
+        eval_set=eval_set,
+        early_stopping_rounds=early_stopping_rounds,
+    )
     return model
 
 
@@ -63,7 +138,26 @@ def evaluate_model(model, X_test, y_test):
     return f1_score
 
 
-def save_model(model):
-    os.makedirs(settings.model_dir, exist_ok=True)
-    joblib.dump(model, settings.model_path)
+def save_model(model, metadata=None):
     logger.info(f"Saving model into directory : {settings.model_dir}")
+    return save_model_artifact(model, settings.model_path, metadata)
+
+
+def training_metadata(mode, rows, seconds, watermark=None, parent=None):
+    return {
+        "training_mode": mode,
+        "training_rows": rows,
+        "training_seconds": round(seconds, 3),
+        "watermark": watermark,
+        "parent_version": parent,
+        "feature_spec": feature_spec_version(),
+    }
+
+
+def save_versioned_model(model, metadata):
+    # Keep a copy per version next to the served artifact, so a bad update can be rolled back.
+    metadata = save_model(model, metadata)
+    suffix = os.path.splitext(settings.model_path)[1]
+    versioned_path = os.path.join(settings.model_dir, f"{metadata['version']}{suffix}")
+    save_model_artifact(model, versioned_path, metadata)
+    return metadata
@@ -3,13 +3,25 @@ This module provides functions for preprocessing input data.
 It includes functions to load data, process database records, and apply feature
 engineering transformations.
 
+The column specification and the single-row fast path live in `features` and
+are re-exported here.
+
 Functions:
     - process_input(): Loads and processes data from the database.
-    - process_features(X): Prepares and transforms input features for the model.
+    - feature_arrays(X, categorical_dtype): Converts input features to typed column arrays.
+    - process_features(X, categorical_dtype): Prepares and transforms input features for the model.
+    - select_features(X, feature_names): Orders prepared features for the model without copying.
 """
 
+import numpy as np
 import pandas as pd
-from src.model.pipeline.collection import load_data  # , load_data_from_db
+from src.model.pipeline.features import (  # noqa: F401
+    DERIVED_FEATURES,
+    FEATURE_SPEC,
+    build_feature_spec,
+    build_feature_vector,
+    feature_spec_version,
+)
 
 
 def process_input():
@@ -19,6 +31,9 @@ def process_input():
     Returns:
         pd.DataFrame: A DataFrame containing processed user data with additional features.
     """
+    # Imported here, so preparing features does not pull in the database layer.
+    from src.model.pipeline.collection import load_data
+
     df = load_data()
     df["sessions_per_minute"] = df["number_of_sessions"] / (
         df["time_spent_on_platform"] + 1
@@ -30,40 +45,126 @@ def process_input():
     return df
 
 
-def process_features(X):
+def _to_array(values, dtype):
+    """
+    Casts column values to a NumPy dtype, reusing the data when it already matches.
+    """
+    values = np.asarray(values)
+    if values.dtype == dtype:
+        return values
+    return values.astype(dtype)
+
+
+def _to_categorical(values, dtype, via):
+    """
+    Converts column values to strings, either as an object array or as a
+    pandas Categorical whose categories are strings.
+
+    Categorical inputs without missing values are converted through their
+    categories only, so every row shares the string of its category instead of
+    getting a copy of its own.
+    """
+    if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype) and dtype != "category":
+        values = pd.Categorical(values)
+        if (values.codes >= 0).all():
+            categories = values.categories
+            if via is not None:
+                categories = categories.astype(via)
+            return np.asarray(categories.astype(str), dtype=object)[values.codes]
+
+    if dtype == "category":
+        if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+            values = pd.Categorical(values)
+        else:
+            values = pd.Categorical(values if via is None else _to_array(values, via))
+        categories = values.categories
+        if via is not None:
+            categories = categories.astype(via)
+        # Only the categories are converted, the codes are reused as they are.
+        return values.rename_categories(categories.astype(str))
+
+    if via is not None:
+        values = _to_array(values, via)
+    return pd.Series(values, copy=False).astype(str).to_numpy()
+
+
+def feature_arrays(X, categorical_dtype=None):
+    """
+    Converts input features to typed column arrays following `FEATURE_SPEC`.
+
+    Every column is converted exactly once, columns that already have the target
+    dtype are reused without copying, and the input is never modified. Engineered
+    features are always recomputed from the converted base columns.
+
+    Args:
+        X (pd.DataFrame, dict or list): The input data, as a DataFrame, a dict of
+        column arrays or a list of records.
+        categorical_dtype (str, optional): "str" or "category".
+                                           Defaults to `settings.categorical_dtype`.
+
+    Returns:
+        dict: Feature name to NumPy array (or pandas Categorical for categorical
+        features with the "category" dtype), in model column order.
+    """
+
+    if isinstance(X, list):
+        X = pd.DataFrame(X)
+
+    columns = {}
+    for column in FEATURE_SPEC:
+        if column["derive"] is None and not column["categorical"]:
+            columns[column["name"]] = _to_array(X[column["name"]], column["dtype"])
+    for column in FEATURE_SPEC:
+        if column["derive"] is not None:
+            columns[column["name"]] = _to_array(column["derive"](columns), column["dtype"])
+    for column in FEATURE_SPEC:
+        if column["categorical"]:
+            columns[column["name"]] = _to_categorical(
+                X[column["name"]],
+                categorical_dtype or column["dtype"],
+                column["via"],
+            )
+
+    return {column["name"]: columns[column["name"]] for column in FEATURE_SPEC}
+
+
+def process_features(X, categorical_dtype=None):
     """
     Processes input data by converting data types and applying feature transformations.
 
+    The conversions are driven by `FEATURE_SPEC`; see `feature_arrays`. The result
+    holds exactly the model features in model column order and keeps the index of
+    the input, so it can be aligned with the target.
+
     Args:
-        X (list or pd.DataFrame): The input data to be processed. If a list is provided,
-        it is converted to a DataFrame.
+        X (list, dict or pd.DataFrame): The input data to be processed. If a list is
+        provided, it is converted to a DataFrame.
+        categorical_dtype (str, optional): "str" or "category".
+                                           Defaults to `settings.categorical_dtype`.
 
     Returns:
         pd.DataFrame: The transformed DataFrame with appropriate feature types and
         engineered features.
     """
 
-    if isinstance(X, list):
-        X = pd.DataFrame(X)
-    X["age"] = X["age"].astype(int)
-    X["income"] = X["income"].astype(float)
-    X["employment_type"] = X["employment_type"].astype(str)
-    X["marital_status"] = X["marital_status"].astype(str)
-    X["time_spent_on_platform"] = X["time_spent_on_platform"].astype(float)
-    X["number_of_sessions"] = X["number_of_sessions"].astype(int)
-    X["fields_filled_percentage"] = X["fields_filled_percentage"].astype(float)
-    X["previous_year_filing"] = X["previous_year_filing"].astype(int).astype(str)
-    X["device_type"] = X["device_type"].astype(str)
-    X["referral_source"] = X["referral_source"].astype(str)
-    X["sessions_per_minute"] = X["number_of_sessions"] / (
-        X["time_spent_on_platform"] + 1
-    )
-    X["fields_filled_x_sessions"] = (
-        X["fields_filled_percentage"] * X["number_of_sessions"]
-    )
-    X["sessions_per_minute"] = X["sessions_per_minute"].astype(float).astype(int)
-    X["fields_filled_x_sessions"] = (
-        X["fields_filled_x_sessions"].astype(float).astype(int)
-    )
+    index = X.index if isinstance(X, pd.DataFrame) else None
+    return pd.DataFrame(feature_arrays(X, categorical_dtype), index=index, copy=False)
+
+
+def select_features(X, feature_names):
+    """
+    Returns the features in the order expected by the model.
 
-    return X
+    Frames produced by `process_features` are already in model column order,
+    in which case they are returned as they are instead of being copied.
+
+    Args:
+        X (pd.DataFrame): Prepared input data.
+        feature_names (list): The ordered feature names expected by the model.
+
+    Returns:
+        pd.DataFrame: The input data restricted to `feature_names`.
+    """
+    if list(X.columns) == list(feature_names):
+        return X
+    return X[feature_names]
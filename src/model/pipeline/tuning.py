@@ -0,0 +1,264 @@
+"""
+This module searches CatBoost hyperparameters with k-fold cross-validation.
+Every (candidate, fold) pair is trained in its own worker process with a bounded
+number of CatBoost threads, so the search uses all cores without the processes
+competing for them. Each fit stops early on the held-out test split and is scored
+with `evaluate_model` on its validation fold.
+
+Besides the F1 score, the training time and the inference latency of every
+candidate are recorded, and the candidates on the speed/accuracy Pareto front
+are marked, so a model can be picked for its accuracy and its serving cost.
+Latency and throughput are measured one model at a time once all fits are done,
+with the CatBoost threads of the API, so they do not depend on how busy the
+other workers were.
+
+Functions:
+    - build_candidates(space, n_candidates, seed): Expands a search space into parameter sets.
+    - pareto_front(results): Marks the candidates no other candidate beats on both F1 and latency.
+    - tune(...): Runs the search and returns one summary per candidate.
+"""
+
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from loguru import logger
+from sklearn.model_selection import StratifiedKFold
+
+from config.config import settings
+from model.pipeline.model import evaluate_model, split_train_test, train_model
+from src.model.pipeline.dataset_cache import (
+    cache_path,
+    load_prepared_dataset,
+    read_prepared_dataset,
+)
+
+LATENCY_REPEAT = 200
+
+_worker_data = None
+
+
+def build_candidates(space, n_candidates=None, seed=42):
+    """
+    Expands a search space into parameter sets.
+
+    Args:
+        space (dict): Parameter name to the list of values to try.
+        n_candidates (int, optional): Number of parameter sets sampled from the
+                                      full grid. Defaults to the full grid.
+        seed (int, optional): Seed of the sampling.
+
+    Returns:
+        list[dict]: The parameter sets.
+    """
+    names = sorted(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+    if n_candidates and n_candidates < len(grid):
+        grid = random.Random(seed).sample(grid, n_candidates)
+    return grid
+
+
+def _init_worker(dataset_dir, folds, thread_count, early_stopping_rounds):
+    """
+    Memory-maps the prepared dataset and splits it once per worker process.
+    """
+    global _worker_data
+    _worker_data = _load_folds(dataset_dir, folds, thread_count, early_stopping_rounds)
+
+
+def _load_folds(dataset_dir, folds, thread_count, early_stopping_rounds):
+    """
+    Memory-maps the prepared dataset and splits it into the cross-validation folds.
+    """
+    X, y = read_prepared_dataset(dataset_dir)
+    X_train, X_test, _, y_train, y_test, _ = split_train_test(X, y)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    return {
+        "X_train": X_train.reset_index(drop=True),
+        "y_train": y_train.reset_index(drop=True),
+        "X_test": X_test,
+        "y_test": y_test,
+        "folds": list(splitter.split(X_train, y_train)),
+        "thread_count": thread_count,
+        "early_stopping_rounds": early_stopping_rounds,
+    }
+
+
+def _measure_speed(model, X):
+    """
+    Returns the median latency of predicting a single row, in milliseconds, and
+    the batch throughput in rows per second, with `settings.model_thread_count`
+    CatBoost threads like the API.
+    """
+    threads = settings.model_thread_count
+    row = X.iloc[:1]
+    model.predict_proba(row, thread_count=threads)
+    samples = []
+    for _ in range(LATENCY_REPEAT):
+        started = time.perf_counter()
+        model.predict_proba(row, thread_count=threads)
+        samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    model.predict_proba(X, thread_count=threads)
+    batch_seconds = time.perf_counter() - started
+    return statistics.median(samples) * 1000, len(X) / batch_seconds
+
+
+def _run_fold(job):
+    """
+    Trains and evaluates one candidate on one fold in a worker process.
+
+    The model is returned with the result, so its speed can be measured once
+    no other fit is running.
+    """
+    candidate, params, fold = job
+    data = _worker_data
+    train_index, valid_index = data["folds"][fold]
+    X_valid, y_valid = data["X_train"].iloc[valid_index], data["y_train"].iloc[valid_index]
+
+    started = time.perf_counter()
+    model = train_model(
+        data["X_train"].iloc[train_index],
+        data["y_train"].iloc[train_index],
+        eval_set=(data["X_test"], data["y_test"]),
+        early_stopping_rounds=data["early_stopping_rounds"],
+        thread_count=data["thread_count"],
+        verbose=False,
+        **params,
+    )
+    train_seconds = time.perf_counter() - started
+    return {
+        "candidate": candidate,
+        "fold": fold,
+        "f1": evaluate_model(model, X_valid, y_valid),
+        "train_seconds": train_seconds,
+        "tree_count": model.tree_count_,
+        "model": model,
+    }
+
+
+def pareto_front(results):
+    """
+    Marks the candidates that no other candidate beats on both F1 and latency.
+
+    Args:
+        results (list[dict]): Candidate summaries with `f1_mean` and `latency_ms`.
+
+    Returns:
+        list[dict]: The same summaries with a `pareto` flag.
+    """
+    for result in results:
+        result["pareto"] = not any(
+            other["f1_mean"] >= result["f1_mean"]
+            and other["latency_ms"] <= result["latency_ms"]
+            and (other["f1_mean"] > result["f1_mean"] or other["latency_ms"] < result["latency_ms"])
+            for other in results
+        )
+    return results
+
+
+def _summarize(candidate, params, folds):
+    """
+    Aggregates the fold results of one candidate.
+    """
+    f1 = [fold["f1"] for fold in folds]
+    return {
+        "candidate": candidate,
+        "params": params,
+        "f1_mean": round(float(np.mean(f1)), 5),
+        "f1_std": round(float(np.std(f1)), 5),
+        "train_seconds": round(float(np.mean([f["train_seconds"] for f in folds])), 3),
+        "tree_count": round(float(np.mean([f["tree_count"] for f in folds])), 1),
+        "latency_ms": round(float(np.mean([f["latency_ms"] for f in folds])), 4),
+        "batch_rows_per_sec": round(float(np.mean([f["batch_rows_per_sec"] for f in folds]))),
+    }
+
+
+def tune(
+    space=None,
+    n_candidates=None,
+    folds=None,
+    n_workers=None,
+    thread_count=None,
+    data_path=settings.data_path,
+    output=None,
+):
+    """
+    Runs a cross-validated search over CatBoost parameters.
+
+    Args:
+        space (dict, optional): Parameter name to the values to try.
+                                Defaults to `settings.tuning_search_space`.
+        n_candidates (int, optional): Number of parameter sets sampled from the grid.
+        folds (int, optional): Number of cross-validation folds.
+                               Defaults to `settings.tuning_folds`.
+        n_workers (int, optional): Number of worker processes. Defaults to
+                                   `settings.tuning_workers`, or the number of cores
+                                   divided by the threads per worker.
+        thread_count (int, optional): CatBoost threads per worker.
+                                      Defaults to `settings.tuning_thread_count`.
+        data_path (str, optional): The training CSV file. Defaults to `settings.data_path`.
+        output (str, optional): JSON file the results are written to.
+
+    Returns:
+        list[dict]: One summary per candidate, best F1 first, with the mean and
+        standard deviation of F1 over the folds, the mean training time, tree count,
+        single-row latency and batch throughput, and the Pareto flag.
+    """
+    space = space or settings.tuning_search_space
+    folds = folds or settings.tuning_folds
+    thread_count = thread_count or settings.tuning_thread_count
+    n_workers = n_workers or settings.tuning_workers or max(1, (os.cpu_count() or 1) // thread_count)
+
+    candidates = build_candidates(space, n_candidates)
+    jobs = [(c, params, fold) for c, params in enumerate(candidates) for fold in range(folds)]
+    logger.info(
+        f"Tuning {len(candidates)} candidates with {folds}-fold CV on {n_workers} "
+        f"processes x {thread_count} threads"
+    )
+
+    load_prepared_dataset(data_path)
+    started = time.perf_counter()
+    fold_results = {c: [] for c in range(len(candidates))}
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_worker,
+        initargs=(cache_path(data_path), folds, thread_count, settings.tuning_early_stopping_rounds),
+    ) as pool:
+        for result in pool.map(_run_fold, jobs):
+            fold_results[result["candidate"]].append(result)
+            if len(fold_results[result["candidate"]]) == folds:
+                logger.info(f"Candidate {result['candidate']} {candidates[result['candidate']]} done")
+
+    # Timed one model at a time in this process, after the pool has shut down.
+    data = _load_folds(
+        cache_path(data_path), folds, thread_count, settings.tuning_early_stopping_rounds
+    )
+    for result in (result for results in fold_results.values() for result in results):
+        X_valid = data["X_train"].iloc[data["folds"][result["fold"]][1]]
+        result["latency_ms"], result["batch_rows_per_sec"] = _measure_speed(
+            result.pop("model"), X_valid
+        )
+
+    results = pareto_front(
+        [_summarize(c, candidates[c], fold_results[c]) for c in range(len(candidates))]
+    )
+    results.sort(key=lambda result: result["f1_mean"], reverse=True)
+    logger.info(f"Tuning finished in {time.perf_counter() - started:.1f}s")
+    for result in results:
+        logger.info(
+            f"{'*' if result['pareto'] else ' '} F1 {result['f1_mean']:.4f} "
+            f"+/- {result['f1_std']:.4f}, {result['latency_ms']:.3f} ms/row, "
+            f"{result['train_seconds']:.1f}s to train: {result['params']}"
+        )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
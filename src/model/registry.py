@@ -0,0 +1,214 @@
+"""
+This module provides an in-memory model registry for the inference API.
+The model is loaded once per worker and swapped atomically whenever the
+artifact on disk changes, so a new model can be deployed without a restart.
+
+Classes:
+    - ModelRegistry: Holds the active model and reloads it when the artifact changes.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import psutil
+from loguru import logger
+
+from src.model.artifact import load_metadata, load_model_artifact, resolve_artifact_path
+
+
+class ModelRegistry:
+    """
+    Keeps the active model in memory and hot-swaps it when the artifact changes.
+
+    The model, its version and the file signature it was loaded from are stored
+    together in one tuple, so readers always see a consistent pair and are never
+    blocked by a reload running in the background.
+
+    The version is read from an optional version file next to the model
+    (`<model_path>.version`), then from the artifact's metadata sidecar. If
+    neither exists, the modification time of the model file is used instead.
+
+    An optional warm-up function is called with every newly loaded model before
+    it becomes active, so the first requests served by it do not pay for lazy
+    initialization. A model whose warm-up fails is not activated.
+
+    The artifact is loaded with `load_model_artifact` unless another loader is
+    given, e.g. one returning a compiled scorer for the artifact. Files the loader
+    reads next to the artifact can be watched too, so the model is also reloaded
+    when only they change.
+
+    Attributes:
+        model_path (str): Path of the model artifact being watched.
+        version_file (str): Path of the optional version file.
+        watch_files (list): Further files whose changes trigger a reload.
+        loaded_at (datetime or None): When the active model was loaded.
+        load_count (int): Number of models loaded so far.
+        last_load_seconds (float or None): How long the last load took.
+        last_warmup_seconds (float or None): How long the last warm-up took.
+        memory_bytes (int or None): Growth of the process' resident memory while
+                                    the active model was loaded, an estimate of
+                                    the memory the model holds.
+    """
+
+    def __init__(
+        self, model_path, version_file=None, warm_up=None, loader=load_model_artifact, watch_files=()
+    ):
+        """
+        Initializes the registry without loading the model.
+
+        Args:
+            model_path (str): Path of the model artifact.
+            version_file (str, optional): Path of the version file.
+                                          Defaults to `<model_path>.version`.
+            warm_up (callable, optional): Function called with every newly loaded
+                                          model before it is activated.
+            loader (callable, optional): Function loading the model from
+                                         `model_path`. Defaults to `load_model_artifact`.
+            watch_files (list, optional): Further files read by `loader`, e.g. the
+                                          compiled model next to the artifact.
+        """
+        self.model_path = model_path
+        self.version_file = version_file or f"{model_path}.version"
+        self.loaded_at = None
+        self.load_count = 0
+        self.last_load_seconds = None
+        self.last_warmup_seconds = None
+        self.memory_bytes = None
+        self.warm_up = warm_up
+        self.loader = loader
+        self.watch_files = list(watch_files)
+        self._active = None
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        Registers a function called with the new version whenever a model is loaded.
+
+        Args:
+            callback (callable): Function taking the new version string.
+        """
+        self._listeners.append(callback)
+
+    def _signature(self):
+        """
+        Returns the (mtime, size) of the model, version and watched files, or
+        None for files that do not exist.
+        """
+        signature = []
+        for path in (resolve_artifact_path(self.model_path), self.version_file, *self.watch_files):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _read_version(self, signature):
+        """
+        Resolves the version string for the given file signature.
+        """
+        if signature[1] is not None:
+            with open(self.version_file, "r") as f:
+                version = f.read().strip()
+            if version:
+                return version
+        metadata = load_metadata(self.model_path)
+        if metadata and metadata.get("version"):
+            return metadata["version"]
+        mtime = datetime.fromtimestamp(signature[0][0] / 1e9, tz=timezone.utc)
+        model_file = os.path.basename(resolve_artifact_path(self.model_path))
+        return f"{model_file}@{mtime.isoformat()}"
+
+    def load(self):
+        """
+        Loads the model from disk and makes it the active model.
+
+        Returns:
+            str: The version of the loaded model.
+
+        Raises:
+            FileNotFoundError: If the model file does not exist.
+            Exception: Any error raised by the warm-up function.
+        """
+        with self._lock:
+            signature = self._signature()
+            if signature[0] is None:
+                raise FileNotFoundError(f"Model file not found at {self.model_path}")
+
+            # Import the model library first, so its own memory is not counted
+            # as the memory of the first model.
+            import catboost  # noqa: F401
+
+            process = psutil.Process()
+            rss_before = process.memory_info().rss
+            started = time.perf_counter()
+            model = self.loader(self.model_path)
+            version = self._read_version(signature)
+            self.last_load_seconds = time.perf_counter() - started
+            memory_bytes = max(0, process.memory_info().rss - rss_before)
+            if self.warm_up is not None:
+                started = time.perf_counter()
+                self.warm_up(model)
+                self.last_warmup_seconds = time.perf_counter() - started
+                logger.info(f"Warmed up model {version} in {self.last_warmup_seconds:.3f}s")
+            self._active = (model, version, signature)
+            self.memory_bytes = memory_bytes
+            self.load_count += 1
+            self.loaded_at = datetime.now(timezone.utc)
+            logger.info(f"Loaded model {version} from {self.model_path}")
+
+        for callback in self._listeners:
+            callback(version)
+        return version
+
+    def refresh(self):
+        """
+        Reloads the model if the artifact changed since it was last loaded.
+
+        Errors are logged and the current model is kept, so a broken or
+        half-written artifact never takes the service down.
+
+        Returns:
+            bool: True if a new model was swapped in.
+        """
+        active = self._active
+        signature = self._signature()
+        if active is not None and signature == active[2]:
+            return False
+        if signature[0] is None:
+            if active is not None:
+                logger.warning(f"Model file {self.model_path} disappeared, keeping {active[1]}")
+            return False
+
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Error reloading model from {self.model_path}: {e}")
+            return False
+        return True
+
+    def get(self):
+        """
+        Returns the active model and its version.
+
+        Returns:
+            tuple: (model, version)
+
+        Raises:
+            LookupError: If no model has been loaded yet.
+        """
+        active = self._active
+        if active is None:
+            raise LookupError("Model is not loaded")
+        return active[0], active[1]
+
+    @property
+    def version(self):
+        """
+        str or None: The version of the active model.
+        """
+        active = self._active
+        return active[1] if active is not None else None
@@ -0,0 +1,140 @@
+"""
+This module routes predictions between several models served side by side, e.g.
+the production model and a retrained candidate during a rollout. Every model is
+held by its own `ModelRegistry`, so each one is loaded, warmed up and hot-swapped
+independently.
+
+Classes:
+    - ModelRouter: Holds the served models and picks the model of each request.
+"""
+
+import random
+
+from loguru import logger
+
+PRIMARY = "primary"
+
+
+class ModelRouter:
+    """
+    Holds several models in memory and routes requests between them by weight.
+
+    The primary model receives the share of requests left over by the other
+    models' weights. A model that is not loaded yet, or failed to load, never
+    receives traffic; its requests go to the primary model instead. One of the
+    models can be marked as the shadow model, which is scored next to the model
+    that served a request to compare their predictions.
+
+    Attributes:
+        registries (dict): Model name to the `ModelRegistry` holding it.
+        weights (dict): Model name to its share of requests.
+        shadow (str or None): Name of the shadow model.
+    """
+
+    def __init__(self, registries, weights=None, shadow=None, seed=None):
+        """
+        Initializes the router without loading any model.
+
+        Args:
+            registries (dict): Model name to `ModelRegistry`; must contain `PRIMARY`.
+            weights (dict, optional): Model name to its share of requests, between 0
+                                      and 1. The primary model gets the rest.
+            shadow (str, optional): Name of the shadow model.
+            seed (int, optional): Seed of the routing decisions.
+
+        Raises:
+            ValueError: If a weight or the shadow model names an unknown model, or
+                        the weights add up to more than 1.
+        """
+        weights = {name: weight for name, weight in (weights or {}).items() if name != PRIMARY}
+        unknown = (set(weights) | ({shadow} if shadow else set())) - set(registries)
+        if PRIMARY not in registries or unknown:
+            raise ValueError(f"Unknown models {sorted(unknown)}, serving {sorted(registries)}")
+        if sum(weights.values()) > 1:
+            raise ValueError(f"Model weights {weights} add up to more than 1")
+
+        self.registries = registries
+        self.weights = {
+            name: (1 - sum(weights.values())) if name == PRIMARY else weights.get(name, 0.0)
+            for name in registries
+        }
+        self.shadow = shadow
+        self._names = list(self.weights)
+        self._random = random.Random(seed)
+
+    @property
+    def primary(self):
+        """
+        ModelRegistry: The registry of the primary model.
+        """
+        return self.registries[PRIMARY]
+
+    def choose(self):
+        """
+        Picks the model of a request by weight.
+
+        Returns:
+            str: The name of a loaded model, or `PRIMARY`.
+        """
+        if len(self._names) == 1:
+            return PRIMARY
+        name = self._random.choices(self._names, weights=self.weights.values())[0]
+        if self.registries[name].version is None:
+            return PRIMARY
+        return name
+
+    def get(self, name=PRIMARY):
+        """
+        Returns a model and its version.
+
+        Args:
+            name (str, optional): Name of the model. Defaults to the primary model.
+
+        Returns:
+            tuple: (model, version)
+
+        Raises:
+            LookupError: If the model has not been loaded yet.
+        """
+        return self.registries[name].get()
+
+    def load(self):
+        """
+        Loads every model one after another; a model that fails to load is logged
+        and picked up by `refresh` once a valid artifact appears.
+        """
+        for name, registry in self.registries.items():
+            try:
+                registry.load()
+            except Exception as e:
+                logger.exception(f"Error loading model {name}: {e}")
+
+    def refresh(self):
+        """
+        Reloads every model whose artifact changed.
+        """
+        for registry in self.registries.values():
+            registry.refresh()
+
+    def stats(self):
+        """
+        Returns the version, routing weight and memory of every model.
+
+        Returns:
+            dict: Model name to its statistics.
+        """
+        return {
+            name: {
+                "version": registry.version,
+                "path": registry.model_path,
+                "weight": round(self.weights[name], 4),
+                "shadow": name == self.shadow,
+                "memory_mb": (
+                    round(registry.memory_bytes / 2**20, 2)
+                    if registry.memory_bytes is not None
+                    else None
+                ),
+                "load_seconds": registry.last_load_seconds,
+            }
+            for name, registry in self.registries.items()
+        }
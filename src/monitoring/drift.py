@@ -0,0 +1,440 @@
+"""
+This module monitors whether the inputs served by the API still look like the
+data the model was trained on. Every input updates constant-size sketches in
+process, one per feature:
+
+    - Categorical features: a count-min sketch of the category frequencies.
+    - Numeric features: a histogram over the quantile edges of the training data,
+      i.e. a quantile sketch whose bins are fixed by the baseline.
+
+Updating a sketch costs a hash or a binary search per feature, independent of the
+number of inputs seen; batches of inputs are added column by column, counting
+every distinct category once and binning numeric values with NumPy. Sketches of
+several workers are merged by adding their counters, so the distribution of all
+workers can be compared with the baseline.
+The baseline is computed from the training data when the model is built and
+stored in its metadata sidecar. Drift is reported as the population stability
+index (PSI) of every feature and, for numeric features, the Kolmogorov-Smirnov
+statistic evaluated at the bin edges.
+
+Classes:
+    - CountMinSketch: Approximate frequencies of categorical values.
+    - BinnedSketch: Counts of numeric values per bin of fixed edges.
+    - DriftMonitor: Sketches every feature and compares them with a baseline.
+
+Functions:
+    - build_baseline(X, bins): Describes the training distribution of every feature.
+    - population_stability_index(expected, actual): Computes the PSI of two distributions.
+"""
+
+import hashlib
+import math
+import threading
+from bisect import bisect_right
+from collections import Counter
+
+import numpy as np
+
+from src.config.config import settings
+
+PSI_EPSILON = 1e-4
+
+
+def build_baseline(X, bins=None):
+    """
+    Describes the distribution of every feature of the training data.
+
+    Categorical features are described by the share of every category, numeric
+    features by the edges of `bins` quantile bins and the share of rows per bin.
+
+    Args:
+        X (pd.DataFrame): Prepared training features.
+        bins (int, optional): Number of quantile bins per numeric feature.
+                              Defaults to `settings.drift_bins`.
+
+    Returns:
+        dict: The baseline, serializable as JSON.
+    """
+    bins = bins or settings.drift_bins
+    baseline = {"rows": len(X), "categorical": {}, "numeric": {}}
+    for name in settings.categorical_features:
+        if name in X.columns:
+            shares = X[name].astype(str).value_counts(normalize=True)
+            baseline["categorical"][name] = {str(k): float(v) for k, v in shares.items()}
+    for name in settings.numeric_features:
+        if name in X.columns:
+            values = X[name].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+            counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+            baseline["numeric"][name] = {
+                "edges": edges.tolist(),
+                "shares": (counts / max(len(values), 1)).tolist(),
+            }
+    return baseline
+
+
+def population_stability_index(expected, actual):
+    """
+    Computes the population stability index of two distributions over the same bins.
+
+    Args:
+        expected (list): Share of every bin in the baseline.
+        actual (list): Share of every bin in the monitored data.
+
+    Returns:
+        float: The PSI; below 0.1 is usually read as stable, above 0.2 as drifted.
+    """
+    psi = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, PSI_EPSILON), max(a, PSI_EPSILON)
+        psi += (a - e) * math.log(a / e)
+    return psi
+
+
+class CountMinSketch:
+    """
+    Approximate frequencies of categorical values in constant memory.
+
+    Every value increments one counter in each of `depth` rows of `width`
+    counters; its frequency is estimated by the smallest of its counters, which
+    never underestimates. Hashes are stable across processes, so sketches of the
+    same size built in different workers can be merged.
+
+    Attributes:
+        width (int): Counters per row.
+        depth (int): Number of rows.
+        total (int): Number of values added.
+    """
+
+    def __init__(self, width=512, depth=4):
+        """
+        Args:
+            width (int, optional): Counters per row.
+            depth (int, optional): Number of rows, at most 16.
+        """
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._counts = [[0] * width for _ in range(depth)]
+        self._indexes = {}
+
+    def _columns(self, value):
+        """
+        Returns the counter of `value` in every row. The columns of the first
+        values seen are cached, which covers low-cardinality features entirely.
+        """
+        columns = self._indexes.get(value)
+        if columns is None:
+            digest = hashlib.blake2b(str(value).encode(), digest_size=4 * self.depth).digest()
+            columns = [
+                int.from_bytes(digest[4 * i : 4 * i + 4], "little") % self.width
+                for i in range(self.depth)
+            ]
+            if len(self._indexes) < self.width:
+                self._indexes[value] = columns
+        return columns
+
+    def add(self, value, count=1):
+        """
+        Adds occurrences of a value.
+
+        Args:
+            value: The categorical value.
+            count (int, optional): Number of occurrences.
+        """
+        for row, column in zip(self._counts, self._columns(value)):
+            row[column] += count
+        self.total += count
+
+    def estimate(self, value):
+        """
+        Returns the estimated number of occurrences of a value.
+        """
+        return min(row[column] for row, column in zip(self._counts, self._columns(value)))
+
+    def merge(self, other):
+        """
+        Adds the counters of a sketch of the same size.
+
+        Raises:
+            ValueError: If the sketches have different sizes.
+        """
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-min sketches of different sizes cannot be merged")
+        for row, other_row in zip(self._counts, other._counts):
+            for i, count in enumerate(other_row):
+                row[i] += count
+        self.total += other.total
+
+    def to_dict(self):
+        """
+        Returns the state of the sketch, serializable as JSON.
+        """
+        return {"width": self.width, "depth": self.depth, "total": self.total, "counts": self._counts}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Restores a sketch from `to_dict`.
+        """
+        sketch = cls(state["width"], state["depth"])
+        sketch.total = state["total"]
+        sketch._counts = [list(row) for row in state["counts"]]
+        return sketch
+
+
+class BinnedSketch:
+    """
+    Counts of numeric values per bin of fixed edges.
+
+    Bin `i` holds the values `v` with `edges[i - 1] <= v < edges[i]`, like
+    `np.searchsorted(edges, v, side="right")`. Missing values are counted apart.
+
+    Attributes:
+        edges (list): The bin edges, ascending.
+        counts (list): Number of values per bin, one more than there are edges.
+        missing (int): Number of missing values.
+    """
+
+    def __init__(self, edges):
+        """
+        Args:
+            edges (list): The bin edges, ascending.
+        """
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.missing = 0
+
+    @property
+    def total(self):
+        """
+        int: Number of non-missing values added.
+        """
+        return sum(self.counts)
+
+    def add(self, value):
+        """
+        Adds a value.
+        """
+        if value is None or value != value:
+            self.missing += 1
+        else:
+            self.counts[bisect_right(self.edges, value)] += 1
+
+    def add_array(self, values):
+        """
+        Adds many values at once.
+
+        Args:
+            values (np.ndarray): The numeric values.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+        counts = np.bincount(
+            np.searchsorted(self.edges, values[~missing], side="right"),
+            minlength=len(self.counts),
+        )
+        self.counts = [a + int(b) for a, b in zip(self.counts, counts)]
+        self.missing += int(missing.sum())
+
+    def merge(self, other):
+        """
+        Adds the counts of a sketch with the same edges.
+
+        Raises:
+            ValueError: If the sketches have different edges.
+        """
+        if other.edges != self.edges:
+            raise ValueError("Binned sketches with different edges cannot be merged")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.missing += other.missing
+
+    def to_dict(self):
+        """
+        Returns the state of the sketch, serializable as JSON.
+        """
+        return {"edges": self.edges, "counts": self.counts, "missing": self.missing}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Restores a sketch from `to_dict`.
+        """
+        sketch = cls(state["edges"])
+        sketch.counts = list(state["counts"])
+        sketch.missing = state["missing"]
+        return sketch
+
+
+class DriftMonitor:
+    """
+    Sketches the inputs of every feature and compares them with a baseline.
+
+    Attributes:
+        baseline (dict): The training distribution built by `build_baseline`.
+        version (str or None): Version of the model the baseline belongs to.
+        categorical (dict): Feature name to its `CountMinSketch`.
+        numeric (dict): Feature name to its `BinnedSketch`.
+        features (list): Names of the sketched features, categorical ones first.
+        inputs (int): Number of inputs added.
+    """
+
+    def __init__(self, baseline, version=None, width=None, depth=None):
+        """
+        Initializes empty sketches for the features of the baseline.
+
+        Args:
+            baseline (dict): The baseline built by `build_baseline`.
+            version (str, optional): Version of the model the baseline belongs to.
+            width (int, optional): Counters per count-min row.
+                                   Defaults to `settings.drift_sketch_width`.
+            depth (int, optional): Count-min rows. Defaults to `settings.drift_sketch_depth`.
+        """
+        self.baseline = baseline
+        self.version = version
+        self.categorical = {
+            name: CountMinSketch(width or settings.drift_sketch_width, depth or settings.drift_sketch_depth)
+            for name in baseline["categorical"]
+        }
+        self.numeric = {
+            name: BinnedSketch(description["edges"])
+            for name, description in baseline["numeric"].items()
+        }
+        self.features = [*self.categorical, *self.numeric]
+        self.inputs = 0
+        self._lock = threading.Lock()
+
+    def update(self, values):
+        """
+        Adds one input to the sketches.
+
+        Args:
+            values (list): The value of every feature in `features` order, e.g.
+                           built by `build_feature_vector(row, monitor.features)`.
+        """
+        with self._lock:
+            for sketch, value in zip(self.categorical.values(), values):
+                sketch.add(value)
+            for sketch, value in zip(self.numeric.values(), values[len(self.categorical) :]):
+                sketch.add(value)
+            self.inputs += 1
+
+    def update_columns(self, columns):
+        """
+        Adds many inputs to the sketches, column by column.
+
+        Args:
+            columns (dict): Feature name to the values of all inputs, e.g. built
+                            by `build_feature_columns(rows)`.
+        """
+        inputs = len(columns[self.features[0]]) if self.features else 0
+        counts = {name: Counter(columns[name]) for name in self.categorical}
+        with self._lock:
+            for name, sketch in self.categorical.items():
+                for value, count in counts[name].items():
+                    sketch.add(value, count)
+            for name, sketch in self.numeric.items():
+                sketch.add_array(columns[name])
+            self.inputs += inputs
+
+    def merge(self, snapshot):
+        """
+        Adds the sketches of another monitor, e.g. of another worker.
+
+        Args:
+            snapshot (dict): The result of `snapshot()` of a monitor with the same
+                             baseline and sketch sizes.
+
+        Raises:
+            ValueError: If the snapshot was taken against a different baseline.
+        """
+        if snapshot.get("version") != self.version:
+            raise ValueError(
+                f"Snapshot of model {snapshot.get('version')} cannot be merged into {self.version}"
+            )
+        with self._lock:
+            for name, state in snapshot["categorical"].items():
+                self.categorical[name].merge(CountMinSketch.from_dict(state))
+            for name, state in snapshot["numeric"].items():
+                self.numeric[name].merge(BinnedSketch.from_dict(state))
+            self.inputs += snapshot["inputs"]
+
+    def snapshot(self):
+        """
+        Returns the state of all sketches, serializable as JSON.
+        """
+        with self._lock:
+            return {
+                "version": self.version,
+                "inputs": self.inputs,
+                "categorical": {name: s.to_dict() for name, s in self.categorical.items()},
+                "numeric": {name: s.to_dict() for name, s in self.numeric.items()},
+            }
+
+    def _categorical_drift(self, name):
+        """
+        Returns the PSI of a categorical feature over the baseline categories
+        plus one bin for all other values.
+        """
+        sketch, expected = self.categorical[name], self.baseline["categorical"][name]
+        total = sketch.total
+        counts = [min(sketch.estimate(value), total) for value in expected]
+        actual = [count / total for count in counts] + [max(0, total - sum(counts)) / total]
+        return {
+            "count": total,
+            "psi": round(population_stability_index([*expected.values(), 0.0], actual), 6),
+            "unseen_share": round(actual[-1], 6),
+        }
+
+    def _numeric_drift(self, name):
+        """
+        Returns the PSI over the baseline bins and the KS statistic at the bin
+        edges of a numeric feature.
+        """
+        sketch, expected = self.numeric[name], self.baseline["numeric"][name]["shares"]
+        total = sketch.total
+        actual = [count / total for count in sketch.counts]
+        ks = float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+        return {
+            "count": total,
+            "psi": round(population_stability_index(expected, actual), 6),
+            "ks": round(ks, 6),
+            "missing": sketch.missing,
+        }
+
+    def report(self, threshold=None):
+        """
+        Compares the sketches with the baseline.
+
+        Args:
+            threshold (float, optional): PSI above which a feature is reported as
+                                         drifted. Defaults to `settings.drift_psi_threshold`.
+
+        Returns:
+            dict: The model version, the number of inputs, the drift scores of
+            every feature with inputs and the names of the drifted features.
+        """
+        threshold = settings.drift_psi_threshold if threshold is None else threshold
+        with self._lock:
+            features = {
+                **{
+                    name: self._categorical_drift(name)
+                    for name, sketch in self.categorical.items()
+                    if sketch.total
+                },
+                **{
+                    name: self._numeric_drift(name)
+                    for name, sketch in self.numeric.items()
+                    if sketch.total
+                },
+            }
+            inputs = self.inputs
+        return {
+            "model_version": self.version,
+            "baseline_rows": self.baseline["rows"],
+            "inputs": inputs,
+            "psi_threshold": threshold,
+            "drifted": [name for name, scores in features.items() if scores["psi"] > threshold],
+            "features": features,
+        }
@@ -1,28 +1,44 @@
 """
 This module serves as the entry point for executing the TaxFix model service.
-It loads the trained model, processes test input data, makes predictions,
-and logs the results.
+Without arguments, it loads the trained model, processes test input data, makes
+predictions, and logs the results. The `score` command runs streaming offline
+scoring over a large CSV file or the database table. The `train` command trains
+a new model, either from scratch or by continuing from the current one with the
+rows added to the database since it was trained. The `ingest` command bulk loads
+the dataset CSV into the database table. The `tune` command runs a cross-validated
+hyperparameter search, and the `compact` command replaces the model with a faster
+variant if its accuracy stays within a tolerance. The `compile-model` command
+compiles the model into lookup tables for the low-latency scorer.
+
+Usage:
+    - python runner.py
+    - python runner.py score --input data/dataset.csv --output predictions.csv [--resume] [--workers 8]
+    - python runner.py score --from-db --output-table predictions
+    - python runner.py convert-model [--input model.pkl]
+    - python runner.py train [--from-db | --incremental]
+    - python runner.py ingest [--input data/dataset.csv] [--replace]
+    - python runner.py compact [--tolerance 0.005] [--dry-run]
+    - python runner.py compile-model [--input data/dataset.csv]
+    - python runner.py tune [--candidates 10] [--folds 5] [--workers 4] [--threads 1] [--output tuning.json]
 
 Functions:
-    - main(): Loads the model, makes predictions on test data, and logs results.
+    - main(): Parses the command line and runs the requested command.
+    - predict_test_data(): Loads the model, makes predictions on test data, and logs results.
+    - convert_model(input_path): Converts a legacy pickled model to the native format.
 """
 
+import argparse
 import json
 
-import pandas as pd
 from loguru import logger
 
-from model.model_service import ModelService
 from config.config import settings
-from model.pipeline.preparation import process_features
-
-logger.add("app.log", rotation="1 MB", level="INFO", backtrace=True, diagnose=True)
+from src.config.logging_config import configure_logging
 
 
-@logger.catch
-def main():
+def predict_test_data():
     """
-    Main function to run the model service.
+    Run the model service on the bundled test data.
 
     This function:
     1. Loads the trained machine learning model.
@@ -30,10 +46,11 @@ def main():
     3. Loads test input from `test_input.json`, processes it,
     and makes predictions.
     4. Logs predictions for both test cases.
-
-    Raises:
-        Exception: Catches and logs any runtime errors.
     """
+    import pandas as pd
+
+    from model.model_service import ModelService
+    from model.pipeline.preparation import process_features
 
     logger.info("Starting model service")
     ml_svc = ModelService()
@@ -49,5 +66,155 @@ def main():
     logger.info(f"Prediction on test json: {pred_json}")
 
 
+def convert_model(input_path=None):
+    """
+    Convert a legacy pickled model to the native CatBoost format at `settings.model_path`.
+
+    Args:
+        input_path (str, optional): The legacy `.pkl` artifact. Defaults to the
+                                    `.pkl` file next to `settings.model_path`.
+    """
+    from src.model.artifact import load_model_artifact, save_model_artifact
+
+    input_path = input_path or settings.model_path.rsplit(".", 1)[0] + ".pkl"
+    model = load_model_artifact(input_path)
+    save_model_artifact(model, settings.model_path, {"converted_from": input_path})
+
+
+def build_parser():
+    """
+    Build the command line parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser with one sub-command per task.
+    """
+    parser = argparse.ArgumentParser(description="TaxFix model service")
+    commands = parser.add_subparsers(dest="command")
+
+    score = commands.add_parser("score", help="Stream a large input through the model")
+    source = score.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="CSV file to score")
+    source.add_argument("--from-db", action="store_true", help="Score the database table")
+    target = score.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", help="Output .csv file or .parquet directory")
+    target.add_argument("--output-table", help="Output database table")
+    score.add_argument("--chunk-size", type=int, default=settings.scoring_chunk_size)
+    score.add_argument("--resume", action="store_true", help="Continue an interrupted run")
+    score.add_argument(
+        "--workers", type=int, default=None, help="Processes to shard every chunk across"
+    )
+
+    convert = commands.add_parser(
+        "convert-model", help="Convert a pickled model to the native CatBoost format"
+    )
+    convert.add_argument("--input", help="Legacy .pkl model file")
+
+    train = commands.add_parser("train", help="Train a new model")
+    mode = train.add_mutually_exclusive_group()
+    mode.add_argument("--from-db", action="store_true", help="Retrain on the database table")
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Continue the current model with rows added since it was trained",
+    )
+    train.add_argument(
+        "--iterations", type=int, default=None, help="Iterations added by --incremental"
+    )
+
+    ingest = commands.add_parser("ingest", help="Bulk load a CSV file into the database")
+    ingest.add_argument("--input", default=settings.data_path, help="CSV file to load")
+    ingest.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    ingest.add_argument("--replace", action="store_true", help="Recreate the table first")
+
+    tuning = commands.add_parser("tune", help="Search hyperparameters with cross-validation")
+    tuning.add_argument("--input", default=settings.data_path, help="Training CSV file")
+    tuning.add_argument(
+        "--candidates", type=int, default=None, help="Parameter sets sampled from the grid"
+    )
+    tuning.add_argument("--folds", type=int, default=settings.tuning_folds)
+    tuning.add_argument("--workers", type=int, default=None, help="Worker processes")
+    tuning.add_argument("--threads", type=int, default=None, help="CatBoost threads per worker")
+    tuning.add_argument("--output", default="tuning_results.json")
+
+    compact = commands.add_parser("compact", help="Promote a smaller, faster model variant")
+    compact.add_argument("--input", default=settings.data_path, help="Training CSV file")
+    compact.add_argument(
+        "--tolerance", type=float, default=None, help="Largest accepted F1 drop"
+    )
+    compact.add_argument(
+        "--dry-run", action="store_true", help="Only report the variants, keep the model"
+    )
+
+    compile_ = commands.add_parser(
+        "compile-model", help="Compile the model into lookup tables for fast scoring"
+    )
+    compile_.add_argument("--input", default=settings.data_path, help="Training CSV file")
+    return parser
+
+
+@logger.catch
+def main(argv=None):
+    """
+    Main function to run the model service.
+
+    Args:
+        argv (list, optional): Command line arguments. Defaults to `sys.argv`.
+
+    Raises:
+        Exception: Catches and logs any runtime errors.
+    """
+
+    args = build_parser().parse_args(argv)
+    configure_logging(settings)
+    # Every command imports only the modules it runs, so the CLI starts fast.
+    if args.command == "score":
+        from model.batch_scoring import score_stream
+
+        score_stream(
+            input_path=args.input,
+            output=args.output,
+            output_table=args.output_table,
+            chunk_size=args.chunk_size,
+            resume=args.resume,
+            n_workers=args.workers,
+        )
+    elif args.command == "convert-model":
+        convert_model(args.input)
+    elif args.command == "compact":
+        from model.pipeline.compaction import compact_model
+
+        compact_model(args.tolerance, not args.dry_run, args.input)
+    elif args.command == "compile-model":
+        from src.model.compiled import compile_artifact
+
+        compile_artifact(settings.model_path, args.input)
+    elif args.command == "tune":
+        from model.pipeline.tuning import tune
+
+        tune(
+            n_candidates=args.candidates,
+            folds=args.folds,
+            n_workers=args.workers,
+            thread_count=args.threads,
+            data_path=args.input,
+            output=args.output,
+        )
+    elif args.command == "ingest":
+        from src.db.ingest import ingest_csv
+
+        ingest_csv(args.input, args.batch_size, args.replace)
+    elif args.command == "train":
+        from model.pipeline.model import build_model, build_model_from_db, update_model
+
+        if args.incremental:
+            update_model(args.iterations)
+        elif args.from_db:
+            build_model_from_db()
+        else:
+            build_model()
+    else:
+        predict_test_data()
+
+
 if __name__ == "__main__":
     main()
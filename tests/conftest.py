@@ -0,0 +1,9 @@
+"""
+Shared test configuration. The tests import the application modules both as
+`src.*` and, like the command line tools, with `src` on the path.
+"""
+
+import os
+
+# Keep test runs from writing to the application log file.
+os.environ.setdefault("LOG_FILE", "")
@@ -0,0 +1,119 @@
+"""
+Parity of the compiled lookup-table scorer with native CatBoost.
+"""
+
+import numpy as np
+import pytest
+
+from src.benchmarks.synthetic import generate_data
+from src.config.config import settings
+from src.model.artifact import save_model_artifact
+from src.model.compiled import (
+    compile_model,
+    compiled_path,
+    load_compiled_model,
+    save_compiled_model,
+)
+from src.model.pipeline.features import build_feature_vector
+from src.model.pipeline.preparation import process_features
+from src.model.registry import ModelRegistry
+
+TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope="module")
+def data():
+    df = generate_data(2000, seed=7)
+    return process_features(df), df[settings.target]
+
+
+@pytest.fixture(scope="module")
+def model(data):
+    from catboost import CatBoostClassifier
+
+    X, y = data
+    model = CatBoostClassifier(
+        iterations=30,
+        depth=4,
+        cat_features=settings.categorical_features,
+        random_seed=0,
+        verbose=False,
+        allow_writing_files=False,
+    )
+    return model.fit(X, y)
+
+
+@pytest.fixture(scope="module")
+def compiled(model, data):
+    X, _ = data
+    categories = {name: X[name].unique().tolist() for name in settings.categorical_features}
+    compiled = compile_model(model, categories)
+    compiled.max_rows = len(X)
+    return compiled
+
+
+def test_compiled_matches_native_on_frames(compiled, model, data):
+    X, _ = data
+    np.testing.assert_allclose(
+        compiled.predict_proba(X), model.predict_proba(X), atol=TOLERANCE, rtol=0
+    )
+    assert compiled.fallback_rows == 0
+
+
+def test_compiled_matches_native_on_vectors(compiled, model, data):
+    X, _ = data
+    vectors = X.iloc[:200].astype(object).to_numpy().tolist()
+    np.testing.assert_allclose(
+        compiled.predict_proba(vectors), model.predict_proba(vectors), atol=TOLERANCE, rtol=0
+    )
+
+
+def test_compiled_matches_native_on_category_dtype(compiled, model):
+    X = process_features(generate_data(300, seed=11), "category")
+    np.testing.assert_allclose(
+        compiled.predict_proba(X), model.predict_proba(X), atol=TOLERANCE, rtol=0
+    )
+
+
+def test_unknown_categories_fall_back_to_native_model(compiled, model):
+    rows = [
+        {**settings.test_data, "employment_type": "astronaut"},
+        settings.test_data,
+        {**settings.test_data, "device_type": "smart_fridge", "referral_source": "unknown"},
+    ]
+    vectors = [build_feature_vector(row, model.feature_names_) for row in rows]
+    fallback_rows = compiled.fallback_rows
+
+    np.testing.assert_allclose(
+        compiled.predict_proba(vectors), model.predict_proba(vectors), atol=TOLERANCE, rtol=0
+    )
+    assert compiled.fallback_rows - fallback_rows == 2
+    assert compiled.check_parity(vectors) <= TOLERANCE
+
+
+def test_compiled_model_is_ignored_for_another_artifact(compiled, model, data, tmp_path):
+    model_path = str(tmp_path / "model.cbm")
+    save_model_artifact(model, model_path)
+    save_compiled_model(compiled, compiled_path(model_path), model_path)
+
+    loaded = load_compiled_model(compiled_path(model_path), model, model_path)
+    X, _ = data
+    np.testing.assert_allclose(
+        loaded.predict_proba(X.iloc[:10]), model.predict_proba(X.iloc[:10]), atol=TOLERANCE, rtol=0
+    )
+
+    other = model.copy()
+    other.shrink(ntree_end=10)
+    save_model_artifact(other, model_path)
+    assert load_compiled_model(compiled_path(model_path), model, model_path) is None
+
+
+def test_registry_reloads_when_the_compiled_model_changes(compiled, model, tmp_path):
+    model_path = str(tmp_path / "model.cbm")
+    save_model_artifact(model, model_path)
+    registry = ModelRegistry(model_path, watch_files=[compiled_path(model_path)])
+    registry.load()
+    assert not registry.refresh()
+
+    save_compiled_model(compiled, compiled_path(model_path), model_path)
+    assert registry.refresh()
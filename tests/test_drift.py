@@ -0,0 +1,61 @@
+"""
+Drift sketches: batch updates and merging the sketches of several workers.
+"""
+
+import numpy as np
+import pytest
+
+from src.benchmarks.synthetic import generate_data
+from src.inference import TaxFilingInput
+from src.model.pipeline.features import build_feature_columns, build_feature_vector
+from src.model.pipeline.preparation import process_features
+from src.monitoring.drift import DriftMonitor, build_baseline
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return build_baseline(process_features(generate_data(2000, seed=1)))
+
+
+@pytest.fixture(scope="module")
+def rows():
+    df = generate_data(300, seed=2)
+    df.loc[::7, "employment_type"] = "astronaut"
+    return [TaxFilingInput.model_validate(record) for record in df.to_dict("records")]
+
+
+def test_update_columns_matches_row_updates(baseline, rows):
+    by_row, by_column = DriftMonitor(baseline), DriftMonitor(baseline)
+    for row in rows:
+        by_row.update(build_feature_vector(row, by_row.features))
+    by_column.update_columns(build_feature_columns(rows))
+
+    assert by_column.snapshot() == by_row.snapshot()
+    assert by_column.report() == by_row.report()
+
+
+def test_merged_workers_match_one_monitor(baseline, rows):
+    single = DriftMonitor(baseline, "v1")
+    single.update_columns(build_feature_columns(rows))
+
+    workers = [DriftMonitor(baseline, "v1") for _ in range(3)]
+    for i, worker in enumerate(workers):
+        worker.update_columns(build_feature_columns(rows[i::3]))
+    merged = DriftMonitor(baseline, "v1")
+    for worker in workers:
+        merged.merge(worker.snapshot())
+
+    assert merged.report() == single.report()
+
+
+def test_merge_rejects_another_model_version(baseline):
+    with pytest.raises(ValueError):
+        DriftMonitor(baseline, "v1").merge(DriftMonitor(baseline, "v2").snapshot())
+
+
+def test_binned_sketch_counts_missing_values(baseline):
+    monitor = DriftMonitor(baseline)
+    name = next(iter(monitor.numeric))
+    monitor.numeric[name].add_array(np.array([np.nan, 1.0, np.nan]))
+    assert monitor.numeric[name].missing == 2
+    assert monitor.numeric[name].total == 1
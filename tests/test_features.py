@@ -0,0 +1,140 @@
+"""
+Parity of the pandas-free feature builder with the pandas preparation path.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.config import settings
+from src.model.pipeline.features import FEATURE_SPEC, build_feature_vector
+from src.model.pipeline.preparation import feature_arrays, process_features
+
+MODEL_COLUMNS = [column["name"] for column in FEATURE_SPEC]
+
+ROWS = {
+    "test_data": settings.test_data,
+    "lower_bounds": {
+        "age": 18,
+        "income": 0,
+        "employment_type": "full_time",
+        "marital_status": "single",
+        "time_spent_on_platform": 0,
+        "number_of_sessions": 0,
+        "fields_filled_percentage": 0,
+        "previous_year_filing": 0,
+        "device_type": "mobile",
+        "referral_source": "friend_referral",
+    },
+    "upper_bounds": {
+        "age": 100,
+        "income": 1e9,
+        "employment_type": "self_employed",
+        "marital_status": "married",
+        "time_spent_on_platform": 0.5,
+        "number_of_sessions": 10000,
+        "fields_filled_percentage": 100,
+        "previous_year_filing": 1,
+        "device_type": "desktop",
+        "referral_source": "ad",
+    },
+    "fractional": {
+        "age": 45,
+        "income": 12345.67,
+        "employment_type": "part_time",
+        "marital_status": "divorced",
+        "time_spent_on_platform": 59.99,
+        "number_of_sessions": 7,
+        "fields_filled_percentage": 33.3,
+        "previous_year_filing": 1,
+        "device_type": "tablet",
+        "referral_source": "search",
+    },
+    "unknown_categories": {
+        "age": 30,
+        "income": 45000,
+        "employment_type": "astronaut",
+        "marital_status": "",
+        "time_spent_on_platform": 120,
+        "number_of_sessions": 5,
+        "fields_filled_percentage": 80,
+        "previous_year_filing": 1,
+        "device_type": "smart_fridge",
+        "referral_source": "unknown",
+    },
+}
+
+
+def _expected(row, categorical_dtype=None):
+    """
+    Returns the features of one row as prepared by `process_features`.
+    """
+    df = process_features(pd.DataFrame([row]), categorical_dtype)
+    return [df[name].astype(object).iloc[0] for name in MODEL_COLUMNS]
+
+
+@pytest.mark.parametrize("name", ROWS)
+def test_build_feature_vector_matches_process_features(name):
+    row = ROWS[name]
+    assert build_feature_vector(row, MODEL_COLUMNS) == _expected(row)
+
+
+@pytest.mark.parametrize("name", ROWS)
+def test_build_feature_vector_matches_category_dtype(name):
+    row = ROWS[name]
+    assert build_feature_vector(row, MODEL_COLUMNS) == _expected(row, "category")
+
+
+@pytest.mark.parametrize("name", ROWS)
+def test_build_feature_vector_follows_feature_names(name):
+    row = ROWS[name]
+    feature_names = MODEL_COLUMNS[::-1]
+    expected = dict(zip(MODEL_COLUMNS, _expected(row)))
+    assert build_feature_vector(row, feature_names) == [expected[f] for f in feature_names]
+
+
+def test_build_feature_vector_with_missing_optional_fields():
+    from src.inference import TaxFilingInput
+
+    partial = {"age": 52, "device_type": "desktop"}
+    row = TaxFilingInput.model_validate(partial)
+    assert build_feature_vector(row, MODEL_COLUMNS) == _expected(row.model_dump())
+
+
+def test_feature_arrays_match_process_features():
+    records = list(ROWS.values())
+    arrays = feature_arrays(records)
+    df = process_features(pd.DataFrame(records))
+
+    assert list(arrays) == MODEL_COLUMNS
+    for name in MODEL_COLUMNS:
+        np.testing.assert_array_equal(np.asarray(arrays[name]), df[name].to_numpy())
+    for i, row in enumerate(records):
+        assert build_feature_vector(row, MODEL_COLUMNS) == [
+            np.asarray(arrays[name])[i] for name in MODEL_COLUMNS
+        ]
+
+
+def test_process_features_returns_model_columns_in_model_order():
+    df = pd.DataFrame(list(ROWS.values()), index=[10, 11, 12, 13, 14])
+    df["id"] = range(len(df))
+    df[settings.target] = 1
+    df = df[df.columns[::-1]]
+
+    prepared = process_features(df)
+
+    assert prepared.columns.tolist() == MODEL_COLUMNS
+    assert prepared.index.tolist() == [10, 11, 12, 13, 14]
+
+
+def test_build_feature_columns_match_feature_arrays():
+    from src.inference import TaxFilingInput
+    from src.model.pipeline.features import build_feature_columns
+
+    rows = [TaxFilingInput.model_validate(row) for row in ROWS.values()]
+    columns = build_feature_columns(rows)
+    arrays = feature_arrays([row.model_dump() for row in rows])
+
+    assert list(columns) == MODEL_COLUMNS
+    for name in MODEL_COLUMNS:
+        np.testing.assert_array_equal(np.asarray(columns[name]), np.asarray(arrays[name]))